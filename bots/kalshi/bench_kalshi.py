@@ -0,0 +1,350 @@
+#!/usr/bin/env python3
+"""
+Offline benchmark suite for the bots/kalshi hot paths
+
+Benchmarks:
+  sign_request          RSA-PSS signatures per second (throwaway in-memory key)
+  make_request          per-call overhead vs. a bare urlopen against a local HTTP server
+  score_signals         per-call cost
+  find_best_market      synthetic KXBTCD ladders of increasing size
+  log_paper_trade       one append as the ledger grows 10 → 100k trades
+  _compute_stats        full recompute as the ledger grows 10 → 100k trades
+  resolve_paper_trades  resolver wall time vs. open-trade count (stubbed API)
+  snapshot_recorder     per-snapshot encode cost and bytes for the KXBTCD recorder (budget: 1s cadence)
+  matching_engine       per-book-update cost of the paper-fill simulator with resting orders
+
+Nothing touches the network or the real memory/ files.
+
+Usage:
+  python bench_kalshi.py [--quick] [--out results.json] [--compare baseline.json] [--threshold 0.2]
+
+Results are written as JSON (default memory/benchmarks/bench-<timestamp>.json).
+With --compare, any benchmark slower than baseline by more than --threshold
+(fractional, default 20%) is flagged and the exit code is 1.
+"""
+
+import os
+import sys
+import json
+import time
+import random
+import datetime
+import platform
+import statistics
+import tempfile
+import threading
+from contextlib import redirect_stdout
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from unittest.mock import patch
+
+os.environ.setdefault("KALSHI_API_KEY_ID", "bench-key")
+sys.path.insert(0, str(Path(__file__).parent))
+
+import kalshi
+import kalshi_btc_monitor as monitor
+import kalshi_paper_tracker as tracker
+import kalshi_recorder as recorder
+import kalshi_simulator as simulator
+from kalshi_records import Market, PaperTrade, Recommendation
+
+WORKSPACE = Path(__file__).parent.parent
+RESULTS_DIR = WORKSPACE / "memory" / "benchmarks"
+DEFAULT_THRESHOLD = 0.20
+
+LADDER_SIZES = (50, 500, 5_000)
+LEDGER_SIZES = (10, 100, 1_000, 10_000, 100_000)
+RESOLVER_SIZES = (10, 100, 1_000)
+QUICK_LEDGER_SIZES = (10, 100, 1_000)
+SIM_ORDER_COUNTS = (1, 10, 100)
+
+BTC = {
+    "price": 95_000.0, "change_1h": -0.4, "change_24h": -1.8,
+    "high_24h": 97_500.0, "low_24h": 94_200.0, "volume_24h": 41e9,
+}
+
+
+# === HARNESS ===
+def _time(fn, number, repeat=5):
+    """Median seconds per call of fn() over `repeat` batches of `number` calls"""
+    samples = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        for _ in range(number):
+            fn()
+        samples.append((time.perf_counter() - started) / number)
+    return statistics.median(samples)
+
+
+def _result(name, params, per_call_sec, **extra):
+    row = {"name": name, "params": params, "per_call_us": round(per_call_sec * 1e6, 3)}
+    if per_call_sec > 0:
+        row["ops_per_sec"] = round(1 / per_call_sec, 1)
+    row.update(extra)
+    label = ", ".join(f"{k}={v}" for k, v in params.items())
+    print(f"  {name:<22} {label:<34} {row['per_call_us']:>14,.1f} µs/call")
+    return row
+
+
+def _key(result):
+    return result["name"] + json.dumps(result["params"], sort_keys=True)
+
+
+# === SYNTHETIC DATA ===
+def synthetic_markets(n, btc_price=BTC["price"], seed=7):
+    """A KXBTCD-shaped ladder of n strikes around btc_price, closing in 6 hours (API dicts)"""
+    rng = random.Random(seed)
+    close = (datetime.datetime.now(datetime.timezone.utc) + datetime.timedelta(hours=6)).isoformat()
+    step = btc_price * 0.2 / n
+    markets = []
+    for i in range(n):
+        strike = btc_price * 0.9 + i * step + 0.99
+        above = strike < btc_price
+        yes_ask = max(1, min(99, int(50 + (btc_price - strike) / btc_price * 900 + rng.randint(-3, 3))))
+        markets.append({
+            "ticker": f"KXBTCD-26FEB0317-T{strike:.2f}",
+            "yes_bid": max(1, yes_ask - rng.randint(1, 4)),
+            "yes_ask": yes_ask if above or yes_ask > 1 else 1,
+            "close_time": close,
+            "volume": rng.randint(0, 50_000),
+        })
+    return markets
+
+
+def synthetic_trade(i, status="win"):
+    return {
+        "id": f"{i:08X}", "timestamp": "2026-01-01T00:00:00+00:00",
+        "ticker": f"KXBTCD-26FEB0317-T{90_000 + i % 1000:.2f}", "side": "no", "action": "BUY NO",
+        "strike": 99_000.0, "entry_cost_cents": 27, "avg_entry_cost_cents": 27.0, "contracts": 370,
+        "hypothetical_cost_usd": 99.9, "potential_profit_usd": 270.1, "signal_score": 4, "signals": {},
+        "btc_price_at_entry": 95_000.0, "btc_change_24h_at_entry": -1.8, "settlement_time": None,
+        "status": status, "result_side": None if status == "open" else "no",
+        "realized_pnl": None if status == "open" else (270.1 if i % 3 else -99.9),
+        "resolved_at": None if status == "open" else f"2026-01-{1 + i % 28:02d}T00:00:00+00:00",
+    }
+
+
+# === BENCHMARKS ===
+def bench_sign_request():
+    try:
+        from cryptography.hazmat.primitives.asymmetric import rsa
+    except ImportError:
+        print("  sign_request           skipped (cryptography not installed)")
+        return []
+    key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+    per_call = _time(lambda: kalshi.sign_request(key, "1700000000000", "GET", "/trade-api/v2/portfolio/balance"), 50)
+    return [_result("sign_request", {"key_bits": 2048}, per_call)]
+
+
+class _Handler(BaseHTTPRequestHandler):
+    body = json.dumps({"balance": 123_456}).encode()
+
+    def do_GET(self):
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(self.body)))
+        self.end_headers()
+        self.wfile.write(self.body)
+
+    def log_message(self, *args):
+        pass
+
+
+def bench_make_request():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    base = f"http://127.0.0.1:{server.server_address[1]}"
+    path = "/trade-api/v2/portfolio/balance"
+    try:
+        import urllib.request
+
+        def bare():
+            with urllib.request.urlopen(base + path, timeout=5) as resp:
+                json.loads(resp.read())
+
+        with patch.object(kalshi, "BASE_URL", base), \
+                patch.object(kalshi, "load_private_key", return_value=None), \
+                patch.object(kalshi, "sign_request", return_value="sig"):
+            bare_sec = _time(bare, 50)
+            with patch.object(kalshi.cache, "ENABLED", False):
+                full_sec = _time(lambda: kalshi.make_request("GET", path), 50)
+            cached_sec = _time(lambda: kalshi.make_request("GET", path), 50)
+    finally:
+        server.shutdown()
+    return [
+        _result("urlopen_baseline", {"server": "local"}, bare_sec),
+        _result("make_request", {"server": "local", "signing": "stubbed"}, full_sec,
+                overhead_us=round((full_sec - bare_sec) * 1e6, 3)),
+        _result("make_request", {"server": "local", "cache": "hit"}, cached_sec),
+    ]
+
+
+def bench_strategy(ladder_sizes):
+    results = [_result("score_signals", {}, _time(
+        lambda: monitor.score_signals(BTC, {"value": 50, "label": "Neutral"}, False), 2_000))]
+    for n in ladder_sizes:
+        markets = [Market.from_api(m) for m in synthetic_markets(n)]
+        number = max(1, 20_000 // n)
+        results.append(_result("find_best_market", {"markets": n}, _time(
+            lambda: monitor.find_best_market(markets, BTC["price"], False), number)))
+    return results
+
+
+def bench_ledger(ledger_sizes):
+    results = []
+    rec = Recommendation("BUY NO", "KXBTCD-26FEB0317-T99000.00", 99_000.0, BTC["price"], 4.2, 27)
+    with tempfile.TemporaryDirectory() as tmp:
+        trades_path = Path(tmp) / "trades.json"
+        with patch.object(tracker, "PAPER_TRADES_JSON", trades_path), \
+                patch.object(tracker, "TRADE_LOG_MD", Path(tmp) / "log.md"):
+            for n in ledger_sizes:
+                trades = [PaperTrade.from_dict(synthetic_trade(i)) for i in range(n)]
+                results.append(_result("_compute_stats", {"trades": n}, _time(
+                    lambda: tracker._compute_stats(trades), max(1, 10_000 // n), repeat=3)))
+
+                payload = json.dumps([t.to_dict() for t in trades], indent=2)
+                samples = []
+                for _ in range(3):
+                    trades_path.write_text(payload)
+                    started = time.perf_counter()
+                    tracker.log_paper_trade(rec, 4, {}, BTC)
+                    samples.append(time.perf_counter() - started)
+                results.append(_result("log_paper_trade", {"trades": n}, statistics.median(samples)))
+    return results
+
+
+def bench_resolver(sizes):
+    results = []
+
+    def settled(method, path, data=None):
+        return {"market": {"ticker": path.rsplit("/", 1)[-1], "status": "settled", "result": "no"}}
+
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp = Path(tmp)
+        with patch.object(tracker, "PAPER_TRADES_JSON", tmp / "trades.json"), \
+                patch.object(tracker, "PAPER_STATS_JSON", tmp / "stats.json"), \
+                patch.object(tracker, "TRADE_LOG_MD", tmp / "log.md"), \
+                patch.object(tracker, "kalshi_request", settled):
+            for n in sizes:
+                payload = json.dumps([synthetic_trade(i, status="open") for i in range(n)])
+                samples = []
+                for _ in range(3):
+                    (tmp / "trades.json").write_text(payload)
+                    started = time.perf_counter()
+                    with open(os.devnull, "w") as devnull, redirect_stdout(devnull):
+                        tracker.resolve_paper_trades()
+                    samples.append(time.perf_counter() - started)
+                results.append(_result("resolve_paper_trades", {"open_trades": n}, statistics.median(samples)))
+    return results
+
+
+def bench_recorder(ladder_sizes):
+    results = []
+    for n in ladder_sizes:
+        markets = synthetic_markets(n)
+        rng = random.Random(3)
+        with tempfile.TemporaryDirectory() as tmp:
+            writer = recorder.SnapshotWriter(tmp)
+            snapshots = recorder.CHUNK_SNAPSHOTS * 3
+            started = time.perf_counter()
+            for s in range(snapshots):
+                for m in rng.sample(markets, max(1, n // 20)):  # ~5% of quotes move per tick
+                    m["yes_bid"] = max(1, min(98, m["yes_bid"] + rng.choice((-1, 1))))
+                    m["volume"] += rng.randint(1, 20)
+                writer.add(1_770_000_000_000 + s * 1000, markets)
+            writer.close()
+            per_snapshot = (time.perf_counter() - started) / snapshots
+        results.append(_result("snapshot_recorder", {"markets": n}, per_snapshot,
+                               bytes_per_snapshot=round(writer.bytes_written / snapshots, 1)))
+    return results
+
+
+def bench_simulator(order_counts):
+    """Random-walk books for 10 tickers with resting orders on every one"""
+    results = []
+    for n in order_counts:
+        rng = random.Random(5)
+        tickers = [f"KXBTCD-26FEB0317-T{90_000 + i * 500:.2f}" for i in range(10)]
+        mids = {t: rng.randint(30, 70) for t in tickers}
+        updates = []
+        for u in range(20_000):
+            t = tickers[u % len(tickers)]
+            mids[t] = max(5, min(95, mids[t] + rng.choice((-1, 0, 1))))
+            yes = [[mids[t] - k, rng.randint(10, 500)] for k in range(10)]
+            no = [[100 - mids[t] - 2 - k, rng.randint(10, 500)] for k in range(10)]
+            updates.append((u * 0.01, t, {"yes": yes, "no": no}, u * 3))
+        engine = simulator.MatchingEngine(latency_ms=50)
+        for i in range(n):
+            t = tickers[i % len(tickers)]
+            engine.submit(0.0, t, "yes", mids[t] - rng.randint(0, 5), rng.randint(10, 500))
+        started = time.perf_counter()
+        for ts, t, book, volume in updates:
+            engine.on_book(ts, t, book, volume)
+        per_update = (time.perf_counter() - started) / len(updates)
+        filled = sum(o.filled for o in engine.orders.values())
+        results.append(_result("matching_engine", {"orders": n}, per_update, contracts_filled=filled))
+    return results
+
+
+# === COMPARE ===
+def compare(results, baseline, threshold):
+    """Return [(name, params, baseline_us, current_us, ratio)] for regressions beyond threshold"""
+    base = {_key(r): r for r in baseline.get("results", [])}
+    regressions = []
+    for r in results:
+        b = base.get(_key(r))
+        if not b or not b["per_call_us"]:
+            continue
+        ratio = r["per_call_us"] / b["per_call_us"]
+        if ratio > 1 + threshold:
+            regressions.append((r["name"], r["params"], b["per_call_us"], r["per_call_us"], ratio))
+    return regressions
+
+
+def _arg(flag, default=None):
+    if flag in sys.argv:
+        i = sys.argv.index(flag)
+        if i + 1 < len(sys.argv):
+            return sys.argv[i + 1]
+    return default
+
+
+def main():
+    quick = "--quick" in sys.argv
+    threshold = float(_arg("--threshold", DEFAULT_THRESHOLD))
+    started_at = datetime.datetime.now()
+
+    print(f"\n⏱️  Kalshi benchmarks{' (quick)' if quick else ''}\n")
+    results = []
+    results += bench_sign_request()
+    results += bench_make_request()
+    results += bench_strategy(LADDER_SIZES[:2] if quick else LADDER_SIZES)
+    results += bench_ledger(QUICK_LEDGER_SIZES if quick else LEDGER_SIZES)
+    results += bench_resolver(RESOLVER_SIZES[:2] if quick else RESOLVER_SIZES)
+    results += bench_recorder(LADDER_SIZES[:2] if quick else LADDER_SIZES)
+    results += bench_simulator(SIM_ORDER_COUNTS[:2] if quick else SIM_ORDER_COUNTS)
+
+    out = Path(_arg("--out") or RESULTS_DIR / f"bench-{started_at.strftime('%Y%m%d-%H%M%S')}.json")
+    out.parent.mkdir(parents=True, exist_ok=True)
+    out.write_text(json.dumps({
+        "timestamp": started_at.isoformat(),
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "quick": quick,
+        "results": results,
+    }, indent=2))
+    print(f"\n📄 Results: {out}")
+
+    baseline_path = _arg("--compare")
+    if baseline_path:
+        regressions = compare(results, json.loads(Path(baseline_path).read_text()), threshold)
+        if regressions:
+            print(f"\n❌ {len(regressions)} regression(s) over {threshold:.0%}:")
+            for name, params, before, after, ratio in regressions:
+                print(f"   {name} {params}: {before:,.1f} → {after:,.1f} µs ({ratio:.2f}x)")
+            sys.exit(1)
+        print(f"\n✅ No regressions over {threshold:.0%} vs {baseline_path}")
+
+
+if __name__ == "__main__":
+    main()
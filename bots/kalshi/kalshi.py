@@ -5,27 +5,42 @@ Kalshi CLI - Prediction market trading
 
 import os
 import sys
-import json
 import base64
 import datetime
+import io
 import random
 import time
-import urllib.request
-import urllib.error
 from pathlib import Path
 
-# Config
+sys.path.insert(0, str(Path(__file__).parent))
+import kalshi_breaker as breaker
+import kalshi_cache as cache
+import kalshi_cassette as cassette
+import kalshi_codec as codec
+import kalshi_metrics as metrics
+
+# Config — credentials are checked on first request, not at import, so
+# local-only commands (help, paper stats) run without them
 API_KEY_ID = os.environ.get("KALSHI_API_KEY_ID")
-if not API_KEY_ID:
-    raise EnvironmentError("KALSHI_API_KEY_ID is not set — add it to your environment.")
 PRIVATE_KEY_PATH = Path(
     os.environ.get(
         "KALSHI_PRIVATE_KEY_PATH",
         str(Path(__file__).parent.parent / "vault" / "kalshi_private_key.pem"),
     )
 )
-BASE_URL = "https://api.elections.kalshi.com"  # Production
+BASE_URL = os.environ.get("KALSHI_BASE_URL", "https://api.elections.kalshi.com")  # Production
 # BASE_URL = "https://demo-api.kalshi.co"  # Demo
+# BASE_URL = "http://127.0.0.1:8765"  # Local fake exchange (kalshi_fake_exchange.py)
+
+# Resident agent (kalshi_agent.py): commands are forwarded to it while it's listening
+AGENT_SOCKET = Path(
+    os.environ.get(
+        "KALSHI_AGENT_SOCKET",
+        str(Path(__file__).parent.parent / "memory" / "kalshi-agent.sock"),
+    )
+)
+# Kept-alive pooled connections (kalshi_pool.py) instead of one per request — the agent turns this on
+KEEPALIVE = os.environ.get("KALSHI_KEEPALIVE", "false").lower() == "true"
 
 MAX_RETRIES = 3
 BASE_BACKOFF_SECONDS = 0.5
@@ -39,105 +54,288 @@ def _backoff_delay(attempt: int) -> float:
     jitter = random.uniform(0, base * 0.3)
     return base + jitter
 
+def _breaker_host():
+    """Circuit-breaker key for the API host; None (no breaker) while a cassette records or replays"""
+    return None if cassette.MODE else BASE_URL.split("://", 1)[-1].split("/", 1)[0]
+
+def _urlopen(req):
+    """cassette.urlopen, or a pooled kept-alive connection when KEEPALIVE is on"""
+    if KEEPALIVE and not cassette.MODE:
+        import kalshi_pool
+        return kalshi_pool.urlopen(req, timeout=30)
+    return cassette.urlopen(req, timeout=30)
+
+_crypto = None
+_private_key = None
+
+def api_key_id() -> str:
+    """Return the API key ID, raising if it isn't configured"""
+    key_id = API_KEY_ID or os.environ.get("KALSHI_API_KEY_ID")
+    if not key_id:
+        raise EnvironmentError("KALSHI_API_KEY_ID is not set — add it to your environment.")
+    return key_id
+
+def _load_crypto():
+    """Import cryptography once, on first use — it dominates startup otherwise"""
+    global _crypto
+    if _crypto is None:
+        from cryptography.hazmat.primitives import hashes, serialization
+        from cryptography.hazmat.primitives.asymmetric import padding
+        pss = padding.PSS(mgf=padding.MGF1(hashes.SHA256()), salt_length=padding.PSS.DIGEST_LENGTH)
+        _crypto = (serialization, pss, hashes.SHA256())
+    return _crypto
+
 def load_private_key():
-    """Load RSA private key from file"""
-    from cryptography.hazmat.primitives import serialization
-    from cryptography.hazmat.backends import default_backend
-    
-    with open(PRIVATE_KEY_PATH, "rb") as key_file:
-        private_key = serialization.load_pem_private_key(
-            key_file.read(),
-            password=None,
-            backend=default_backend()
-        )
-    return private_key
+    """Load RSA private key from file (parsed once per process)"""
+    global _private_key
+    if _private_key is None:
+        serialization, _, _ = _load_crypto()
+        with open(PRIVATE_KEY_PATH, "rb") as key_file:
+            _private_key = serialization.load_pem_private_key(key_file.read(), password=None)
+    return _private_key
 
 def sign_request(private_key, timestamp_str: str, method: str, path: str) -> str:
     """Sign request with RSA-PSS"""
-    from cryptography.hazmat.primitives import hashes
-    from cryptography.hazmat.primitives.asymmetric import padding
+    _, pss, sha256 = _load_crypto()
     
     # Strip query params for signing
     path_without_query = path.split('?')[0]
     message = f"{timestamp_str}{method}{path_without_query}".encode('utf-8')
     
-    signature = private_key.sign(
-        message,
-        padding.PSS(
-            mgf=padding.MGF1(hashes.SHA256()),
-            salt_length=padding.PSS.DIGEST_LENGTH
-        ),
-        hashes.SHA256()
-    )
+    signature = private_key.sign(message, pss, sha256)
     return base64.b64encode(signature).decode('utf-8')
 
-def make_request(method: str, path: str, data: dict = None) -> dict:
-    """Make authenticated request to Kalshi API"""
-    private_key = load_private_key()
-    
-    timestamp = int(datetime.datetime.now().timestamp() * 1000)
-    timestamp_str = str(timestamp)
-    
-    signature = sign_request(private_key, timestamp_str, method, path)
-    
-    headers = {
-        'KALSHI-ACCESS-KEY': API_KEY_ID,
+def _signed_headers(method: str, path: str, instrument: bool) -> dict:
+    """Kalshi auth headers for one request"""
+    timestamp_str = str(int(datetime.datetime.now().timestamp() * 1000))
+    if cassette.replaying():
+        signature = cassette.REDACTED  # offline replay: no key needed
+    else:
+        private_key = load_private_key()
+        if instrument:
+            sign_started = time.perf_counter()
+        signature = sign_request(private_key, timestamp_str, method, path)
+        if instrument:
+            metrics.observe_sign(time.perf_counter() - sign_started)
+    return {
+        'KALSHI-ACCESS-KEY': api_key_id(),
         'KALSHI-ACCESS-SIGNATURE': signature,
         'KALSHI-ACCESS-TIMESTAMP': timestamp_str,
         'Content-Type': 'application/json',
         'Accept': 'application/json'
     }
-    
+
+def make_request(method: str, path: str, data: dict = None) -> dict:
+    """
+    Make authenticated request to Kalshi API. GETs go through the
+    single-flight / TTL cache (kalshi_cache.py); writes invalidate it.
+    """
+    if method == "GET":
+        # recordings capture every request, so the TTL cache stays out of them
+        return cache.get((BASE_URL, path), lambda: _request(method, path, data), use_ttl=not cassette.MODE)
+    try:
+        return _request(method, path, data)
+    finally:
+        cache.invalidate_after_write(path)
+
+def _request(method: str, path: str, data: dict = None) -> dict:
+    import urllib.error
+    import urllib.request
+
+    instrument = metrics.ENABLED
+    if instrument:
+        started = time.perf_counter()
+
+    host = _breaker_host()
+    if not breaker.allow(host):
+        return {"error": str(breaker.CircuitOpen(host))}
+
+    headers = _signed_headers(method, path, instrument)
     url = f"{BASE_URL}{path}"
-    
-    if data:
-        req_data = json.dumps(data).encode('utf-8')
-    else:
-        req_data = None
-    
+    req_data = codec.dumps(data) if data else None
     req = urllib.request.Request(url, data=req_data, headers=headers, method=method)
     
     for attempt in range(1, MAX_RETRIES + 1):
         try:
-            with urllib.request.urlopen(req, timeout=30) as response:
-                return json.loads(response.read())
+            with _urlopen(req) as response:
+                body = response.read()
+            breaker.record_success(host)
+            if instrument:
+                metrics.observe("kalshi", path, time.perf_counter() - started, attempt, True, len(body))
+            return codec.loads(body)
         except urllib.error.HTTPError as e:
             error_body = e.read().decode('utf-8') if e.fp else str(e)
-            if _is_retryable_status(e.code) and attempt < MAX_RETRIES:
+            tripped = breaker.record_http_error(host, e.code)
+            if _is_retryable_status(e.code) and attempt < MAX_RETRIES and not tripped:
                 delay = _backoff_delay(attempt)
                 print(f"[kalshi] HTTP {e.code} retrying in {delay:.2f}s (attempt {attempt}/{MAX_RETRIES})")
-                time.sleep(delay)
+                if instrument:
+                    metrics.count_retry("kalshi", path, e.code)
+                cassette.sleep(delay)
                 continue
+            if instrument:
+                metrics.observe("kalshi", path, time.perf_counter() - started, attempt, False, len(error_body))
             return {"error": f"HTTP {e.code}: {error_body}"}
         except Exception as e:
-            if attempt < MAX_RETRIES:
+            tripped = breaker.record_failure(host)
+            if attempt < MAX_RETRIES and not tripped:
                 delay = _backoff_delay(attempt)
                 print(f"[kalshi] Request error retrying in {delay:.2f}s (attempt {attempt}/{MAX_RETRIES}): {e}")
-                time.sleep(delay)
+                if instrument:
+                    metrics.count_retry("kalshi", path)
+                cassette.sleep(delay)
                 continue
+            if instrument:
+                metrics.observe("kalshi", path, time.perf_counter() - started, attempt, False)
             return {"error": str(e)}
 
+def iter_request(path: str, key: str, fields=None, meta: dict = None):
+    """
+    Stream the `key` list of a GET response one element at a time, projected
+    to `fields`. Retries (same policy as make_request) only happen before the
+    body starts streaming. Other top-level values such as "cursor" land in
+    `meta`; a failure is reported as meta["error"] and ends the iteration.
+    """
+    import urllib.error
+    import urllib.request
+
+    meta = {} if meta is None else meta
+    instrument = metrics.ENABLED
+    if instrument:
+        started = time.perf_counter()
+
+    host = _breaker_host()
+    if not breaker.allow(host):
+        meta["error"] = str(breaker.CircuitOpen(host))
+        return
+
+    req = urllib.request.Request(f"{BASE_URL}{path}", headers=_signed_headers("GET", path, instrument), method="GET")
+    for attempt in range(1, MAX_RETRIES + 1):
+        try:
+            response = _urlopen(req)
+        except urllib.error.HTTPError as e:
+            error_body = e.read().decode('utf-8') if e.fp else str(e)
+            tripped = breaker.record_http_error(host, e.code)
+            if _is_retryable_status(e.code) and attempt < MAX_RETRIES and not tripped:
+                delay = _backoff_delay(attempt)
+                print(f"[kalshi] HTTP {e.code} retrying in {delay:.2f}s (attempt {attempt}/{MAX_RETRIES})")
+                if instrument:
+                    metrics.count_retry("kalshi", path, e.code)
+                cassette.sleep(delay)
+                continue
+            if instrument:
+                metrics.observe("kalshi", path, time.perf_counter() - started, attempt, False, len(error_body))
+            meta["error"] = f"HTTP {e.code}: {error_body}"
+            return
+        except Exception as e:
+            tripped = breaker.record_failure(host)
+            if attempt < MAX_RETRIES and not tripped:
+                delay = _backoff_delay(attempt)
+                print(f"[kalshi] Request error retrying in {delay:.2f}s (attempt {attempt}/{MAX_RETRIES}): {e}")
+                if instrument:
+                    metrics.count_retry("kalshi", path)
+                cassette.sleep(delay)
+                continue
+            if instrument:
+                metrics.observe("kalshi", path, time.perf_counter() - started, attempt, False)
+            meta["error"] = str(e)
+            return
+        break
+    breaker.record_success(host)
+
+    ok = False
+    try:
+        with response:
+            yield from codec.iter_items(response, key, fields, meta)
+        ok = True
+    except GeneratorExit:  # caller stopped early
+        ok = True
+        raise
+    except Exception as e:
+        meta["error"] = str(e)
+    finally:
+        if instrument:
+            metrics.observe("kalshi", path, time.perf_counter() - started, attempt, ok, meta.get("_bytes", 0))
+
+def iter_all(path: str, key: str, fields=None, meta: dict = None):
+    """iter_request across every page, following the response cursor"""
+    import urllib.parse
+
+    meta = {} if meta is None else meta
+    sep = "&" if "?" in path else "?"
+    page_path = path
+    while True:
+        page = {}
+        yield from iter_request(page_path, key, fields, page)
+        if "error" in page:
+            meta["error"] = page["error"]
+            return
+        cursor = page.get("cursor")
+        if not cursor:
+            return
+        page_path = f"{path}{sep}cursor={urllib.parse.quote(cursor)}"
+
+# === OUTPUT ===
+# --json: every command writes one JSON object per line (NDJSON) instead of text
+JSON_OUTPUT = False
+MARKET_BATCH = 20    # tickers per /markets?tickers= request
+MARKET_WORKERS = 8   # batches fetched concurrently
+
+def emit(record: dict):
+    """Write one NDJSON record (flushed, so pipes see it as soon as it is ready)"""
+    sys.stdout.write(codec.dumps(record).decode("utf-8") + "\n")
+    sys.stdout.flush()
+
+def _fail(message: str, **context) -> bool:
+    """Report an error in the current output mode. Returns False (the command failed)."""
+    if JSON_OUTPUT:
+        emit({**context, "error": message})
+    else:
+        prefix = f"{context['ticker']}: " if "ticker" in context else ""
+        print(f"❌ {prefix}{message}")
+    return False
+
+def read_tickers(args, stdin=None) -> list:
+    """Tickers from the command line; "-" reads whitespace-separated tickers from stdin (# comments)"""
+    tickers = []
+    for arg in args:
+        if arg != "-":
+            tickers.append(arg)
+            continue
+        for line in (stdin or sys.stdin):
+            tickers += line.split("#", 1)[0].split()
+    return list(dict.fromkeys(tickers))  # de-dupe, keep order
+
+# === COMMANDS ===
+# Each returns True on success, False if anything failed (exit status 1)
+
 def get_balance():
     """Get account balance"""
     result = make_request("GET", "/trade-api/v2/portfolio/balance")
     if "error" in result:
-        print(f"❌ {result['error']}")
-        return
+        return _fail(result["error"])
+    if JSON_OUTPUT:
+        emit(result)
+        return True
     
     balance = result.get("balance", 0) / 100  # Convert cents to dollars
     print(f"💰 Balance: ${balance:,.2f}")
+    return True
 
 def get_positions():
     """Get current positions"""
     result = make_request("GET", "/trade-api/v2/portfolio/positions")
     if "error" in result:
-        print(f"❌ {result['error']}")
-        return
+        return _fail(result["error"])
     
     positions = result.get("market_positions", [])
+    if JSON_OUTPUT:
+        for pos in positions:
+            emit(pos)
+        return True
     if not positions:
         print("📭 No open positions")
-        return
+        return True
     
     print(f"📊 Open Positions ({len(positions)}):\n")
     for pos in positions:
@@ -145,16 +343,15 @@ def get_positions():
         qty = pos.get("position", 0)
         side = "YES" if qty > 0 else "NO"
         print(f"  • {ticker}: {abs(qty)} {side}")
+    return True
 
 def search_markets(query: str, limit: int = 10):
     """Search for markets"""
-    from urllib.parse import quote
     path = f"/trade-api/v2/markets?status=open&limit={limit}"
     result = make_request("GET", path)
     
     if "error" in result:
-        print(f"❌ {result['error']}")
-        return
+        return _fail(result["error"])
     
     markets = result.get("markets", [])
     query_lower = query.lower()
@@ -163,9 +360,13 @@ def search_markets(query: str, limit: int = 10):
     matched = [m for m in markets if query_lower in m.get("title", "").lower() 
                or query_lower in m.get("ticker", "").lower()]
     
+    if JSON_OUTPUT:
+        for m in matched[:limit]:
+            emit(m)
+        return True
     if not matched:
         print(f"🔍 No markets found matching '{query}'")
-        return
+        return True
     
     print(f"🔍 Markets matching '{query}':\n")
     for m in matched[:limit]:
@@ -180,17 +381,9 @@ def search_markets(query: str, limit: int = 10):
             print(f"    YES: {yes_price:.0%} | NO: {no_price:.0%}\n")
         else:
             print(f"  [{ticker}] {title}\n")
+    return True
 
-def get_market(ticker: str):
-    """Get market details"""
-    result = make_request("GET", f"/trade-api/v2/markets/{ticker}")
-    
-    if "error" in result:
-        print(f"❌ {result['error']}")
-        return
-    
-    m = result.get("market", result)
-    
+def _print_market(m: dict):
     print(f"\n📈 {m.get('title', 'Unknown')}")
     print(f"   Ticker: {m.get('ticker')}")
     print(f"   Status: {m.get('status')}")
@@ -206,21 +399,67 @@ def get_market(ticker: str):
     if m.get('close_time'):
         print(f"   Closes: {m.get('close_time')}")
 
+def fetch_markets(tickers):
+    """
+    Yield (ticker, market dict or {"error": ...}) for every ticker, in
+    completion order: MARKET_BATCH tickers per bulk request, MARKET_WORKERS
+    requests in flight.
+    """
+    from concurrent.futures import ThreadPoolExecutor, as_completed
+
+    def fetch(batch):
+        if len(batch) == 1:
+            result = make_request("GET", f"/trade-api/v2/markets/{batch[0]}")
+            return [(batch[0], result.get("market", result))]
+        result = make_request("GET", f"/trade-api/v2/markets?tickers={','.join(batch)}&limit={len(batch)}")
+        if "error" in result:
+            return [(t, result) for t in batch]
+        found = {m.get("ticker"): m for m in result.get("markets", [])}
+        return [(t, found.get(t) or {"error": "market not found"}) for t in batch]
+
+    batches = [tickers[i:i + MARKET_BATCH] for i in range(0, len(tickers), MARKET_BATCH)]
+    if len(batches) == 1:
+        yield from fetch(batches[0])
+        return
+    with ThreadPoolExecutor(max_workers=min(MARKET_WORKERS, len(batches))) as pool:
+        for future in as_completed([pool.submit(fetch, b) for b in batches]):
+            yield from future.result()
+
+def get_markets(tickers):
+    """Market details for one or more tickers, each printed as soon as its fetch completes"""
+    ok = True
+    for ticker, m in fetch_markets(tickers):
+        if "error" in m:
+            ok = _fail(m["error"], ticker=ticker)
+        elif JSON_OUTPUT:
+            emit(m)
+        else:
+            _print_market(m)
+    return ok
+
+def get_market(ticker: str):
+    """Get market details"""
+    return get_markets([ticker])
+
 def list_events(limit: int = 10):
     """List active events"""
     result = make_request("GET", f"/trade-api/v2/events?status=open&limit={limit}")
     
     if "error" in result:
-        print(f"❌ {result['error']}")
-        return
+        return _fail(result["error"])
     
     events = result.get("events", [])
+    if JSON_OUTPUT:
+        for e in events[:limit]:
+            emit(e)
+        return True
     print(f"📅 Active Events ({len(events)}):\n")
     
     for e in events[:limit]:
         title = e.get("title", "???")[:70]
         ticker = e.get("event_ticker", "")
         print(f"  • [{ticker}] {title}")
+    return True
 
 def place_order(ticker: str, side: str, quantity: int, price: int):
     """Place an order
@@ -232,12 +471,10 @@ def place_order(ticker: str, side: str, quantity: int, price: int):
         price: Price in cents (1-99)
     """
     if side.lower() not in ['yes', 'no']:
-        print("❌ Side must be 'yes' or 'no'")
-        return
+        return _fail("Side must be 'yes' or 'no'")
     
     if not 1 <= price <= 99:
-        print("❌ Price must be between 1 and 99 cents")
-        return
+        return _fail("Price must be between 1 and 99 cents")
     
     data = {
         "ticker": ticker,
@@ -255,26 +492,32 @@ def place_order(ticker: str, side: str, quantity: int, price: int):
     result = make_request("POST", "/trade-api/v2/portfolio/orders", data)
     
     if "error" in result:
-        print(f"❌ {result['error']}")
-        return
+        return _fail(result["error"], ticker=ticker)
     
     order = result.get("order", result)
+    if JSON_OUTPUT:
+        emit(order)
+        return True
     print(f"✅ Order placed!")
     print(f"   Order ID: {order.get('order_id')}")
     print(f"   {quantity}x {side.upper()} @ {price}¢")
+    return True
 
 def get_orders():
     """Get open orders"""
     result = make_request("GET", "/trade-api/v2/portfolio/orders?status=resting")
     
     if "error" in result:
-        print(f"❌ {result['error']}")
-        return
+        return _fail(result["error"])
     
     orders = result.get("orders", [])
+    if JSON_OUTPUT:
+        for o in orders:
+            emit(o)
+        return True
     if not orders:
         print("📭 No open orders")
-        return
+        return True
     
     print(f"📋 Open Orders ({len(orders)}):\n")
     for o in orders:
@@ -283,6 +526,7 @@ def get_orders():
         qty = o.get("remaining_count", 0)
         price = o.get("yes_price") or o.get("no_price") or 0
         print(f"  • {ticker}: {qty}x {side} @ {price}¢")
+    return True
 
 def print_help():
     print("""
@@ -294,49 +538,112 @@ Usage:
   kalshi orders               - View open orders
   kalshi events               - List active events
   kalshi search <query>       - Search markets
-  kalshi market <ticker>      - Get market details
+  kalshi market <ticker> ...  - Get market details (several tickers, or - for stdin)
   kalshi buy <ticker> <side> <qty> <price>  - Place order
+
+Options:
+  --json                      - One JSON object per line (NDJSON) instead of text;
+                                errors are {"error": ...} lines, exit status 1
+
+Agent:
+  python kalshi_agent.py      - Keep a warm client (key, connections, caches) running;
+                                commands are forwarded to it while it's up
+                                (KALSHI_NO_AGENT=1 runs one in-process)
   
 Examples:
   kalshi balance
   kalshi search "trump"
   kalshi market KXPRESIDENCY-2028
+  kalshi market --json T1 T2 T3
+  cat watchlist.txt | kalshi market --json -
   kalshi buy KXPRESIDENCY-2028 yes 10 52
 """)
 
-def main():
-    if len(sys.argv) < 2:
+def forward(argv, stdin=None, out=None):
+    """
+    Run a command line in the resident agent if one is listening on
+    AGENT_SOCKET, streaming its output to `out`. Returns the exit status, or
+    None when the command should run in this process instead (no agent, or
+    one talking to a different BASE_URL).
+    """
+    if os.environ.get("KALSHI_NO_AGENT") or not AGENT_SOCKET.exists():
+        return None
+    import json
+    import socket
+
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        sock.connect(str(AGENT_SOCKET))
+    except OSError:  # stale socket file: the agent isn't running
+        sock.close()
+        return None
+    out = out or sys.stdout
+    if stdin is None and "-" in argv:
+        stdin = sys.stdin.read()
+    with sock, sock.makefile("rb") as replies:
+        try:
+            sock.sendall(json.dumps({"argv": argv, "stdin": stdin, "base_url": BASE_URL}).encode() + b"\n")
+            for line in replies:
+                reply = json.loads(line)
+                if "out" in reply:
+                    out.write(reply["out"])
+                    out.flush()
+                elif "exit" in reply:
+                    return reply["exit"]
+                elif "mismatch" in reply:
+                    if stdin is not None:
+                        sys.stdin = io.StringIO(stdin)
+                    return None
+        except OSError:
+            pass
+    # the command may have run (a buy included), so don't run it again here
+    print("❌ Lost the connection to the Kalshi agent", file=sys.stderr)
+    return 1
+
+def main(argv=None):
+    global JSON_OUTPUT
+    argv = sys.argv[1:] if argv is None else argv
+    args = [a for a in argv if a != "--json"]
+    JSON_OUTPUT = len(args) < len(argv)
+    if not args:
         print_help()
         sys.exit(0)
     
-    cmd = sys.argv[1].lower()
+    cmd = args[0].lower()
     
     try:
         if cmd == "balance":
-            get_balance()
+            ok = get_balance()
         elif cmd == "positions":
-            get_positions()
+            ok = get_positions()
         elif cmd == "orders":
-            get_orders()
+            ok = get_orders()
         elif cmd == "events":
-            limit = int(sys.argv[2]) if len(sys.argv) > 2 else 10
-            list_events(limit)
-        elif cmd == "search" and len(sys.argv) > 2:
-            query = " ".join(sys.argv[2:])
-            search_markets(query)
-        elif cmd == "market" and len(sys.argv) > 2:
-            get_market(sys.argv[2])
-        elif cmd == "buy" and len(sys.argv) >= 6:
-            ticker = sys.argv[2]
-            side = sys.argv[3]
-            qty = int(sys.argv[4])
-            price = int(sys.argv[5])
-            place_order(ticker, side, qty, price)
+            limit = int(args[1]) if len(args) > 1 else 10
+            ok = list_events(limit)
+        elif cmd == "search" and len(args) > 1:
+            query = " ".join(args[1:])
+            ok = search_markets(query)
+        elif cmd == "market" and len(args) > 1:
+            ok = get_markets(read_tickers(args[1:]))
+        elif cmd == "buy" and len(args) >= 5:
+            ticker = args[1]
+            side = args[2]
+            qty = int(args[3])
+            price = int(args[4])
+            ok = place_order(ticker, side, qty, price)
         else:
             print_help()
+            ok = True
     except Exception as e:
-        print(f"❌ Error: {e}")
+        _fail(f"Error: {e}" if not JSON_OUTPUT else str(e))
+        sys.exit(1)
+    if not ok:
         sys.exit(1)
 
 if __name__ == "__main__":
+    if sys.argv[1:2] != ["help"] and len(sys.argv) > 1:
+        code = forward(sys.argv[1:])
+        if code is not None:
+            sys.exit(code)
     main()
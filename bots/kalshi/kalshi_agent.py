@@ -0,0 +1,233 @@
+#!/usr/bin/env python3
+"""
+Resident agent: serves `kalshi` CLI commands over a Unix socket from a warm client
+
+A one-off `kalshi balance` pays for interpreter startup, importing
+cryptography, parsing the PEM key and a fresh TCP + TLS handshake before its
+single API call. The agent pays for those once and keeps them:
+
+  key          imported and parsed at startup
+  connections  kept-alive HTTPS connections (kalshi_pool.py) reused across commands
+  caches       the client GET cache (kalshi_cache.py) stays warm between commands
+
+kalshi.py forwards its command line here whenever AGENT_SOCKET
+(memory/kalshi-agent.sock, or KALSHI_AGENT_SOCKET) accepts connections and
+runs the command in-process otherwise, so the agent is purely optional.
+Output streams back as the command prints it and the exit status is the
+command's. Commands run one at a time — the CLI's output mode is
+process-wide. The agent runs with its own environment; a client whose
+KALSHI_BASE_URL differs runs the command itself. The socket is created
+owner-only (0600): anything that can connect to it can trade.
+
+Protocol: one JSON line {"argv": [...], "stdin": str|null, "base_url": str}
+in; JSON lines {"out": text}... then {"exit": code} back. {"ping": true}
+answers with the agent's pid, uptime and pool / cache stats.
+
+Usage:
+  python kalshi_agent.py            Run the agent in the foreground
+  python kalshi_agent.py --status   Ping a running agent
+  KALSHI_NO_AGENT=1 kalshi ...      Run one command without the agent
+"""
+
+import io
+import os
+import sys
+import json
+import time
+import signal
+import socket
+import threading
+import socketserver
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent))
+import kalshi
+import kalshi_cache as cache
+import kalshi_pool as pool
+
+# === CONFIG ===
+WARM_PATH = "/trade-api/v2/exchange/status"  # cheap request that opens the first connection
+
+_run_lock = threading.Lock()
+_started = time.time()
+_commands = 0
+
+
+# === COMMANDS ===
+class _Output(io.TextIOBase):
+    """sys.stdout stand-in that sends each complete line to the client as an {"out": ...} frame"""
+
+    def __init__(self, send):
+        self._send = send
+        self._pending = []
+        self._gone = False
+
+    def writable(self):
+        return True
+
+    def write(self, text):
+        self._pending.append(text)
+        if "\n" in text:
+            self.flush()
+        return len(text)
+
+    def flush(self):
+        if not self._pending:
+            return
+        text, self._pending = "".join(self._pending), []
+        if self._gone:
+            return
+        try:
+            self._send({"out": text})
+        except OSError:  # client went away: let the command finish, drop its output
+            self._gone = True
+
+
+def run_command(argv, stdin, send):
+    """Run one CLI command line here with its output sent through `send`; returns the exit status"""
+    global _commands
+    out = _Output(send)
+    with _run_lock:
+        saved = sys.stdin, sys.stdout
+        sys.stdin, sys.stdout = io.StringIO(stdin or ""), out
+        try:
+            kalshi.main(list(argv))
+            code = 0
+        except SystemExit as e:
+            code = e.code if isinstance(e.code, int) else (0 if e.code is None else 1)
+        except Exception as e:
+            print(f"❌ Agent error: {e}")
+            code = 1
+        finally:
+            out.flush()
+            sys.stdin, sys.stdout = saved
+        _commands += 1
+    return code
+
+
+def status():
+    return {
+        "pid": os.getpid(),
+        "uptime_seconds": round(time.time() - _started, 1),
+        "commands": _commands,
+        "base_url": kalshi.BASE_URL,
+        "pool": pool.stats(),
+        "cache": cache.stats(),
+    }
+
+
+class _Handler(socketserver.StreamRequestHandler):
+    def send(self, message):
+        self.wfile.write(json.dumps(message).encode() + b"\n")
+
+    def handle(self):
+        try:
+            request = json.loads(self.rfile.readline() or b"{}")
+        except ValueError:
+            request = {}
+        try:
+            if request.get("ping"):
+                self.send(status())
+            elif not isinstance(request.get("argv"), list):
+                self.send({"out": "❌ Bad agent request\n"})
+                self.send({"exit": 2})
+            elif request.get("base_url", self.server.base_url) != self.server.base_url:
+                self.send({"mismatch": self.server.base_url})
+            else:
+                self.send({"exit": run_command(request["argv"], request.get("stdin"), self.send)})
+        except OSError:
+            pass  # client disconnected
+
+
+# === SERVER ===
+def is_running(path=None):
+    """True if an agent accepts connections on `path` (default AGENT_SOCKET)"""
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        sock.connect(str(path or kalshi.AGENT_SOCKET))
+        return True
+    except OSError:
+        return False
+    finally:
+        sock.close()
+
+
+def warm():
+    """Parse the key and open the first API connection up front; returns seconds spent"""
+    started = time.perf_counter()
+    try:
+        kalshi.load_private_key()
+    except Exception as e:  # commands will report it; the agent still saves the rest
+        print(f"⚠️  Private key not loaded: {e}")
+        return time.perf_counter() - started
+    result = kalshi.make_request("GET", WARM_PATH)
+    if "error" in result and not result["error"].startswith("HTTP "):
+        print(f"⚠️  Could not reach {kalshi.BASE_URL}: {result['error']}")
+    return time.perf_counter() - started
+
+
+def make_server(path):
+    """Bind the agent's socket at `path`, replacing a stale one. Returns the server (not yet serving)."""
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    if path.exists():
+        path.unlink()
+    umask = os.umask(0o177)  # socket file is created 0600
+    try:
+        server = socketserver.ThreadingUnixStreamServer(str(path), _Handler)
+    finally:
+        os.umask(umask)
+    server.daemon_threads = True
+    server.base_url = kalshi.BASE_URL  # the API this agent trades against
+    return server
+
+
+def serve(path=None):
+    """Run the agent in the foreground until interrupted or terminated"""
+    path = Path(path or kalshi.AGENT_SOCKET)
+    if is_running(path):
+        print(f"❌ An agent is already listening on {path}")
+        return False
+    kalshi.KEEPALIVE = True
+    warmed = warm()
+    server = make_server(path)
+    signal.signal(signal.SIGTERM, lambda *_: sys.exit(0))
+    print(f"🔥 Warmed up in {warmed * 1000:.0f}ms — Kalshi agent {os.getpid()} listening on {path}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        path.unlink(missing_ok=True)
+        pool.reset()
+        print("👋 Kalshi agent stopped")
+    return True
+
+
+def ping(path=None):
+    """Status of the agent on `path`, or None if none is listening"""
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        sock.connect(str(path or kalshi.AGENT_SOCKET))
+        sock.sendall(b'{"ping": true}\n')
+        with sock.makefile("rb") as replies:
+            return json.loads(replies.readline())
+    except (OSError, ValueError):
+        return None
+    finally:
+        sock.close()
+
+
+if __name__ == "__main__":
+    if "--status" in sys.argv:
+        info = ping()
+        if info is None:
+            print(f"💤 No Kalshi agent on {kalshi.AGENT_SOCKET}")
+            sys.exit(1)
+        p = info["pool"]
+        print(f"🔥 Kalshi agent {info['pid']}: up {info['uptime_seconds']:.0f}s, {info['commands']} command(s), "
+              f"{info['base_url']}")
+        print(f"   connections: {p['opened']} opened, {p['reused']} reused, {p['idle']} idle")
+        sys.exit(0)
+    sys.exit(0 if serve() else 1)
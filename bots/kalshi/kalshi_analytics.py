@@ -0,0 +1,205 @@
+#!/usr/bin/env python3
+"""
+Signal attribution analytics for the paper (or live) ledger
+
+Breaks resolved trades down by:
+  - signal score (0-5)
+  - each signal, fired vs. not
+  - strike distance bucket at entry
+  - time-to-settlement tier at entry
+  - Fear & Greed value at entry (joined from the local daily history)
+reporting trades, win rate, P&L and expectancy per group.
+
+The ledger is loaded once into a columnar view (one array per field, signal
+outcomes as booleans from each trade's signal_flags) and every breakdown is
+a group-by over integer group codes: np.bincount when numpy is installed,
+a single pass in plain Python otherwise. Rows written before signal_flags
+existed fall back to the ✅ marker in their stored breakdown strings.
+
+Usage:
+  python kalshi_analytics.py [--strategy NAME] [--live]
+"""
+
+import sys
+import datetime
+from pathlib import Path
+
+try:
+    import numpy as np
+except ImportError:  # optional: pure-Python group-bys
+    np = None
+
+sys.path.insert(0, str(Path(__file__).parent))
+from kalshi_fear_greed import history as fear_greed_history, value_at
+from kalshi_records import SIGNAL_NAMES, parse_strike, parse_ts
+
+DISTANCE_BUCKETS = (1.0, 2.0, 3.0, 5.0)          # % upper edges; last bucket is open-ended
+SETTLEMENT_TIERS = (2, 4, 8, 24)                  # hours, matching the monitor's DISTANCE_SCALE tiers
+FEAR_GREED_BUCKETS = (25, 47, 55, 76)             # alternative.me's classification boundaries
+
+
+def _edges_labels(edges, unit):
+    labels = [f"<{edges[0]:g}{unit}"]
+    labels += [f"{lo:g}-{hi:g}{unit}" for lo, hi in zip(edges, edges[1:])]
+    labels.append(f"{edges[-1]:g}{unit}+")
+    return labels
+
+
+# === COLUMNAR VIEW ===
+class LedgerColumns:
+    """Resolved trades as parallel columns (numpy arrays when available, lists otherwise)"""
+
+    def __init__(self, trades, fear_greed=None):
+        resolved = [t for t in trades if t.status in ("win", "loss")]
+        self.n = len(resolved)
+        win, pnl, score, distance, hours, fg = [], [], [], [], [], []
+        flags = {name: [] for name in SIGNAL_NAMES}
+        for t in resolved:
+            win.append(t.status == "win")
+            pnl.append(t.realized_pnl or 0.0)
+            score.append(t.signal_score or 0)
+            distance.append(_distance(t))
+            hours.append(_hours_to_settlement(t))
+            fg.append(_fear_greed_at_entry(t, fear_greed))
+            fired = t.signal_flags or _legacy_flags(t.signals)
+            for name in SIGNAL_NAMES:
+                flags[name].append(bool(fired.get(name)))
+
+        if np is not None:
+            self.win = np.array(win, dtype=bool)
+            self.pnl = np.array(pnl, dtype=np.float64)
+            self.score = np.array(score, dtype=np.int64)
+            self.distance = np.array(distance, dtype=np.float64)
+            self.hours = np.array(hours, dtype=np.float64)
+            self.fear_greed = np.array(fg, dtype=np.float64)
+            self.flags = {name: np.array(col, dtype=bool) for name, col in flags.items()}
+        else:
+            self.win, self.pnl, self.score = win, pnl, score
+            self.distance, self.hours, self.flags = distance, hours, flags
+            self.fear_greed = fg
+
+
+def _distance(t):
+    if t.distance_pct is not None:
+        return t.distance_pct
+    strike, price = parse_strike(t.strike), t.btc_price_at_entry
+    if strike is None or not price:
+        return float("nan")
+    return abs(strike - price) / price * 100
+
+
+def _hours_to_settlement(t):
+    settle, opened = parse_ts(t.settlement_time), parse_ts(t.timestamp)
+    if settle is None or opened is None:
+        return float("nan")
+    return (settle - opened) / 3600
+
+
+def _fear_greed_at_entry(t, series):
+    opened = parse_ts(t.timestamp)
+    value = value_at(opened, series) if series and opened is not None else None
+    return float("nan") if value is None else value
+
+
+def _legacy_flags(signals):
+    return {name: str(value).startswith("✅") for name, value in (signals or {}).items()}
+
+
+# === GROUP-BY ===
+def _bucket(values, edges):
+    """Group code per value: index of the first edge it is below, len(edges) above all, -1 if NaN"""
+    if np is not None:
+        codes = np.searchsorted(np.asarray(edges), values, side="right")
+        return np.where(np.isnan(values), -1, codes)
+    codes = []
+    for v in values:
+        if v != v:  # NaN
+            codes.append(-1)
+            continue
+        i = 0
+        while i < len(edges) and v >= edges[i]:
+            i += 1
+        codes.append(i)
+    return codes
+
+
+def group_stats(codes, groups, cols):
+    """[(trades, wins, pnl)] per group code 0..groups-1 (negative codes are skipped)"""
+    if np is not None:
+        codes = np.asarray(codes)
+        keep = codes >= 0
+        codes = codes[keep]
+        trades = np.bincount(codes, minlength=groups)
+        wins = np.bincount(codes, weights=cols.win[keep], minlength=groups)
+        pnl = np.bincount(codes, weights=cols.pnl[keep], minlength=groups)
+        return [(int(trades[g]), int(wins[g]), float(pnl[g])) for g in range(groups)]
+    out = [[0, 0, 0.0] for _ in range(groups)]
+    for code, win, pnl in zip(codes, cols.win, cols.pnl):
+        if code >= 0:
+            row = out[code]
+            row[0] += 1
+            row[1] += win
+            row[2] += pnl
+    return [tuple(row) for row in out]
+
+
+def attribution(trades, fear_greed=None):
+    """
+    {section: [(label, trades, win_rate, pnl, expectancy)]} for the ledger's resolved trades.
+    fear_greed: [(day_ts, value, label)] history (kalshi_fear_greed.history()) adds that section.
+    """
+    cols = LedgerColumns(trades, fear_greed)
+
+    def rows(labels, stats):
+        return [(label, n, wins / n if n else 0.0, round(pnl, 2), round(pnl / n, 2) if n else 0.0)
+                for label, (n, wins, pnl) in zip(labels, stats)]
+
+    report = {}
+    report["signal score"] = rows([f"{s}/5" for s in range(6)], group_stats(cols.score, 6, cols))
+    signal_rows = []
+    for name in SIGNAL_NAMES:
+        flag = cols.flags[name]
+        codes = flag.astype(np.int64) if np is not None else [int(f) for f in flag]
+        not_fired, fired = group_stats(codes, 2, cols)
+        label = name.split("_", 1)[1].replace("_", " ")
+        signal_rows += rows([f"{label} ✅", f"{label} ❌"], [fired, not_fired])
+    report["signals"] = signal_rows
+    report["distance"] = rows(_edges_labels(DISTANCE_BUCKETS, "%"),
+                              group_stats(_bucket(cols.distance, DISTANCE_BUCKETS), len(DISTANCE_BUCKETS) + 1, cols))
+    report["time to settlement"] = rows(_edges_labels(SETTLEMENT_TIERS, "h"),
+                                        group_stats(_bucket(cols.hours, SETTLEMENT_TIERS), len(SETTLEMENT_TIERS) + 1, cols))
+    if fear_greed:
+        report["fear & greed"] = rows(_edges_labels(FEAR_GREED_BUCKETS, ""),
+                                      group_stats(_bucket(cols.fear_greed, FEAR_GREED_BUCKETS),
+                                                  len(FEAR_GREED_BUCKETS) + 1, cols))
+    return report
+
+
+def print_report(trades, title="Paper Trading", fear_greed=None):
+    report = attribution(trades, fear_greed)
+    resolved = sum(n for _, n, *_ in report["signal score"])
+    print(f"\n{'─'*58}")
+    print(f"🔬 {title} — signal attribution ({resolved} resolved)")
+    for section, rows in report.items():
+        print(f"{'─'*58}")
+        print(f"  {section:<24}{'trades':>7}{'win %':>7}{'P&L':>11}{'exp/trade':>10}")
+        for label, n, win_rate, pnl, expectancy in rows:
+            if n:
+                print(f"  {label:<24}{n:>7}{win_rate:>7.0%}{pnl:>+11.2f}{expectancy:>+10.2f}")
+    print(f"{'─'*58}")
+    return report
+
+
+# === CLI ===
+if __name__ == "__main__":
+    started = datetime.datetime.now()
+    if "--live" in sys.argv:
+        from kalshi_live_ledger import build_trades
+        trades, title = build_trades(), "Live Trading"
+    else:
+        from kalshi_paper_tracker import _load_trades
+        strategy = sys.argv[sys.argv.index("--strategy") + 1] if "--strategy" in sys.argv else None
+        trades, title = _load_trades(strategy), f"Paper Trading{f' [{strategy}]' if strategy else ''}"
+    print_report(trades, title, fear_greed_history())
+    print(f"({len(trades)} trades, {(datetime.datetime.now() - started).total_seconds():.2f}s"
+          f"{'' if np is not None else ', numpy not installed'})")
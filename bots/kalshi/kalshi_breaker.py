@@ -0,0 +1,188 @@
+#!/usr/bin/env python3
+"""
+Per-upstream circuit breakers, shared by every process through a state file
+
+  closed     calls go through; FAILURE_THRESHOLD consecutive failed attempts
+             (network errors, timeouts, 5xx) open the breaker
+  open       calls fail immediately, so callers go straight to their fallback
+             (BTC cache, stored Fear & Greed, an {"error": ...} result) instead
+             of sitting through the retry loop; lasts COOLDOWN_SECONDS, doubled
+             after every failed probe up to MAX_COOLDOWN_SECONDS
+  half_open  the cooldown has passed: exactly one caller (in any process) gets
+             a single-attempt probe; success closes the breaker, failure
+             reopens it. A probe lost with its process is re-offered after
+             PROBE_LEASE_SECONDS.
+
+Any HTTP response other than a 5xx (including 4xx and 429) shows the host is
+up and closes its breaker. State lives in memory/kalshi-breakers.json
+(read-modify-write under flock) so short-lived cron / CLI processes see the
+failures of the ones before them. A host of None bypasses the breaker
+(callers pass None while recording or replaying a cassette).
+
+Usage:
+  python kalshi_breaker.py           Show breaker state per host
+  python kalshi_breaker.py --reset   Close every breaker
+"""
+
+import os
+import sys
+import json
+import time
+from pathlib import Path
+
+# === CONFIG ===
+STATE_PATH = Path(os.environ.get(
+    "KALSHI_BREAKER_STATE",
+    str(Path(__file__).parent.parent / "memory" / "kalshi-breakers.json"),
+))
+ENABLED = os.environ.get("KALSHI_BREAKERS", "1") != "0"
+FAILURE_THRESHOLD = 3         # consecutive failed attempts — one call's worth of retries
+COOLDOWN_SECONDS = 60
+MAX_COOLDOWN_SECONDS = 15 * 60
+PROBE_LEASE_SECONDS = 60
+
+
+class CircuitOpen(Exception):
+    """Raised (or reported as an error) instead of calling a host whose breaker is open"""
+
+    def __init__(self, host):
+        super().__init__(f"circuit open for {host}")
+        self.host = host
+
+
+# === STATE FILE ===
+def _read(path=None):
+    try:
+        return json.loads(Path(path or STATE_PATH).read_text())
+    except (OSError, ValueError):
+        return {}
+
+
+def _update(fn, path=None):
+    """Apply fn(states) under an exclusive lock; written back only if it returns True"""
+    import fcntl
+
+    path = Path(path or STATE_PATH)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, "a+") as f:
+        fcntl.flock(f, fcntl.LOCK_EX)
+        f.seek(0)
+        try:
+            states = json.loads(f.read() or "{}")
+        except ValueError:
+            states = {}
+        result = fn(states)
+        if result:
+            f.seek(0)
+            f.truncate()
+            f.write(json.dumps(states, sort_keys=True))
+        return result
+
+
+def _cooldown(entry):
+    return min(MAX_COOLDOWN_SECONDS, COOLDOWN_SECONDS * 2 ** (entry.get("trips", 1) - 1))
+
+
+# === BREAKER ===
+def allow(host, now=None, path=None):
+    """True if a call to `host` may go out now (claiming the half-open probe if it is due)"""
+    if not ENABLED or host is None:
+        return True
+    entry = _read(path).get(host)
+    if not entry or entry["state"] == "closed":
+        return True
+    now = time.time() if now is None else now
+    if entry["state"] == "open" and now < entry["opened_at"] + _cooldown(entry):
+        return False
+    if entry["state"] == "half_open" and now < entry["probe_until"]:
+        return False
+
+    def claim(states):
+        current = states.get(host)
+        if not current or current["state"] == "closed":
+            return "free"
+        if current["state"] == "open" and now < current["opened_at"] + _cooldown(current):
+            return None
+        if current["state"] == "half_open" and now < current["probe_until"]:
+            return None
+        current.update(state="half_open", probe_until=now + PROBE_LEASE_SECONDS)
+        return "probe"
+
+    return _update(claim, path) is not None
+
+
+def record_failure(host, now=None, path=None):
+    """Count a failed attempt. Returns True if the breaker is now open (stop retrying)."""
+    if not ENABLED or host is None:
+        return False
+    now = time.time() if now is None else now
+
+    def fail(states):
+        entry = states.setdefault(host, {"state": "closed", "failures": 0, "trips": 0})
+        entry["failures"] += 1
+        if entry["state"] == "half_open":  # the probe failed: back off longer
+            entry.update(state="open", opened_at=now, trips=entry["trips"] + 1)
+            entry.pop("probe_until", None)
+            print(f"🔌 {host}: probe failed — breaker open for {_cooldown(entry)}s")
+        elif entry["state"] == "closed" and entry["failures"] >= FAILURE_THRESHOLD:
+            entry.update(state="open", opened_at=now, trips=1)
+            print(f"🔌 {host}: {entry['failures']} consecutive failures — breaker open for {_cooldown(entry)}s")
+        return entry["state"]
+
+    return _update(fail, path) == "open"
+
+
+def record_success(host, path=None):
+    """The host answered: close its breaker (a no-op read when it is already closed)"""
+    if not ENABLED or host is None or host not in _read(path):
+        return
+    entry = _update(lambda states: states.pop(host, None), path)
+    if entry and entry["state"] != "closed":
+        print(f"🔌 {host}: answered — breaker closed")
+
+
+def record_http_error(host, code, now=None, path=None):
+    """An HTTP error response: 5xx counts as a failure, anything else as the host answering"""
+    if code >= 500:
+        return record_failure(host, now, path)
+    record_success(host, path)
+    return False
+
+
+def state(host, path=None):
+    entry = _read(path).get(host)
+    return entry["state"] if entry else "closed"
+
+
+def snapshot(now=None, path=None):
+    """{host: "open (retry in 42s)" | "half_open" | "closed (1 failure)"} for every tracked host"""
+    now = time.time() if now is None else now
+    out = {}
+    for host, entry in sorted(_read(path).items()):
+        if entry["state"] == "open":
+            wait = max(0, entry["opened_at"] + _cooldown(entry) - now)
+            out[host] = f"open (retry in {wait:.0f}s)"
+        elif entry["state"] == "half_open":
+            out[host] = "half_open"
+        else:
+            out[host] = f"closed ({entry['failures']} failure{'s' if entry['failures'] != 1 else ''})"
+    return out
+
+
+def quality_note(path=None):
+    """Breakers that aren't closed, for data_quality fields ("" when all are closed)"""
+    tripped = {host: s for host, s in snapshot(path=path).items() if not s.startswith("closed")}
+    return ", ".join(f"{host} {s}" for host, s in tripped.items())
+
+
+# === CLI ===
+if __name__ == "__main__":
+    if "--reset" in sys.argv:
+        Path(STATE_PATH).unlink(missing_ok=True)
+        print("🔌 All breakers closed")
+        sys.exit(0)
+    states = snapshot()
+    if not states:
+        print("🔌 No breaker has tripped — every upstream closed")
+    for host, s in states.items():
+        print(f"🔌 {host}: {s}")
@@ -5,23 +5,43 @@ Kalshi BTC Daily Market Monitor
 - Signals: 24h momentum, 1h momentum, 24h range position, Fear & Greed, volume
 - Settlement guard: no trades within 90 min of market close
 - Duplicate check: skips if an open order or position already exists for the ticker
-- Set KALSHI_DRY_RUN=true for paper trading (no real orders placed)
+- Set KALSHI_DRY_RUN=true for paper trading (no real orders placed); add
+  KALSHI_PAPER_SIM=true to fill paper orders through kalshi_simulator.py
+- Pass --profile to write a per-stage cProfile/tracemalloc report
 """
 
 import os
 import sys
 import json
 import datetime
+import urllib.parse
 import urllib.request
 import urllib.error
 import time
 import random
+from array import array
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
 # Import auth layer from kalshi.py (same directory — single source of truth for auth)
 sys.path.insert(0, str(Path(__file__).parent))
-from kalshi import make_request as kalshi_request
+from kalshi import make_request as kalshi_request, iter_all, iter_request
+import kalshi_breaker as breaker
+import kalshi_cassette as cassette
+import kalshi_codec as codec
+import kalshi_fear_greed
+import kalshi_metrics as metrics
+import kalshi_trace as trace
+from kalshi_trace import span
 from kalshi_paper_tracker import log_paper_trade
+from kalshi_records import MAX_BET, MIN_BET, SIGNAL_NAMES, Market, Recommendation, fmt_cents, fmt_usd
+from kalshi_live_ledger import record_entry
+import kalshi_maker as maker
+from kalshi_maker import MAKER_MODE
+from kalshi_notify import notify
+from kalshi_simulator import simulate_paper_fill
+from kalshi_execution import (OrderTracker, build_order, fill_cost_cents, filled_count, order_price,
+                              order_state, submit_orders)
 
 # === CONFIG ===
 TRADE_LOG = Path(os.environ.get(
@@ -29,6 +49,10 @@ TRADE_LOG = Path(os.environ.get(
     str(Path(__file__).parent.parent / "memory" / "kalshi-btc-trades.md"),
 ))
 DRY_RUN = os.environ.get("KALSHI_DRY_RUN", "false").lower() == "true"
+PROFILE_DIR = Path(os.environ.get(
+    "KALSHI_PROFILE_DIR",
+    str(Path(__file__).parent.parent / "memory" / "profiles"),
+))
 
 BTC_CACHE_PATH = Path(os.environ.get(
     "BTC_CACHE_PATH",
@@ -40,9 +64,10 @@ MAX_RETRIES = 3
 BASE_BACKOFF_SECONDS = 0.5
 MAX_BACKOFF_SECONDS = 6.0
 
-# Position sizing
-MIN_BET = 100  # dollars
-MAX_BET = 300  # dollars
+# Only the market fields the strategy reads are kept from the (large) list response
+MARKET_PAGE_LIMIT = 1000
+MARKET_FIELDS = ("ticker", "close_time", "status", "yes_bid", "yes_ask", "no_bid", "no_ask",
+                 "volume", "open_interest")
 
 # Market filter params
 MAX_ENTRY_COST = 35     # max cents to pay per contract
@@ -55,6 +80,16 @@ MIN_VOLUME_USD = 30e9    # $30B 24h volume threshold for volume signal
 
 SETTLEMENT_GUARD_MINUTES = 90  # no new trades within 90 min of market close
 
+# Order lifecycle (live only): cancel the unfilled remainder after this long
+ORDER_FILL_DEADLINE_SECONDS = int(os.environ.get("KALSHI_ORDER_DEADLINE_SEC", "120"))
+# Dry run: work paper orders through the matching simulator for the same window
+PAPER_SIM = os.environ.get("KALSHI_PAPER_SIM", "false").lower() == "true"
+
+# Order book depth
+ORDERBOOK_CANDIDATES = 5   # nearest qualifying strikes priced against the live book
+ORDERBOOK_WORKERS = 5      # concurrent orderbook fetches
+MIN_FILL_FRACTION = 0.5    # book must absorb >= 50% of MIN_BET under MAX_ENTRY_COST
+
 # Time-to-settlement distance scaling
 # More time remaining = BTC has more room to move = require wider buffer
 # Less time remaining = accept tighter strikes
@@ -69,15 +104,39 @@ DISTANCE_SCALE = {
 }
 
 
-def _scaled_min_distance(minutes_remaining):
+def strategy_config(**overrides):
+    """
+    Strategy thresholds as a dict, read from the constants above with
+    per-strategy overrides applied (see kalshi_strategies.py).
+    """
+    cfg = {
+        "min_24h_momentum": MIN_24H_MOMENTUM,
+        "min_signal_score": MIN_SIGNAL_SCORE,
+        "min_volume_usd": MIN_VOLUME_USD,
+        "max_entry_cost": MAX_ENTRY_COST,
+        "min_distance_pct": MIN_DISTANCE_PCT,
+        "distance_tiers": DISTANCE_SCALE["tiers"],
+        "settlement_guard_minutes": SETTLEMENT_GUARD_MINUTES,
+        "orderbook_candidates": ORDERBOOK_CANDIDATES,
+        "min_fill_fraction": MIN_FILL_FRACTION,
+    }
+    unknown = set(overrides) - set(cfg)
+    if unknown:
+        raise ValueError(f"Unknown strategy setting(s): {', '.join(sorted(unknown))}")
+    cfg.update(overrides)
+    return cfg
+
+
+def _scaled_min_distance(minutes_remaining, cfg=None):
     """Return min distance % scaled by time to settlement."""
+    cfg = cfg or strategy_config()
     if minutes_remaining is None:
-        return MIN_DISTANCE_PCT  # fallback to static default
+        return cfg["min_distance_pct"]  # fallback to static default
     hours = minutes_remaining / 60
-    for max_h, dist in DISTANCE_SCALE["tiers"]:
+    for max_h, dist in cfg["distance_tiers"]:
         if hours <= max_h:
             return dist
-    return DISTANCE_SCALE["tiers"][-1][1]  # use largest tier
+    return cfg["distance_tiers"][-1][1]  # use largest tier
 
 
 # === DATA FETCHING ===
@@ -90,24 +149,47 @@ def _backoff_delay(attempt: int) -> float:
     return base + jitter
 
 def _fetch_json_with_retry(url: str, timeout: int = 15):
+    """GET JSON with retries; raises CircuitOpen at once while the host's breaker is open"""
     req = urllib.request.Request(url, headers={"User-Agent": "Mozilla/5.0"})
+    parsed = urllib.parse.urlsplit(url)
+    host = None if cassette.MODE else parsed.netloc
+    if not breaker.allow(host):
+        raise breaker.CircuitOpen(host)
+    instrument = metrics.ENABLED
+    if instrument:
+        upstream, endpoint = parsed.hostname, parsed.path
+        started = time.perf_counter()
     for attempt in range(1, MAX_RETRIES + 1):
         try:
-            with urllib.request.urlopen(req, timeout=timeout) as resp:
-                return json.loads(resp.read())
+            with cassette.urlopen(req, timeout=timeout) as resp:
+                body = resp.read()
+            breaker.record_success(host)
+            if instrument:
+                metrics.observe(upstream, endpoint, time.perf_counter() - started, attempt, True, len(body))
+            return codec.loads(body)
         except urllib.error.HTTPError as e:
-            if _is_retryable_status(e.code) and attempt < MAX_RETRIES:
+            tripped = breaker.record_http_error(host, e.code)
+            if _is_retryable_status(e.code) and attempt < MAX_RETRIES and not tripped:
                 delay = _backoff_delay(attempt)
                 print(f"[btc] HTTP {e.code} retrying in {delay:.2f}s (attempt {attempt}/{MAX_RETRIES})")
-                time.sleep(delay)
+                if instrument:
+                    metrics.count_retry(upstream, endpoint, e.code)
+                cassette.sleep(delay)
                 continue
+            if instrument:
+                metrics.observe(upstream, endpoint, time.perf_counter() - started, attempt, False)
             raise
         except Exception:
-            if attempt < MAX_RETRIES:
+            tripped = breaker.record_failure(host)
+            if attempt < MAX_RETRIES and not tripped:
                 delay = _backoff_delay(attempt)
                 print(f"[btc] request error retrying in {delay:.2f}s (attempt {attempt}/{MAX_RETRIES})")
-                time.sleep(delay)
+                if instrument:
+                    metrics.count_retry(upstream, endpoint)
+                cassette.sleep(delay)
                 continue
+            if instrument:
+                metrics.observe(upstream, endpoint, time.perf_counter() - started, attempt, False)
             raise
 
 def _write_btc_cache(payload: dict):
@@ -163,17 +245,15 @@ def get_btc_data():
 
 
 def get_fear_greed():
-    """Fetch Fear & Greed Index from alternative.me (0=extreme fear, 100=extreme greed)"""
+    """
+    Fear & Greed Index from alternative.me (0=extreme fear, 100=extreme greed),
+    served from the local daily store until the published next update is due
+    """
     try:
-        req = urllib.request.Request(
-            "https://api.alternative.me/fng/?limit=1",
-            headers={"User-Agent": "Mozilla/5.0"},
-        )
-        with urllib.request.urlopen(req, timeout=10) as resp:
-            data = json.loads(resp.read())
-            value = int(data["data"][0]["value"])
-            label = data["data"][0]["value_classification"]
-            return {"value": value, "label": label}
+        if cassette.MODE:  # recorded sessions carry their own response, independent of the local store
+            entry = kalshi_fear_greed.fetch(1, _fetch_json_with_retry)[0]
+            return {"value": int(entry["value"]), "label": entry["value_classification"]}
+        return kalshi_fear_greed.get_current(_fetch_json_with_retry)
     except Exception as e:
         print(f"⚠️  Fear & Greed fetch failed: {e}")
         return None
@@ -181,14 +261,21 @@ def get_fear_greed():
 
 # === MARKET DATA ===
 def get_btc_markets():
-    """Get open KXBTCD daily BTC markets"""
-    result = kalshi_request("GET", "/trade-api/v2/markets?series_ticker=KXBTCD&status=open&limit=50")
-    return result.get("markets", [])
+    """Get open KXBTCD daily BTC markets as Market records (all pages, streamed)"""
+    path = f"/trade-api/v2/markets?series_ticker=KXBTCD&status=open&limit={MARKET_PAGE_LIMIT}"
+    meta = {}
+    markets = [Market.from_api(m) for m in iter_all(path, "markets", MARKET_FIELDS, meta)]
+    if "error" in meta:
+        print(f"⚠️  Market fetch error: {meta['error']}")
+    return markets
 
 
 # === LOGGING ===
 def log_trade(action, details):
-    """Append trade or analysis entry to the markdown trade log"""
+    """Append trade or analysis entry to the markdown trade log (with stage timings so far)"""
+    timings = trace.current_summary()
+    if timings:
+        details = {**details, "timings": timings}
     timestamp = datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S PST")
     TRADE_LOG.parent.mkdir(parents=True, exist_ok=True)
     if not TRADE_LOG.exists():
@@ -203,24 +290,20 @@ def log_trade(action, details):
 # === DUPLICATE CHECK ===
 def has_existing_exposure(ticker):
     """Return True if there's already an open order or position for this ticker"""
-    orders = kalshi_request("GET", "/trade-api/v2/portfolio/orders?status=resting")
-    if "orders" in orders:
-        for o in orders.get("orders", []):
-            if o.get("ticker") == ticker:
-                return True
-    positions = kalshi_request("GET", "/trade-api/v2/portfolio/positions")
-    if "market_positions" in positions:
-        for p in positions.get("market_positions", []):
-            if p.get("ticker") == ticker:
-                return True
-    return False
+    # Streamed: stops reading as soon as a match turns up
+    orders = iter_request("/trade-api/v2/portfolio/orders?status=resting", "orders", ("ticker",))
+    if any(o.get("ticker") == ticker for o in orders):
+        return True
+    positions = iter_request("/trade-api/v2/portfolio/positions", "market_positions", ("ticker",))
+    return any(p.get("ticker") == ticker for p in positions)
 
 
 # === SIGNAL SCORING ===
-def score_signals(btc, fear_greed, bullish):
+def score_signals(btc, fear_greed, bullish, cfg=None):
     """
-    Score 5 technical signals. Returns (score, breakdown_dict).
-    Trade only if score >= MIN_SIGNAL_SCORE.
+    Score 5 technical signals. Returns (score, breakdown_dict, fired) where
+    breakdown holds display strings and fired maps each signal to a bool.
+    Trade only if score >= MIN_SIGNAL_SCORE (or cfg["min_signal_score"]).
 
     Signals:
       1. 24h momentum strength  (>= 1.0%)
@@ -231,11 +314,13 @@ def score_signals(btc, fear_greed, bullish):
     """
     score = 0
     breakdown = {}
+    fired = dict.fromkeys(SIGNAL_NAMES, False)
 
     # Signal 1: 24h momentum strength
     if abs(btc["change_24h"]) >= 1.0:
         score += 1
         breakdown["1_24h_momentum"] = f"✅ {btc['change_24h']:+.2f}% (strong)"
+        fired["1_24h_momentum"] = True
     else:
         breakdown["1_24h_momentum"] = f"❌ {btc['change_24h']:+.2f}% (weak, need ±1%)"
 
@@ -244,6 +329,7 @@ def score_signals(btc, fear_greed, bullish):
     if h1_aligns and abs(btc["change_1h"]) >= 0.1:
         score += 1
         breakdown["2_1h_momentum"] = f"✅ {btc['change_1h']:+.2f}% (confirms direction)"
+        fired["2_1h_momentum"] = True
     else:
         breakdown["2_1h_momentum"] = f"❌ {btc['change_1h']:+.2f}% (conflicts or flat)"
 
@@ -254,9 +340,11 @@ def score_signals(btc, fear_greed, bullish):
         if bullish and range_pos >= 0.6:
             score += 1
             breakdown["3_range_position"] = f"✅ {range_pos:.0%} of range (near high — bullish)"
+            fired["3_range_position"] = True
         elif not bullish and range_pos <= 0.4:
             score += 1
             breakdown["3_range_position"] = f"✅ {range_pos:.0%} of range (near low — bearish)"
+            fired["3_range_position"] = True
         else:
             direction = "bullish" if bullish else "bearish"
             breakdown["3_range_position"] = f"❌ {range_pos:.0%} of range (not confirming {direction})"
@@ -272,6 +360,7 @@ def score_signals(btc, fear_greed, bullish):
         if 25 <= fg <= 75:
             score += 1
             breakdown["4_fear_greed"] = f"✅ {fg} — {label} (neutral zone — momentum can sustain)"
+            fired["4_fear_greed"] = True
         else:
             extreme = "extreme fear" if fg < 25 else "extreme greed"
             breakdown["4_fear_greed"] = f"❌ {fg} — {label} ({extreme} — mean-reversion risk)"
@@ -279,94 +368,198 @@ def score_signals(btc, fear_greed, bullish):
         breakdown["4_fear_greed"] = "⚠️  unavailable (not counted)"
 
     # Signal 5: Volume conviction
+    min_volume = cfg["min_volume_usd"] if cfg else MIN_VOLUME_USD
     vol_b = btc["volume_24h"] / 1e9
-    if btc["volume_24h"] >= MIN_VOLUME_USD:
+    if btc["volume_24h"] >= min_volume:
         score += 1
         breakdown["5_volume"] = f"✅ ${vol_b:.1f}B (elevated — move has conviction)"
+        fired["5_volume"] = True
     else:
-        breakdown["5_volume"] = f"❌ ${vol_b:.1f}B (low — need ${MIN_VOLUME_USD/1e9:.0f}B+)"
+        breakdown["5_volume"] = f"❌ ${vol_b:.1f}B (low — need ${min_volume/1e9:.0f}B+)"
 
-    return score, breakdown
+    return score, breakdown, fired
 
 
 # === STRATEGY ===
-def find_best_market(markets, btc_price, bullish):
+def _qualifying_markets(markets, btc_price, bullish, cfg=None):
     """
-    Among qualifying markets, return the one with the smallest distance
-    from current price that still meets entry cost and distance filters.
-    Nearest strike = highest win probability while maintaining a buffer.
+    Return every Market that passes the settlement guard, distance and
+    top-of-book cost filters as Recommendations, nearest strike first.
     """
-    now_utc = datetime.datetime.now(datetime.timezone.utc)
-    best = None
-    best_distance = float("inf")
+    cfg = cfg or strategy_config()
+    guard_minutes, max_cost = cfg["settlement_guard_minutes"], cfg["max_entry_cost"]
+    now_ts = time.time()
+    candidates = []
 
     for m in markets:
-        ticker = m.get("ticker", "")
-
         # Settlement time guard
-        close_time_str = m.get("close_time", "")
         minutes_remaining = None
-        if close_time_str:
-            try:
-                close_time = datetime.datetime.fromisoformat(close_time_str.replace("Z", "+00:00"))
-                minutes_remaining = (close_time - now_utc).total_seconds() / 60
-                if minutes_remaining < SETTLEMENT_GUARD_MINUTES:
-                    continue
-            except ValueError:
-                pass
+        if m.close_ts is not None:
+            minutes_remaining = (m.close_ts - now_ts) / 60
+            if minutes_remaining < guard_minutes:
+                continue
 
         # Scale distance requirement by time to settlement
-        min_dist = _scaled_min_distance(minutes_remaining)
+        min_dist = _scaled_min_distance(minutes_remaining, cfg)
 
-        # Extract strike from ticker (e.g. KXBTCD-26FEB0317-T78499.99)
-        try:
-            strike = float(ticker.split("-T")[1])
-        except (IndexError, ValueError):
+        # Strike comes from the ticker (e.g. KXBTCD-26FEB0317-T78499.99)
+        strike = m.strike
+        if strike is None:
             continue
 
-        yes_bid = m.get("yes_bid") or 0
-        yes_ask = m.get("yes_ask") or 0
-        no_ask = (100 - yes_bid) if yes_bid else 0
+        no_ask = (100 - m.yes_bid) if m.yes_bid else 0
 
         # BULLISH: BUY YES — betting BTC closes above strike
-        if bullish and strike < btc_price and yes_ask > 0:
-            distance_pct = (btc_price - strike) / btc_price * 100
-            if distance_pct >= min_dist and yes_ask <= MAX_ENTRY_COST:
-                if distance_pct < best_distance:
-                    best_distance = distance_pct
-                    best = {
-                        "action": "BUY YES",
-                        "ticker": ticker,
-                        "strike": f"${strike:,.2f}",
-                        "current_price": f"${btc_price:,.2f}",
-                        "distance": f"{distance_pct:.2f}%",
-                        "implied_prob": f"{yes_ask}%",
-                        "cost": f"{yes_ask}¢",
-                        "potential_profit": f"{100 - yes_ask}¢",
-                        "_settlement_time": close_time_str,
-                    }
-
         # BEARISH: BUY NO — betting BTC closes below strike
-        if not bullish and strike > btc_price and no_ask > 0:
+        if bullish and strike < btc_price and m.yes_ask > 0:
+            action, ask = "BUY YES", m.yes_ask
+            distance_pct = (btc_price - strike) / btc_price * 100
+        elif not bullish and strike > btc_price and no_ask > 0:
+            action, ask = "BUY NO", no_ask
             distance_pct = (strike - btc_price) / btc_price * 100
-            if distance_pct >= min_dist and no_ask <= MAX_ENTRY_COST:
-                if distance_pct < best_distance:
-                    best_distance = distance_pct
-                    best = {
-                        "action": "BUY NO",
-                        "ticker": ticker,
-                        "strike": f"${strike:,.2f}",
-                        "current_price": f"${btc_price:,.2f}",
-                        "distance": f"{distance_pct:.2f}%",
-                        "implied_prob": f"{no_ask}%",
-                        "cost": f"{no_ask}¢",
-                        "potential_profit": f"{100 - no_ask}¢",
-                        "_settlement_time": close_time_str,
-                    }
+        else:
+            continue
+
+        if distance_pct < min_dist or ask > max_cost:
+            continue
+
+        candidates.append(Recommendation(
+            action=action,
+            ticker=m.ticker,
+            strike=strike,
+            btc_price=btc_price,
+            distance_pct=distance_pct,
+            cost_cents=ask,
+            settlement_time=m.close_time,
+        ))
+
+    candidates.sort(key=lambda c: c.distance_pct)
+    return candidates
+
+
+def find_best_market(markets, btc_price, bullish, cfg=None):
+    """
+    Among qualifying markets, return the one with the smallest distance
+    from current price that still meets entry cost and distance filters.
+    Nearest strike = highest win probability while maintaining a buffer.
+    Prices come from the quoted top of book only — see select_market.
+    """
+    candidates = _qualifying_markets(markets, btc_price, bullish, cfg)
+    return candidates[0] if candidates else None
+
+
+# === ORDER BOOK ===
+def get_orderbook(ticker):
+    """Fetch the order book for one market. Returns the orderbook dict or None on error."""
+    result = kalshi_request("GET", f"/trade-api/v2/markets/{ticker}/orderbook")
+    if "error" in result:
+        print(f"⚠️  Orderbook fetch failed for {ticker}: {result['error']}")
+        return None
+    return result.get("orderbook") or {}
+
+
+def parse_ask_ladder(orderbook, side):
+    """
+    Return (prices, sizes) arrays of the asks available to a buyer of `side`,
+    cheapest first. Kalshi books only carry bids: buying YES lifts NO bids at
+    100 - price, buying NO lifts YES bids at 100 - price.
+    """
+    opposite = "no" if side == "yes" else "yes"
+    levels = sorted(orderbook.get(opposite) or [], key=lambda lvl: lvl[0], reverse=True)
+    prices = array("i", (100 - price for price, _ in levels))
+    sizes = array("i", (qty for _, qty in levels))
+    return prices, sizes
+
 
+def fill_from_ladder(prices, sizes, budget_cents, max_price=MAX_ENTRY_COST):
+    """
+    Walk an ask ladder buying as many contracts as `budget_cents` allows
+    without paying more than `max_price` at any level.
+    Returns {"contracts", "total_cents", "avg_cost", "limit_price"} or None if nothing fills.
+    """
+    contracts = total = limit_price = 0
+    remaining = budget_cents
+    for i in range(len(prices)):
+        price = prices[i]
+        if price > max_price or price > remaining:
+            break
+        take = min(sizes[i], remaining // price)
+        contracts += take
+        total += take * price
+        remaining -= take * price
+        limit_price = price
+        if take < sizes[i]:
+            break
+    if not contracts:
+        return None
+    return {
+        "contracts": contracts,
+        "total_cents": total,
+        "avg_cost": total / contracts,
+        "limit_price": limit_price,
+    }
+
+
+def select_market(markets, btc_price, bullish, cfg=None, book_cache=None):
+    """
+    Like find_best_market, but prices the nearest ORDERBOOK_CANDIDATES strikes
+    against their live order books (fetched concurrently) and returns the one
+    with the lowest volume-weighted average cost for MIN_BET under
+    MAX_ENTRY_COST; equal costs go to the nearer strike. Books too thin to fill
+    MIN_FILL_FRACTION of MIN_BET are skipped. The recommendation carries the
+    fill in .fill.
+    Falls back to the quoted top of book if no order book could be fetched.
+    `book_cache` (ticker -> book) lets several strategies share one fetch per book.
+    """
+    cfg = cfg or strategy_config()
+    max_cost = cfg["max_entry_cost"]
+    candidates = _qualifying_markets(markets, btc_price, bullish, cfg)[:cfg["orderbook_candidates"]]
+    if not candidates:
+        return None
+
+    book_cache = {} if book_cache is None else book_cache
+    missing = [c.ticker for c in candidates if c.ticker not in book_cache]
+    if missing:
+        with ThreadPoolExecutor(max_workers=ORDERBOOK_WORKERS) as pool:
+            book_cache.update(zip(missing, pool.map(get_orderbook, missing)))
+    books = [book_cache[c.ticker] for c in candidates]
+
+    if all(book is None for book in books):
+        print("⚠️  No order books available — sizing on quoted top of book")
+        return candidates[0]
+
+    budget = MIN_BET * 100
+    priced = []
+    for candidate, book in zip(candidates, books):
+        if book is None:
+            continue
+        prices, sizes = parse_ask_ladder(book, candidate.side)
+        fill = fill_from_ladder(prices, sizes, budget, max_cost)
+        if not fill or fill["total_cents"] < budget * cfg["min_fill_fraction"]:
+            print(f"   {candidate.ticker}: insufficient depth under {max_cost}¢")
+            continue
+        priced.append((fill["avg_cost"], len(priced), candidate, fill))
+
+    if not priced:
+        return None
+
+    # candidates are nearest first, so the index breaks cost ties toward the nearer strike
+    _, _, best, fill = min(priced)
+    best.fill = fill
+    best.cost_cents = round(fill["avg_cost"])
     return best
 
 
+def thesis(btc, bullish, score, signal_count, strike):
+    """One-line rationale recorded with a recommendation"""
+    direction_str = f"up {btc['change_24h']:+.1f}%" if bullish else f"down {btc['change_24h']:+.1f}%"
+    side_str = "above" if bullish else "below"
+    return (
+        f"BTC {direction_str} 24h, score {score}/{signal_count}. "
+        f"Betting it closes {side_str} ${strike:,.0f} at settlement."
+    )
+
+
 # === EXECUTION (live only) ===
 def size_position(cost_cents):
     """Return (contracts, total_cost_usd) using MIN_BET/MAX_BET sizing"""
@@ -376,48 +569,102 @@ def size_position(cost_cents):
     return contracts, round(contracts * cost_cents / 100, 2)
 
 
-def execute_trade(recommendation, data_quality=None):
-    """Place a live order. Returns trade details dict or None on failure."""
-    ticker = recommendation["ticker"]
-    action = recommendation["action"]
-    cost_cents = int(recommendation["cost"].replace("¢", ""))
-    side = "no" if "NO" in action else "yes"
-    contracts, total_cost = size_position(cost_cents)
-
-    data = {
-        "ticker": ticker,
-        "action": "buy",
-        "side": side,
-        "type": "limit",
-        "count": contracts,
-        "yes_price": cost_cents if side == "yes" else None,
-        "no_price": cost_cents if side == "no" else None,
-    }
-    data = {k: v for k, v in data.items() if v is not None}
-
-    result = kalshi_request("POST", "/trade-api/v2/portfolio/orders", data)
+def execute_trade(recommendation, data_quality=None, context=None):
+    """
+    Place a live order for a Recommendation. With a book fill (from
+    select_market) the order is sized to the walked depth and limited at the
+    deepest level needed; otherwise it is sized at the quoted cost. `context`
+    (signal_score, signals, btc) is recorded against the order ID for the
+    live ledger. With MAKER_MODE, trades that aren't urgent are worked inside
+    the spread by kalshi_maker instead (same size, capped below that price).
+    Returns trade details dict or None on failure.
+    """
+    fill = recommendation.fill
+    if fill:
+        cost_cents = fill["limit_price"]
+        contracts, total_cost = fill["contracts"], round(fill["total_cents"] / 100, 2)
+    else:
+        cost_cents = recommendation.cost_cents
+        contracts, total_cost = size_position(cost_cents)
+
+    give_up = maker.give_up_time(recommendation.settlement_time, SETTLEMENT_GUARD_MINUTES) if MAKER_MODE else None
+    cap = maker.price_cap(cost_cents, MAX_ENTRY_COST)
+    if give_up and cap >= 1:
+        at = datetime.datetime.fromtimestamp(give_up).strftime("%H:%M")
+        print(f"🪝 Maker mode: bidding ≤{cap}¢ inside the spread until {at}")
+        order, maker_stats = maker.work_order(recommendation.ticker, recommendation.side, contracts, cap, give_up)
+        cost_cents = cap
+    else:
+        order = submit_orders([build_order(recommendation.ticker, recommendation.side, contracts, cost_cents)])[0]
+        maker_stats = None
 
-    trade_preview = {**recommendation, "contracts": contracts, "total_cost": f"${total_cost:.2f}"}
+    trade_preview = {**recommendation.display(), "contracts": contracts, "total_cost": fmt_usd(total_cost)}
     if data_quality:
         trade_preview["data_quality"] = data_quality
 
-    if "error" not in result:
-        order = result.get("order", {})
-        trade_details = {
-            **trade_preview,
-            "order_id": order.get("order_id", "unknown"),
-            "status": order.get("status", "unknown"),
-        }
-        log_trade("TRADE EXECUTED", trade_details)
-        return trade_details
-    else:
-        log_trade("TRADE FAILED", {"error": result["error"], **recommendation})
+    if "error" in order:
+        log_trade("TRADE FAILED", {"error": order["error"], **recommendation.display()})
+        notify("trade_failed", f"❌ Order failed: {contracts}x {recommendation.side.upper()} "
+                               f"{recommendation.ticker} @ {cost_cents}¢ — {order['error']}")
         return None
+    if context:
+        record_entry(order["order_id"], recommendation, **context)
+
+    if maker_stats is None:
+        # Follow the order until it fills or the deadline passes, then pull the remainder
+        tracker = OrderTracker([order])
+        if not tracker.wait(ORDER_FILL_DEADLINE_SECONDS):
+            print(f"⏱️  Order unfilled after {ORDER_FILL_DEADLINE_SECONDS}s — canceling remainder")
+            tracker.expire_unfilled("cancel")
+        order = tracker.orders.get(order["order_id"], order)
+    else:
+        # Report what the worked order paid (it may have filled below the cap), not the cap
+        filled, paid = filled_count(order), fill_cost_cents(order)
+        cost_cents = round(paid / filled) if filled else order_price(order)
+        trade_preview.update(cost=fmt_cents(cost_cents), potential_profit=fmt_cents(100 - cost_cents),
+                             total_cost=fmt_usd(paid / 100))
+
+    trade_details = {
+        **trade_preview,
+        "order_id": order.get("order_id", "unknown"),
+        "status": order_state(order),
+        "filled": f"{filled_count(order)}/{contracts}",
+    }
+    if maker_stats is not None:
+        trade_details["execution"] = (f"maker ≤{cap}¢, {maker_stats['requotes']} requotes, "
+                                      f"{maker_stats['overruns']} tick overruns")
+    action = "TRADE EXECUTED" if filled_count(order) else "TRADE UNFILLED"
+    log_trade(action, trade_details)
+    notify("trade", f"{'✅' if filled_count(order) else '⏱️'} {action.title()}: {trade_details['filled']} "
+                    f"{recommendation.side.upper()} {recommendation.ticker} @ {cost_cents}¢ "
+                    f"({trade_details['status']}, {trade_details['order_id']})")
+    return trade_details
 
 
 # === MAIN ===
-def run_monitor():
-    """Main entry point"""
+def _data_quality(btc):
+    """'live' / 'cached', plus every upstream whose circuit breaker isn't closed"""
+    quality = "cached" if btc.get("_from_cache") else "live"
+    tripped = breaker.quality_note()
+    return f"{quality}; breakers: {tripped}" if tripped else quality
+
+
+def run_monitor(profile=False):
+    """
+    Main entry point. Every stage runs in a trace span; profile=True also
+    captures cProfile + tracemalloc per stage and writes a report to PROFILE_DIR.
+    """
+    tracer = trace.start(profile=profile)
+    try:
+        _run_stages()
+    finally:
+        trace.stop()
+        print(f"\n⏱️  {tracer.summary()}")
+        if profile:
+            print(f"📄 Profile report: {tracer.write_report(PROFILE_DIR)}")
+
+
+def _run_stages():
     print(f"\n{'='*50}")
     print(f"BTC Monitor - {datetime.datetime.now().strftime('%Y-%m-%d %H:%M:%S PST')}")
     if DRY_RUN:
@@ -425,9 +672,11 @@ def run_monitor():
     print("=" * 50)
 
     # Verify API connectivity via balance check
-    result = kalshi_request("GET", "/trade-api/v2/portfolio/balance")
+    with span("balance"):
+        result = kalshi_request("GET", "/trade-api/v2/portfolio/balance")
     if "error" in result:
         print(f"❌ API error: {result['error']}")
+        notify("error", f"❌ BTC monitor: API error — {result['error']}")
         sys.exit(1)
 
     balance = result.get("balance", 0) / 100
@@ -438,7 +687,8 @@ def run_monitor():
         return
 
     # Fetch BTC data
-    btc = get_btc_data()
+    with span("btc_fetch"):
+        btc = get_btc_data()
     if not btc:
         print("❌ Could not fetch BTC data or cache. No trade.")
         log_trade("NO TRADE", {
@@ -448,12 +698,14 @@ def run_monitor():
 
     print(f"₿  BTC:  ${btc['price']:,.2f}  |  1h: {btc['change_1h']:+.2f}%  |  24h: {btc['change_24h']:+.2f}%")
     print(f"   Range: ${btc['low_24h']:,.0f} – ${btc['high_24h']:,.0f}  |  Vol: ${btc['volume_24h']/1e9:.1f}B")
-    data_quality = "cached" if btc.get("_from_cache") else "live"
-    if btc.get("_from_cache"):
-        print("⚠️  Data quality: cached (degraded)")
+    data_quality = _data_quality(btc)
+    if data_quality != "live":
+        print(f"⚠️  Data quality: {data_quality} (degraded)")
 
     # Hard momentum gate
-    if abs(btc["change_24h"]) < MIN_24H_MOMENTUM:
+    with span("gating"):
+        gated = abs(btc["change_24h"]) < MIN_24H_MOMENTUM
+    if gated:
         print(f"\n😴 24h momentum too low ({btc['change_24h']:+.2f}%) — staying flat")
         log_trade("NO TRADE", {
             "btc_price": f"${btc['price']:,.2f}",
@@ -466,10 +718,13 @@ def run_monitor():
     bullish = btc["change_24h"] > 0
 
     # Fetch Fear & Greed
-    fear_greed = get_fear_greed()
+    with span("fear_greed"):
+        fear_greed = get_fear_greed()
+    data_quality = _data_quality(btc)  # picks up a Fear & Greed breaker
 
     # Score signals
-    score, breakdown = score_signals(btc, fear_greed, bullish)
+    with span("scoring"):
+        score, breakdown, fired = score_signals(btc, fear_greed, bullish)
 
     direction = "BULLISH" if bullish else "BEARISH"
     print(f"\n📡 Signal Score: {score}/{len(breakdown)} — {direction} bias")
@@ -490,60 +745,77 @@ def run_monitor():
         return
 
     # Fetch markets and find best setup
-    markets = get_btc_markets()
+    with span("markets"):
+        markets = get_btc_markets()
     if not markets:
         print("❌ No open KXBTCD markets found.")
         return
     print(f"\n📊 {len(markets)} open KXBTCD markets")
 
-    recommendation = find_best_market(markets, btc["price"], bullish)
+    with span("selection"):
+        recommendation = select_market(markets, btc["price"], bullish)
 
     if not recommendation:
         print("\n😴 No market meets distance/cost criteria — staying flat")
         log_trade("NO TRADE", {
             "btc_price": f"${btc['price']:,.2f}",
             "signal_score": f"{score}/{len(breakdown)}",
-            "reason": "No market met MIN_DISTANCE_PCT or MAX_ENTRY_COST filter",
+            "reason": "No market met MIN_DISTANCE_PCT, MAX_ENTRY_COST or book depth filter",
             "data_quality": data_quality,
         })
         return
 
     # Add thesis to recommendation
-    direction_str = f"up {btc['change_24h']:+.1f}%" if bullish else f"down {btc['change_24h']:+.1f}%"
-    side_str = "above" if bullish else "below"
-    recommendation["thesis"] = (
-        f"BTC {direction_str} 24h, score {score}/{len(breakdown)}. "
-        f"Betting it closes {side_str} ${float(recommendation['strike'].replace('$','').replace(',','')):,.0f} at settlement."
-    )
+    recommendation.thesis = thesis(btc, bullish, score, len(breakdown), recommendation.strike)
 
     print(f"\n🎯 Best opportunity:")
-    for k, v in recommendation.items():
+    for k, v in recommendation.display().items():
         print(f"   {k}: {v}")
 
     # Duplicate check (live mode only — paper trades always log)
-    ticker = recommendation["ticker"]
-    if not DRY_RUN and has_existing_exposure(ticker):
+    ticker = recommendation.ticker
+    with span("exposure"):
+        exposed = not DRY_RUN and has_existing_exposure(ticker)
+    if exposed:
         print(f"\n⚠️  Already have exposure on {ticker} — skipping")
-        log_trade("SKIPPED", {**recommendation, "reason": "Existing order or position", "data_quality": data_quality})
+        log_trade("SKIPPED", {**recommendation.display(), "reason": "Existing order or position", "data_quality": data_quality})
         return
 
-    # Strip internal metadata key before passing to execution/logging
-    settlement_time = recommendation.pop("_settlement_time", None)
-
+    cost = fmt_cents(recommendation.cost_cents)
     if DRY_RUN:
-        contracts, total_cost = size_position(int(recommendation["cost"].replace("¢", "")))
-        trade_id = log_paper_trade(recommendation, score, breakdown, btc, settlement_time)
+        fill = recommendation.fill
+        if fill:
+            contracts, total_cost = fill["contracts"], fill["total_cents"] / 100
+        else:
+            contracts, total_cost = size_position(recommendation.cost_cents)
+        if PAPER_SIM:
+            print(f"\n🧮 [DRY RUN] Working a simulated order for {ORDER_FILL_DEADLINE_SECONDS}s...")
+            with span("simulation"):
+                sim_fill = simulate_paper_fill(recommendation, contracts, ORDER_FILL_DEADLINE_SECONDS)
+            if not sim_fill:
+                print("😴 Simulated order did not fill — no paper trade")
+                log_trade("NO FILL (SIM)", {**recommendation.display(), "data_quality": data_quality})
+                return
+            recommendation.fill = sim_fill
+            contracts, total_cost = sim_fill["contracts"], sim_fill["total_cents"] / 100
+        with span("execution"):
+            trade_id = log_paper_trade(recommendation, score, breakdown, btc, signal_flags=fired)
         print(f"\n📝 [DRY RUN] Paper trade logged — ID: {trade_id}")
-        print(f"   Would place: {contracts}x {recommendation['action'].split()[1]} {ticker} @ {recommendation['cost']} (${total_cost:.2f})")
+        notify("paper_trade", f"📝 Paper {contracts}x {recommendation.side.upper()} {ticker} @ {cost} "
+                              f"(${total_cost:.2f}, score {score}/{len(breakdown)})")
+        print(f"   Would place: {contracts}x {recommendation.side.upper()} {ticker} @ {cost} (${total_cost:.2f})")
     else:
         print(f"\n⚡ Executing trade...")
-        trade = execute_trade(recommendation, data_quality=data_quality)
+        context = {"signal_score": score, "signals": breakdown, "btc": btc, "signal_flags": fired}
+        with span("execution"):
+            trade = execute_trade(recommendation, data_quality=data_quality, context=context)
         if trade:
-            print(f"✅ Order placed: {trade['contracts']} contracts @ {recommendation['cost']}")
+            filled = int(trade["filled"].split("/")[0])
+            print(f"{'✅' if filled else '⏱️ '} Order {trade['status']}: {trade['filled']} contracts @ {trade['cost']}")
             print(f"   Order ID: {trade.get('order_id')}")
         else:
             print("❌ Trade execution failed — check trade log for details")
 
 
 if __name__ == "__main__":
-    run_monitor()
+    run_monitor(profile="--profile" in sys.argv)
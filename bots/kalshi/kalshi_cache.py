@@ -0,0 +1,165 @@
+#!/usr/bin/env python3
+"""
+Single-flight + short-TTL cache for the Kalshi client's GET requests
+
+  single-flight  concurrent identical GETs (same base URL + path) share one
+                 in-flight request; the others wait for its result
+  TTL cache      successful reads of the endpoints in CACHE_TTLS are served
+                 from memory for that many seconds — portfolio reads the
+                 monitor, resolver and ledger sync all repeat. Market data,
+                 order books and orders are not cached, only coalesced:
+                 quotes and volume must be fresh, and OrderTracker polls
+                 orders to see fills by other traders.
+  invalidation   every write we send (POST / DELETE / amend) drops the cached
+                 reads it can change: a write under /portfolio/ drops every
+                 portfolio read, any other write drops everything. A read
+                 that was in flight across a write is not stored.
+
+Hit / miss / coalesced / invalidated counters per endpoint are in stats()
+and in the metrics summary. Set KALSHI_CLIENT_CACHE=false to turn the TTL
+cache off (single-flight stays). Callers get their own shallow copy of a
+result; treat nested values as read-only.
+"""
+
+import os
+import time
+import threading
+
+from kalshi_metrics import endpoint_name
+
+# === CONFIG ===
+ENABLED = os.environ.get("KALSHI_CLIENT_CACHE", "true").lower() == "true"
+
+# endpoint template -> seconds a successful GET is reused
+CACHE_TTLS = {
+    "/trade-api/v2/portfolio/balance": 5,
+    "/trade-api/v2/portfolio/positions": 5,
+    "/trade-api/v2/portfolio/fills": 5,
+    "/trade-api/v2/portfolio/settlements": 30,
+    "/trade-api/v2/events": 30,
+    "/trade-api/v2/series/{series_ticker}": 300,
+}
+PORTFOLIO_PREFIX = "/trade-api/v2/portfolio/"
+MAX_ENTRIES = 512
+OUTCOMES = ("hit", "miss", "coalesced", "invalidated")
+
+
+class _Flight:
+    __slots__ = ("done", "result", "error")
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+
+_lock = threading.Lock()
+_entries = {}    # (base_url, path) -> (expires, result)
+_flights = {}    # (base_url, path) -> _Flight
+_generation = 0  # bumped by every invalidation
+_counters = {}   # endpoint -> {outcome: count}
+
+
+def _count(endpoint, outcome, n=1):
+    counts = _counters.get(endpoint)
+    if counts is None:
+        counts = _counters[endpoint] = dict.fromkeys(OUTCOMES, 0)
+    counts[outcome] += n
+
+
+def _copy(result):
+    return dict(result) if isinstance(result, dict) else result
+
+
+def ttl_for(path):
+    return CACHE_TTLS.get(endpoint_name(path), 0) if ENABLED else 0
+
+
+# === READS ===
+def get(key, fetch, use_ttl=True, clock=time.monotonic):
+    """
+    Result of fetch() for GET `key` = (base_url, path): from the cache while
+    fresh, else shared with an identical request already in flight, else
+    fetched here. Error results are shared with waiters but never cached.
+    """
+    endpoint = endpoint_name(key[1])
+    ttl = ttl_for(key[1]) if use_ttl else 0
+    with _lock:
+        entry = _entries.get(key)
+        if entry is not None and entry[0] > clock():
+            _count(endpoint, "hit")
+            return _copy(entry[1])
+        flight = _flights.get(key)
+        leader = flight is None
+        if leader:
+            flight = _flights[key] = _Flight()
+            generation = _generation
+            _count(endpoint, "miss")
+        else:
+            _count(endpoint, "coalesced")
+
+    if not leader:
+        flight.done.wait()
+        if flight.error is not None:
+            raise flight.error
+        return _copy(flight.result)
+
+    try:
+        flight.result = fetch()
+    except BaseException as e:
+        flight.error = e
+        raise
+    finally:
+        with _lock:
+            del _flights[key]
+            result = flight.result
+            if ttl and isinstance(result, dict) and "error" not in result and generation == _generation:
+                if len(_entries) >= MAX_ENTRIES:
+                    _evict(clock())
+                _entries[key] = (clock() + ttl, result)
+        flight.done.set()
+    return _copy(flight.result)
+
+
+def _evict(now):
+    for key in [k for k, (expires, _) in _entries.items() if expires <= now]:
+        del _entries[key]
+    if len(_entries) >= MAX_ENTRIES:
+        _entries.clear()
+
+
+# === WRITES ===
+def invalidate(prefix=""):
+    """Drop cached reads whose path starts with `prefix` and keep in-flight reads from being stored"""
+    global _generation
+    with _lock:
+        _generation += 1
+        for key in [k for k in _entries if k[1].startswith(prefix)]:
+            _count(endpoint_name(key[1]), "invalidated")
+            del _entries[key]
+
+
+def invalidate_after_write(path):
+    """Called once a write to `path` has been sent (whatever its outcome)"""
+    invalidate(PORTFOLIO_PREFIX if path.startswith(PORTFOLIO_PREFIX) else "")
+
+
+# === STATS ===
+def stats():
+    """{endpoint: {"hit", "miss", "coalesced", "invalidated", "hit_rate"}}"""
+    with _lock:
+        out = {}
+        for endpoint, counts in sorted(_counters.items()):
+            served = counts["hit"] + counts["coalesced"]
+            total = served + counts["miss"]
+            out[endpoint] = {**counts, "hit_rate": round(served / total, 4) if total else 0.0}
+        return out
+
+
+def reset():
+    """Forget every entry and counter (tests, benchmarks)"""
+    global _generation
+    with _lock:
+        _generation += 1
+        _entries.clear()
+        _counters.clear()
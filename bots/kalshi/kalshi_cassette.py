@@ -0,0 +1,193 @@
+#!/usr/bin/env python3
+"""
+HTTP record/replay transport for deterministic offline runs
+
+make_request (Kalshi) and the monitor's _fetch_json_with_retry (CoinGecko,
+alternative.me) open URLs through urlopen() here. By default it is a plain
+urllib.request.urlopen. With a cassette configured:
+
+  KALSHI_CASSETTE=session.jsonl.gz KALSHI_CASSETTE_MODE=record   python kalshi_btc_monitor.py
+  KALSHI_CASSETTE=session.jsonl.gz KALSHI_CASSETTE_MODE=replay   python kalshi_btc_monitor.py
+
+record   passes requests through and appends each exchange (request, status,
+         body, latency) to a gzip JSONL cassette. KALSHI-ACCESS-* headers and
+         secret-looking query parameters are redacted before writing.
+replay   serves responses from the cassette — no network, no key needed.
+         Requests are matched on method + URL + body, in recorded order.
+         KALSHI_CASSETTE_REALTIME=true keeps the recorded timeline: each
+         response is held until its recorded offset + latency from process
+         start, so concurrent requests overlap and backoff sleeps are absorbed
+         as they were; otherwise replay runs at full speed and retry backoff
+         sleeps are skipped too.
+
+Usage:
+  python kalshi_cassette.py <cassette>    Summarize a cassette
+"""
+
+import io
+import os
+import re
+import sys
+import json
+import time
+import threading
+from collections import defaultdict, deque
+from pathlib import Path
+
+CASSETTE_PATH = os.environ.get("KALSHI_CASSETTE", "")
+MODE = os.environ.get("KALSHI_CASSETTE_MODE", "").lower() if CASSETTE_PATH else ""
+REALTIME = os.environ.get("KALSHI_CASSETTE_REALTIME", "false").lower() == "true"
+
+REDACTED = "<redacted>"
+_SECRET_HEADERS = {"kalshi-access-key", "kalshi-access-signature", "kalshi-access-timestamp", "authorization"}
+_SECRET_QUERY = re.compile(r"([?&][^=&]*(?:key|token|secret|signature)[^=&]*=)[^&]*", re.IGNORECASE)
+
+_lock = threading.Lock()
+_started = time.monotonic()  # offsets are recorded from, and replayed against, process start
+_replay = None  # (method, url, body) -> deque of recorded entries
+
+
+class CassetteMiss(OSError):
+    """Replay found no recorded response for a request"""
+
+
+def redact_url(url):
+    return _SECRET_QUERY.sub(lambda m: m.group(1) + REDACTED, url)
+
+
+def _request_key(method, url, body):
+    return f"{method} {redact_url(url)} {body or ''}"
+
+
+class _Response(io.BytesIO):
+    """Minimal stand-in for the object urlopen returns"""
+
+    def __init__(self, status, body, headers):
+        super().__init__(body)
+        self.status = status
+        self.headers = headers
+
+    def getcode(self):
+        return self.status
+
+
+# === RECORD ===
+def _write(entry):
+    import gzip
+
+    path = Path(CASSETTE_PATH)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    line = json.dumps(entry, separators=(",", ":")) + "\n"
+    with _lock, gzip.open(path, "at", encoding="utf-8") as f:
+        f.write(line)
+
+
+def _record(req, timeout):
+    import urllib.error
+    import urllib.request
+
+    method = req.get_method()
+    body = req.data.decode("utf-8") if req.data else None
+    entry = {
+        "offset": round(time.monotonic() - _started, 4),
+        "method": method,
+        "url": redact_url(req.full_url),
+        "request_headers": {
+            k: (REDACTED if k.lower() in _SECRET_HEADERS else v) for k, v in req.header_items()
+        },
+        "body": body,
+    }
+    started = time.perf_counter()
+    try:
+        with urllib.request.urlopen(req, timeout=timeout) as resp:
+            payload = resp.read()
+            entry.update(status=resp.status, headers={"Content-Type": resp.headers.get("Content-Type", "")})
+        return _Response(entry["status"], payload, entry["headers"])
+    except urllib.error.HTTPError as e:
+        payload = e.read() if e.fp else b""
+        entry.update(status=e.code, headers={"Content-Type": e.headers.get("Content-Type", "") if e.headers else ""})
+        raise urllib.error.HTTPError(e.url, e.code, e.msg, e.headers, io.BytesIO(payload))
+    except Exception as e:
+        payload = b""
+        entry.update(status=None, error=str(e))
+        raise
+    finally:
+        entry["elapsed"] = round(time.perf_counter() - started, 4)
+        entry["response"] = payload.decode("utf-8", errors="replace")
+        _write(entry)
+
+
+# === REPLAY ===
+def load(path):
+    """Read a cassette into a list of entries"""
+    import gzip
+
+    with gzip.open(path, "rt", encoding="utf-8") as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+def _replay_queue():
+    global _replay
+    with _lock:
+        if _replay is None:
+            _replay = defaultdict(deque)
+            for entry in load(CASSETTE_PATH):
+                _replay[_request_key(entry["method"], entry["url"], entry["body"])].append(entry)
+        return _replay
+
+
+def _play(req):
+    import urllib.error
+
+    method = req.get_method()
+    body = req.data.decode("utf-8") if req.data else None
+    key = _request_key(method, req.full_url, body)
+    queue = _replay_queue()
+    with _lock:
+        entry = queue[key].popleft() if queue.get(key) else None
+    if entry is None:
+        raise CassetteMiss(f"no recorded response for {method} {redact_url(req.full_url)}")
+    if REALTIME:
+        delay = _started + entry["offset"] + entry["elapsed"] - time.monotonic()
+        if delay > 0:
+            time.sleep(delay)
+    payload = entry["response"].encode("utf-8")
+    if entry.get("error"):
+        raise urllib.error.URLError(entry["error"])
+    if entry["status"] >= 400:
+        raise urllib.error.HTTPError(req.full_url, entry["status"], "replayed", entry["headers"], io.BytesIO(payload))
+    return _Response(entry["status"], payload, entry["headers"])
+
+
+# === TRANSPORT ===
+def replaying():
+    return MODE == "replay"
+
+
+def urlopen(req, timeout=30):
+    """urllib.request.urlopen, recorded or replayed when a cassette is configured"""
+    if MODE == "replay":
+        return _play(req)
+    if MODE == "record":
+        return _record(req, timeout)
+    import urllib.request
+    return urllib.request.urlopen(req, timeout=timeout)
+
+
+def sleep(seconds):
+    """Retry backoff sleep — skipped when replaying at full speed"""
+    if MODE == "replay" and not REALTIME:
+        return
+    time.sleep(seconds)
+
+
+if __name__ == "__main__":
+    if len(sys.argv) < 2:
+        print("Usage: kalshi_cassette.py <cassette.jsonl.gz>")
+        sys.exit(1)
+    entries = load(sys.argv[1])
+    total = sum(e["elapsed"] for e in entries)
+    print(f"📼 {sys.argv[1]}: {len(entries)} request(s), {total:.2f}s recorded latency")
+    for e in entries:
+        status = e.get("status") or f"error: {e.get('error')}"
+        print(f"  +{e['offset']:>8.3f}s  {e['elapsed']*1000:>7.1f}ms  {status}  {e['method']} {e['url']}")
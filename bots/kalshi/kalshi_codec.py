@@ -0,0 +1,150 @@
+#!/usr/bin/env python3
+"""
+JSON codec for API responses
+
+- loads/dumps use orjson when it is installed and fall back to the stdlib json.
+- iter_items streams a `{"<key>": [ ... ], ...}` response body and yields one
+  list element at a time, optionally projected to a few fields. Only the
+  current element (plus a read buffer) is held in memory, so a multi-thousand
+  market page never materializes as one big list of full dicts. Other
+  top-level keys (e.g. "cursor") are collected into `meta`.
+"""
+
+import json
+import codecs
+
+try:
+    import orjson
+except ImportError:  # optional speedup
+    orjson = None
+
+CHUNK_SIZE = 64 * 1024
+_WHITESPACE = " \t\n\r"
+_decoder = json.JSONDecoder()
+
+
+def loads(data):
+    """Parse JSON from bytes or str"""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def dumps(obj) -> bytes:
+    """Serialize to compact UTF-8 JSON bytes"""
+    if orjson is not None:
+        return orjson.dumps(obj)
+    return json.dumps(obj, separators=(",", ":")).encode("utf-8")
+
+
+def project(item, fields):
+    """Keep only `fields` of a dict (all of it if fields is None)"""
+    if fields is None or not isinstance(item, dict):
+        return item
+    return {f: item[f] for f in fields if f in item}
+
+
+class _Reader:
+    """Incrementally decoded text buffer over a binary file object"""
+
+    __slots__ = ("fp", "chunk_size", "text", "buf", "pos", "eof", "bytes_read")
+
+    def __init__(self, fp, chunk_size):
+        self.fp = fp
+        self.chunk_size = chunk_size
+        self.text = codecs.getincrementaldecoder("utf-8")()
+        self.buf = ""
+        self.pos = 0
+        self.eof = False
+        self.bytes_read = 0
+
+    def fill(self):
+        """Read one more chunk. Returns False at EOF."""
+        if self.eof:
+            return False
+        chunk = self.fp.read(self.chunk_size)
+        if not chunk:
+            self.eof = True
+            self.buf = self.buf[self.pos:] + self.text.decode(b"", final=True)
+            self.pos = 0
+            return False
+        self.bytes_read += len(chunk)
+        self.buf = self.buf[self.pos:] + self.text.decode(chunk)
+        self.pos = 0
+        return True
+
+    def peek(self):
+        """Next non-whitespace character ("" at EOF), without consuming it"""
+        while True:
+            buf, pos, end = self.buf, self.pos, len(self.buf)
+            while pos < end and buf[pos] in _WHITESPACE:
+                pos += 1
+            self.pos = pos
+            if pos < end:
+                return buf[pos]
+            if not self.fill():
+                return ""
+
+    def expect(self, char):
+        if self.peek() != char:
+            raise ValueError(f"expected {char!r} at byte ~{self.bytes_read}")
+        self.pos += 1
+
+    def value(self):
+        """Decode the next JSON value, reading more input until it is complete"""
+        self.peek()
+        while True:
+            try:
+                obj, end = _decoder.raw_decode(self.buf, self.pos)
+                # A number at the end of the buffer may continue in the next chunk
+                if end < len(self.buf) or self.eof:
+                    self.pos = end
+                    return obj
+            except json.JSONDecodeError:
+                if self.eof:
+                    raise
+            self.fill()
+
+
+def iter_items(fp, key, fields=None, meta=None, chunk_size=CHUNK_SIZE):
+    """
+    Stream the list under top-level `key` of the JSON object in binary file `fp`,
+    yielding each element (projected to `fields` if given). Other top-level
+    values are stored in `meta` if a dict is passed; meta["_bytes"] records the
+    response size once the stream is exhausted.
+    """
+    reader = _Reader(fp, chunk_size)
+    reader.expect("{")
+    while True:
+        if reader.peek() == "}":
+            reader.pos += 1
+            break
+        name = reader.value()
+        reader.expect(":")
+        if name == key and reader.peek() == "[":
+            reader.pos += 1
+            if reader.peek() == "]":
+                reader.pos += 1
+            else:
+                while True:
+                    yield project(reader.value(), fields)
+                    nxt = reader.peek()
+                    reader.pos += 1
+                    if nxt == "]":
+                        break
+                    if nxt != ",":
+                        raise ValueError(f"malformed {key!r} list at byte ~{reader.bytes_read}")
+        else:
+            value = reader.value()
+            if meta is not None:
+                meta[name] = value
+        nxt = reader.peek()
+        reader.pos += 1
+        if nxt == "}":
+            break
+        if nxt != ",":
+            raise ValueError(f"malformed object at byte ~{reader.bytes_read}")
+    if meta is not None:
+        while reader.fill():
+            pass
+        meta["_bytes"] = reader.bytes_read
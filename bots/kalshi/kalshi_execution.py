@@ -0,0 +1,243 @@
+#!/usr/bin/env python3
+"""
+Kalshi order execution
+
+- submit_orders: place several limit orders in one round-trip via the batch endpoint
+- OrderTracker: follow orders to a terminal state with incremental polling
+  (one resting-orders call per poll; only orders that left the resting set
+  are fetched individually)
+- expire_unfilled: cancel or amend whatever is still working after a deadline
+
+Order states: resting, partially_filled, executed, canceled
+"""
+
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent))
+from kalshi import make_request as kalshi_request
+
+ORDERS_PATH = "/trade-api/v2/portfolio/orders"
+
+RESTING = "resting"
+PARTIALLY_FILLED = "partially_filled"
+EXECUTED = "executed"
+CANCELED = "canceled"
+TERMINAL_STATES = (EXECUTED, CANCELED)
+
+POLL_INTERVAL_SECONDS = 5
+
+
+# === ORDERS ===
+def build_order(ticker, side, count, price, action="buy", client_order_id=None):
+    """Return a limit order payload in Kalshi's create-order shape"""
+    side = side.lower()
+    order = {
+        "ticker": ticker,
+        "action": action,
+        "side": side,
+        "type": "limit",
+        "count": count,
+        "yes_price": price if side == "yes" else None,
+        "no_price": price if side == "no" else None,
+        "client_order_id": client_order_id,
+    }
+    return {k: v for k, v in order.items() if v is not None}
+
+
+def filled_count(order):
+    """Contracts filled so far on an order"""
+    if "fill_count" in order:
+        return order["fill_count"] or 0
+    return (order.get("taker_fill_count") or 0) + (order.get("maker_fill_count") or 0)
+
+
+def order_price(order):
+    """Limit price of an order on its own side, in cents"""
+    return order["yes_price"] if order["side"] == "yes" else order["no_price"]
+
+
+def fill_cost_cents(order):
+    """Cents paid for an order's fills: the exchange's fill costs, else the fill count at its price"""
+    if "taker_fill_cost" in order or "maker_fill_cost" in order:
+        return (order.get("taker_fill_cost") or 0) + (order.get("maker_fill_cost") or 0)
+    return filled_count(order) * order_price(order)
+
+
+def order_state(order):
+    """Classify an order as resting, partially_filled, executed or canceled"""
+    status = order.get("status", "")
+    if status in TERMINAL_STATES:
+        return status
+    return PARTIALLY_FILLED if filled_count(order) > 0 else RESTING
+
+
+def submit_orders(orders):
+    """
+    Submit several orders in one request through the batch endpoint.
+    Returns one entry per input order, in order: the created order dict,
+    or {"error": ...} if that order was rejected.
+    """
+    result = kalshi_request("POST", f"{ORDERS_PATH}/batched", {"orders": orders})
+    if "error" in result:
+        return [{"error": result["error"]} for _ in orders]
+
+    responses = result.get("orders", [])
+    out = []
+    for i in range(len(orders)):
+        resp = responses[i] if i < len(responses) else {}
+        if resp.get("error") or not resp.get("order"):
+            out.append({"error": resp.get("error") or "missing order in batch response"})
+        else:
+            out.append(resp["order"])
+    return out
+
+
+def get_order(order_id):
+    """Fetch a single order. Returns the order dict or {"error": ...}"""
+    result = kalshi_request("GET", f"{ORDERS_PATH}/{order_id}")
+    if "error" in result:
+        return result
+    return result.get("order", result)
+
+
+def cancel_order(order_id):
+    """Cancel the unfilled remainder of an order. Returns the order dict or {"error": ...}"""
+    result = kalshi_request("DELETE", f"{ORDERS_PATH}/{order_id}")
+    if "error" in result:
+        return result
+    return result.get("order", result)
+
+
+def amend_order(order, price, count=None):
+    """
+    Reprice (and optionally resize) a resting order.
+    Returns the amended order dict or {"error": ...}
+    """
+    side = order["side"]
+    data = {
+        "ticker": order["ticker"],
+        "side": side,
+        "action": order.get("action", "buy"),
+        "count": count if count is not None else order.get("initial_count") or order.get("count"),
+        "yes_price": price if side == "yes" else None,
+        "no_price": price if side == "no" else None,
+    }
+    data = {k: v for k, v in data.items() if v is not None}
+    result = kalshi_request("POST", f"{ORDERS_PATH}/{order['order_id']}/amend", data)
+    if "error" in result:
+        return result
+    return result.get("order", result)
+
+
+def list_resting_orders(ticker=None):
+    """Return all resting orders, or just `ticker`'s (following cursor pagination), or None on error"""
+    orders, cursor = [], ""
+    while True:
+        path = f"{ORDERS_PATH}?status=resting&limit=200"
+        if ticker:
+            path += f"&ticker={ticker}"
+        if cursor:
+            path += f"&cursor={cursor}"
+        result = kalshi_request("GET", path)
+        if "error" in result:
+            print(f"⚠️  Resting orders fetch failed: {result['error']}")
+            return None
+        orders.extend(result.get("orders", []))
+        cursor = result.get("cursor") or ""
+        if not cursor:
+            return orders
+
+
+# === TRACKING ===
+class OrderTracker:
+    """Track a set of orders until each reaches executed or canceled"""
+
+    def __init__(self, orders=()):
+        self.orders = {}
+        for order in orders:
+            self.add(order)
+
+    def add(self, order):
+        self.orders[order["order_id"]] = order
+
+    def state(self, order_id):
+        return order_state(self.orders[order_id])
+
+    def working(self):
+        """Orders not yet in a terminal state"""
+        return [o for o in self.orders.values() if order_state(o) not in TERMINAL_STATES]
+
+    def done(self):
+        return not self.working()
+
+    def poll(self):
+        """
+        Refresh working orders. Returns the list of orders whose state or fill
+        count changed since the last poll. Resting orders are listed per ticker
+        the working orders are on, so the cost follows the tracked orders, not
+        everything else resting on the account.
+        """
+        working = self.working()
+        if not working:
+            return []
+
+        resting_by_id = {}
+        for ticker in dict.fromkeys(o["ticker"] for o in working):
+            resting = list_resting_orders(ticker)
+            if resting is None:
+                return []
+            resting_by_id.update((o.get("order_id"), o) for o in resting)
+
+        changed = []
+        for old in working:
+            order_id = old["order_id"]
+            new = resting_by_id.get(order_id)
+            if new is None:
+                # Left the resting set: filled out or canceled — look it up once
+                new = get_order(order_id)
+                if "error" in new:
+                    print(f"⚠️  Order {order_id} lookup failed: {new['error']}")
+                    continue
+            if order_state(new) != order_state(old) or filled_count(new) != filled_count(old):
+                changed.append(new)
+            self.orders[order_id] = new
+        return changed
+
+    def wait(self, timeout, poll_interval=POLL_INTERVAL_SECONDS):
+        """Poll until every order is terminal or `timeout` seconds pass. Returns done()."""
+        deadline = time.monotonic() + timeout
+        while not self.done():
+            for order in self.poll():
+                print(f"   📬 {order['order_id']}: {order_state(order)} "
+                      f"({filled_count(order)} filled)")
+            remaining = deadline - time.monotonic()
+            if self.done() or remaining <= 0:
+                break
+            time.sleep(min(poll_interval, remaining))
+        return self.done()
+
+    def expire_unfilled(self, action="cancel", price_for=None):
+        """
+        Deal with orders still working after the deadline.
+        action="cancel" cancels the remainder; action="amend" reprices each order
+        to price_for(order) (skipping it when that returns None).
+        Returns the list of orders acted on.
+        """
+        acted = []
+        for order in self.working():
+            if action == "amend":
+                price = price_for(order) if price_for else None
+                if price is None:
+                    continue
+                result = amend_order(order, price)
+            else:
+                result = cancel_order(order["order_id"])
+            if "error" in result:
+                print(f"⚠️  Could not {action} {order['order_id']}: {result['error']}")
+                continue
+            self.orders.pop(order["order_id"], None)
+            self.add(result)
+            acted.append(result)
+        return acted
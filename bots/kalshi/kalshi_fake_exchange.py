@@ -0,0 +1,659 @@
+#!/usr/bin/env python3
+"""
+Local fake Kalshi exchange for load and integration testing
+
+Implements the subset of /trade-api/v2 the bots use:
+  GET    /portfolio/balance
+  GET    /markets                 (series_ticker, event_ticker, tickers, status, limit, cursor)
+  GET    /markets/{ticker}
+  GET    /markets/{ticker}/orderbook
+  GET    /events                  (status, limit)
+  POST   /portfolio/orders        GET /portfolio/orders (status, ticker, limit, cursor)
+  POST   /portfolio/orders/batched
+  GET    /portfolio/orders/{id}   DELETE /portfolio/orders/{id}
+  POST   /portfolio/orders/{id}/amend
+  GET    /portfolio/positions
+  GET    /portfolio/fills         GET /portfolio/settlements (min_ts, max_ts, limit, cursor)
+
+Markets open → closed at close_time → settled SETTLE_DELAY_SECONDS later,
+resolving against the reference BTC price. Every request must carry the
+KALSHI-ACCESS-* headers in the shape make_request produces (13-digit ms
+timestamp, base64 RSA signature) or it gets a 401.
+
+Fault injection: --latency-ms/--jitter-ms delay each request, --rate-429 and
+--rate-5xx fail that fraction of requests before they are handled.
+
+In unittest, patch_client(self, FakeExchange(...)) starts a server and points
+the kalshi client at it until the test's cleanups run.
+
+Test hooks (no auth, no faults):
+  POST /_admin/trade    {"ticker", "side", "price", "count"}  external seller hits resting bids
+  POST /_admin/settle   {"ticker", "result"}                  settle a market now
+  POST /_admin/book     {"ticker", "yes": [[p, q]], "no": [[p, q]]}  replace the book
+
+Usage:
+  python kalshi_fake_exchange.py [--port 8765] [--markets 40] [--btc-price 95000]
+                                 [--latency-ms 0] [--jitter-ms 0] [--rate-429 0] [--rate-5xx 0]
+  KALSHI_BASE_URL=http://127.0.0.1:8765 python kalshi.py balance
+"""
+
+import re
+import sys
+import json
+import time
+import uuid
+import base64
+import random
+import datetime
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+API_PREFIX = "/trade-api/v2"
+SETTLE_DELAY_SECONDS = 60
+DEFAULT_BALANCE_CENTS = 1_000_000
+SIGNATURE_BYTES = (128, 256, 384, 512)  # RSA-1024 .. RSA-4096
+TIMESTAMP_SKEW_MS = 5 * 60 * 1000
+FAKE_SIGNATURE = base64.b64encode(bytes(256)).decode()  # right shape for RSA-2048; only the shape is checked
+
+_ORDER_PATH = re.compile(rf"^{API_PREFIX}/portfolio/orders/([^/]+)(/amend)?$")
+_MARKET_PATH = re.compile(rf"^{API_PREFIX}/markets/([^/]+)(/orderbook)?$")
+
+
+def _iso(ts):
+    return datetime.datetime.fromtimestamp(ts, datetime.timezone.utc).isoformat().replace("+00:00", "Z")
+
+
+def _parse_ts(iso_str):
+    return datetime.datetime.fromisoformat(iso_str.replace("Z", "+00:00")).timestamp()
+
+
+class ApiError(Exception):
+    def __init__(self, status, code, message=""):
+        super().__init__(message or code)
+        self.status = status
+        self.code = code
+        self.message = message or code
+
+
+# === EXCHANGE STATE ===
+class FakeExchange:
+    """In-memory exchange state. All methods are thread-safe."""
+
+    def __init__(self, btc_price=95_000.0, markets=40, close_in_hours=6.0, seed=7,
+                 balance_cents=DEFAULT_BALANCE_CENTS, latency_ms=0, jitter_ms=0,
+                 rate_429=0.0, rate_5xx=0.0, check_auth=True):
+        self.lock = threading.RLock()
+        self.rng = random.Random(seed)
+        self.btc_price = btc_price
+        self.balance = balance_cents
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.rate_429 = rate_429
+        self.rate_5xx = rate_5xx
+        self.check_auth = check_auth
+        self.markets = {}      # ticker -> market dict
+        self.books = {}        # ticker -> {"yes": {price: qty}, "no": {price: qty}} (external liquidity)
+        self.orders = {}       # order_id -> order dict (insertion order = time priority)
+        self.positions = {}    # ticker -> {"yes": count, "no": count, "yes_cost": c, "no_cost": c}
+        self.fills = []
+        self.settlements = []
+        self.requests = 0
+        self.seed_ladder(markets, close_in_hours)
+
+    # --- setup ---
+    def seed_ladder(self, n, close_in_hours):
+        """Create a KXBTCD event with n strikes spread ±10% around btc_price"""
+        close_ts = time.time() + close_in_hours * 3600
+        close = datetime.datetime.fromtimestamp(close_ts, datetime.timezone.utc)
+        event = f"KXBTCD-{close.strftime('%y%b%d%H').upper()}"
+        for i in range(n):
+            strike = round(self.btc_price * (0.9 + 0.2 * i / max(1, n - 1)), -2) - 0.01
+            fair = 50 + (self.btc_price - strike) / self.btc_price * 900
+            yes_bid = max(1, min(97, int(fair) - 1))
+            ticker = f"{event}-T{strike:.2f}"
+            self.markets[ticker] = {
+                "ticker": ticker,
+                "event_ticker": event,
+                "series_ticker": "KXBTCD",
+                "title": f"Bitcoin above {strike:,.2f}?",
+                "status": "open",
+                "close_time": _iso(close_ts),
+                "volume": self.rng.randint(100, 50_000),
+                "open_interest": self.rng.randint(100, 20_000),
+                "result": "",
+                "_strike": strike,
+                "_close_ts": close_ts,
+            }
+            self.books[ticker] = {
+                "yes": {yes_bid - k: self.rng.randint(50, 800) for k in range(5) if yes_bid - k >= 1},
+                "no": {(98 - yes_bid) - k: self.rng.randint(50, 800) for k in range(5) if 98 - yes_bid - k >= 1},
+            }
+            self._refresh_quotes(ticker)
+
+    # --- helpers ---
+    def _refresh_quotes(self, ticker):
+        book = self._merged_book(ticker)
+        m = self.markets[ticker]
+        m["yes_bid"] = max(book["yes"], default=0)
+        m["no_bid"] = max(book["no"], default=0)
+        m["yes_ask"] = 100 - m["no_bid"] if m["no_bid"] else 0
+        m["no_ask"] = 100 - m["yes_bid"] if m["yes_bid"] else 0
+
+    def _merged_book(self, ticker):
+        """External liquidity plus resting user bids, as {side: {price: qty}}"""
+        merged = {side: dict(levels) for side, levels in self.books[ticker].items()}
+        for o in self.orders.values():
+            if o["ticker"] == ticker and o["status"] == "resting":
+                price = o["yes_price"] if o["side"] == "yes" else o["no_price"]
+                merged[o["side"]][price] = merged[o["side"]].get(price, 0) + o["remaining_count"]
+        return merged
+
+    def _advance_clock(self):
+        """Move markets through open → closed → settled based on wall time"""
+        now = time.time()
+        for ticker, m in self.markets.items():
+            if m["status"] in ("settled", "finalized"):
+                continue
+            close_ts = m["_close_ts"]
+            if m["status"] == "open" and now >= close_ts:
+                m["status"] = "closed"
+                self._cancel_resting(ticker)
+            if m["status"] == "closed" and now >= close_ts + SETTLE_DELAY_SECONDS:
+                self.settle(ticker, "yes" if self.btc_price > m["_strike"] else "no")
+
+    def _cancel_resting(self, ticker):
+        for o in self.orders.values():
+            if o["ticker"] == ticker and o["status"] == "resting":
+                o["status"] = "canceled"
+                self.balance += o["remaining_count"] * self._price(o)
+                o["remaining_count"] = 0
+
+    @staticmethod
+    def _price(order):
+        return order["yes_price"] if order["side"] == "yes" else order["no_price"]
+
+    def _record_fill(self, order, count, price, is_taker):
+        order["fill_count"] += count
+        order["remaining_count"] -= count
+        if is_taker:
+            order["taker_fill_count"] += count
+            order["taker_fill_cost"] += count * price
+        else:
+            order["maker_fill_count"] += count
+            order["maker_fill_cost"] += count * price
+        if order["remaining_count"] == 0:
+            order["status"] = "executed"
+        pos = self.positions.setdefault(order["ticker"], {"yes": 0, "no": 0, "yes_cost": 0, "no_cost": 0})
+        pos[order["side"]] += count
+        pos[f"{order['side']}_cost"] += count * price
+        self.fills.append({
+            "trade_id": str(uuid.uuid4()),
+            "order_id": order["order_id"],
+            "ticker": order["ticker"],
+            "side": order["side"],
+            "action": "buy",
+            "count": count,
+            "yes_price": price if order["side"] == "yes" else 100 - price,
+            "no_price": price if order["side"] == "no" else 100 - price,
+            "is_taker": is_taker,
+            "created_time": _iso(time.time()),
+        })
+
+    # --- trading ---
+    def create_order(self, req):
+        with self.lock:
+            self._advance_clock()
+            ticker = req.get("ticker")
+            side = req.get("side")
+            count = req.get("count") or 0
+            market = self.markets.get(ticker)
+            if market is None:
+                raise ApiError(404, "market_not_found", f"no market {ticker}")
+            if market["status"] != "open":
+                raise ApiError(400, "market_closed")
+            if side not in ("yes", "no") or req.get("action", "buy") != "buy" or count <= 0:
+                raise ApiError(400, "invalid_order")
+            price = req.get("yes_price") if side == "yes" else req.get("no_price")
+            if not isinstance(price, int) or not 1 <= price <= 99:
+                raise ApiError(400, "invalid_price")
+            if count * price > self.balance:
+                raise ApiError(400, "insufficient_balance")
+
+            order = {
+                "order_id": str(uuid.uuid4()),
+                "client_order_id": req.get("client_order_id", ""),
+                "ticker": ticker,
+                "side": side,
+                "action": "buy",
+                "type": "limit",
+                "status": "resting",
+                "yes_price": price if side == "yes" else 100 - price,
+                "no_price": price if side == "no" else 100 - price,
+                "initial_count": count,
+                "remaining_count": count,
+                "fill_count": 0,
+                "taker_fill_count": 0,
+                "maker_fill_count": 0,
+                "taker_fill_cost": 0,
+                "maker_fill_cost": 0,
+                "created_time": _iso(time.time()),
+            }
+            self.balance -= count * price
+            self.orders[order["order_id"]] = order
+
+            # Cross against external bids on the other side: a YES bid at p
+            # trades with NO bids at >= 100 - p, best first
+            opposite = self.books[ticker]["no" if side == "yes" else "yes"]
+            for level in sorted(opposite, reverse=True):
+                fill_price = 100 - level
+                if fill_price > price or order["remaining_count"] == 0:
+                    break
+                take = min(opposite[level], order["remaining_count"])
+                opposite[level] -= take
+                if not opposite[level]:
+                    del opposite[level]
+                self.balance += take * (price - fill_price)  # refund price improvement
+                self._record_fill(order, take, fill_price, is_taker=True)
+            self._refresh_quotes(ticker)
+            return dict(order)
+
+    def cancel_order(self, order_id):
+        with self.lock:
+            order = self.orders.get(order_id)
+            if order is None:
+                raise ApiError(404, "not_found")
+            if order["status"] != "resting":
+                raise ApiError(400, "order_not_resting")
+            self.balance += order["remaining_count"] * self._price(order)
+            order["remaining_count"] = 0
+            order["status"] = "canceled"
+            self._refresh_quotes(order["ticker"])
+            return dict(order)
+
+    def amend_order(self, order_id, req):
+        """Reprice/resize a resting order. Loses time priority (moves to the back)."""
+        with self.lock:
+            order = self.orders.get(order_id)
+            if order is None:
+                raise ApiError(404, "not_found")
+            if order["status"] != "resting":
+                raise ApiError(400, "order_not_resting")
+            side = order["side"]
+            price = req.get("yes_price") if side == "yes" else req.get("no_price")
+            if not isinstance(price, int) or not 1 <= price <= 99:
+                raise ApiError(400, "invalid_price")
+            count = req.get("count") or order["initial_count"]
+            remaining = max(0, count - order["fill_count"])
+            self.balance += order["remaining_count"] * self._price(order)
+            self.balance -= remaining * price
+            old = dict(order)
+            order["yes_price"] = price if side == "yes" else 100 - price
+            order["no_price"] = price if side == "no" else 100 - price
+            order["initial_count"] = count
+            order["remaining_count"] = remaining
+            if remaining == 0:
+                order["status"] = "executed"
+            self.orders[order_id] = self.orders.pop(order_id)
+            self._refresh_quotes(order["ticker"])
+            return old, dict(order)
+
+    def external_trade(self, ticker, side, price, count):
+        """An outside seller hits resting `side` bids at >= price, price-time priority"""
+        with self.lock:
+            resting = [o for o in self.orders.values()
+                       if o["ticker"] == ticker and o["side"] == side and o["status"] == "resting"
+                       and self._price(o) >= price]
+            resting.sort(key=lambda o: -self._price(o))  # stable: time priority within a level
+            filled = 0
+            for o in resting:
+                if count <= 0:
+                    break
+                take = min(o["remaining_count"], count)
+                self._record_fill(o, take, self._price(o), is_taker=False)
+                count -= take
+                filled += take
+            self._refresh_quotes(ticker)
+            return filled
+
+    def set_book(self, ticker, yes, no):
+        with self.lock:
+            self.books[ticker] = {
+                "yes": {int(p): int(q) for p, q in yes or []},
+                "no": {int(p): int(q) for p, q in no or []},
+            }
+            self._refresh_quotes(ticker)
+
+    def settle(self, ticker, result):
+        with self.lock:
+            m = self.markets[ticker]
+            if m["status"] in ("settled", "finalized"):
+                return
+            self._cancel_resting(ticker)
+            m["status"] = "settled"
+            m["result"] = result
+            pos = self.positions.pop(ticker, None)
+            if pos:
+                revenue = 100 * pos[result]
+                self.balance += revenue
+                self.settlements.append({
+                    "ticker": ticker,
+                    "market_result": result,
+                    "yes_count": pos["yes"],
+                    "yes_total_cost": pos["yes_cost"],
+                    "no_count": pos["no"],
+                    "no_total_cost": pos["no_cost"],
+                    "revenue": revenue,
+                    "settled_time": _iso(time.time()),
+                })
+
+    # --- reads ---
+    def market(self, ticker):
+        with self.lock:
+            self._advance_clock()
+            m = self.markets.get(ticker)
+            if m is None:
+                raise ApiError(404, "market_not_found")
+            return {k: v for k, v in m.items() if not k.startswith("_")}
+
+    def orderbook(self, ticker, depth=0):
+        with self.lock:
+            if ticker not in self.markets:
+                raise ApiError(404, "market_not_found")
+            book = self._merged_book(ticker)
+            out = {}
+            for side in ("yes", "no"):
+                levels = sorted(book[side].items())
+                if depth:
+                    levels = levels[-depth:]
+                out[side] = [[p, q] for p, q in levels if q > 0] or None
+            return out
+
+    def list_markets(self, q):
+        with self.lock:
+            self._advance_clock()
+            tickers = set(q["tickers"].split(",")) if q.get("tickers") else None
+            rows = [
+                {k: v for k, v in m.items() if not k.startswith("_")}
+                for m in self.markets.values()
+                if (not q.get("series_ticker") or m["series_ticker"] == q["series_ticker"])
+                and (not q.get("event_ticker") or m["event_ticker"] == q["event_ticker"])
+                and (not q.get("status") or m["status"] == q["status"])
+                and (tickers is None or m["ticker"] in tickers)
+            ]
+            return _page(rows, q, "markets")
+
+    def list_events(self, q):
+        with self.lock:
+            events = {}
+            for m in self.markets.values():
+                if q.get("status") and m["status"] != q["status"]:
+                    continue
+                events.setdefault(m["event_ticker"], {
+                    "event_ticker": m["event_ticker"],
+                    "series_ticker": m["series_ticker"],
+                    "title": f"Bitcoin price at {m['close_time']}",
+                })
+            return _page(list(events.values()), q, "events")
+
+    def list_orders(self, q):
+        with self.lock:
+            self._advance_clock()
+            rows = [dict(o) for o in self.orders.values()
+                    if (not q.get("status") or o["status"] == q["status"])
+                    and (not q.get("ticker") or o["ticker"] == q["ticker"])]
+            rows.reverse()  # newest first, like the real API
+            return _page(rows, q, "orders")
+
+    def list_positions(self, q):
+        with self.lock:
+            self._advance_clock()
+            rows = []
+            for ticker, pos in self.positions.items():
+                net = pos["yes"] - pos["no"]
+                if not net:
+                    continue
+                rows.append({
+                    "ticker": ticker,
+                    "position": net,
+                    "market_exposure": pos["yes_cost"] + pos["no_cost"],
+                    "total_traded": pos["yes_cost"] + pos["no_cost"],
+                    "resting_orders_count": sum(
+                        1 for o in self.orders.values() if o["ticker"] == ticker and o["status"] == "resting"),
+                })
+            return _page(rows, q, "market_positions")
+
+    def list_history(self, kind, q):
+        with self.lock:
+            self._advance_clock()
+            rows, field = (self.fills, "created_time") if kind == "fills" else (self.settlements, "settled_time")
+            lo = int(q.get("min_ts", 0))
+            hi = int(q.get("max_ts", 2 ** 40))
+            match = [r for r in reversed(rows) if lo <= _parse_ts(r[field]) <= hi]
+            return _page(match, q, kind)
+
+
+def _page(rows, q, key):
+    limit = max(1, min(1000, int(q.get("limit") or 100)))
+    start = int(q.get("cursor") or 0)
+    page = rows[start:start + limit]
+    more = start + limit < len(rows)
+    return {key: page, "cursor": str(start + limit) if more else ""}
+
+
+# === HTTP ===
+def _check_signature_headers(headers):
+    """Return an error message if the KALSHI-ACCESS-* headers are malformed, else None"""
+    if not headers.get("KALSHI-ACCESS-KEY"):
+        return "missing KALSHI-ACCESS-KEY"
+    ts = headers.get("KALSHI-ACCESS-TIMESTAMP", "")
+    if not (ts.isdigit() and len(ts) == 13):
+        return "KALSHI-ACCESS-TIMESTAMP must be a 13-digit millisecond timestamp"
+    if abs(int(ts) - time.time() * 1000) > TIMESTAMP_SKEW_MS:
+        return "KALSHI-ACCESS-TIMESTAMP outside allowed skew"
+    try:
+        raw = base64.b64decode(headers.get("KALSHI-ACCESS-SIGNATURE", ""), validate=True)
+    except ValueError:
+        return "KALSHI-ACCESS-SIGNATURE is not base64"
+    if len(raw) not in SIGNATURE_BYTES:
+        return f"KALSHI-ACCESS-SIGNATURE decodes to {len(raw)} bytes, not an RSA signature"
+    return None
+
+
+class _Handler(BaseHTTPRequestHandler):
+    exchange = None  # set by make_server
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, *args):
+        pass
+
+    def _send(self, status, payload):
+        body = json.dumps(payload).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _handle(self, method):
+        ex = self.exchange
+        url = urlparse(self.path)
+        q = {k: v[0] for k, v in parse_qs(url.query).items()}
+        # Always drain the body so a failed request can't poison a kept-alive connection
+        length = int(self.headers.get("Content-Length") or 0)
+        raw = self.rfile.read(length) if length else b""
+        try:
+            body = json.loads(raw) if raw else {}
+            if url.path.startswith("/_admin/"):
+                self._send(200, self._admin(url.path, body))
+                return
+            if not url.path.startswith(API_PREFIX):
+                raise ApiError(404, "not_found")
+
+            with ex.lock:
+                ex.requests += 1
+            if ex.latency_ms or ex.jitter_ms:
+                time.sleep((ex.latency_ms + ex.rng.uniform(0, ex.jitter_ms)) / 1000)
+            roll = ex.rng.random()
+            if roll < ex.rate_429:
+                raise ApiError(429, "too_many_requests")
+            if roll < ex.rate_429 + ex.rate_5xx:
+                raise ApiError(ex.rng.choice((500, 502, 503)), "internal_server_error")
+            if ex.check_auth:
+                problem = _check_signature_headers(self.headers)
+                if problem:
+                    raise ApiError(401, "authentication_error", problem)
+
+            self._send(200, self._route(method, url.path, q, body))
+        except ApiError as e:
+            self._send(e.status, {"error": {"code": e.code, "message": e.message}})
+        except (ValueError, KeyError, TypeError) as e:
+            self._send(400, {"error": {"code": "bad_request", "message": str(e)}})
+
+    def _route(self, method, path, q, body):
+        ex = self.exchange
+        rest = path[len(API_PREFIX):]
+        if method == "GET":
+            if rest == "/portfolio/balance":
+                with ex.lock:
+                    return {"balance": ex.balance}
+            if rest == "/markets":
+                return ex.list_markets(q)
+            if rest == "/events":
+                return ex.list_events(q)
+            if rest == "/portfolio/orders":
+                return ex.list_orders(q)
+            if rest == "/portfolio/positions":
+                return ex.list_positions(q)
+            if rest in ("/portfolio/fills", "/portfolio/settlements"):
+                return ex.list_history(rest.rsplit("/", 1)[1], q)
+            m = _MARKET_PATH.match(path)
+            if m and m.group(2):
+                return {"orderbook": ex.orderbook(m.group(1), int(q.get("depth") or 0))}
+            if m:
+                return {"market": ex.market(m.group(1))}
+            m = _ORDER_PATH.match(path)
+            if m and not m.group(2):
+                with ex.lock:
+                    order = ex.orders.get(m.group(1))
+                if order is None:
+                    raise ApiError(404, "not_found")
+                return {"order": dict(order)}
+        elif method == "POST":
+            if rest == "/portfolio/orders":
+                return {"order": ex.create_order(body)}
+            if rest == "/portfolio/orders/batched":
+                out = []
+                for req in body.get("orders", []):
+                    try:
+                        out.append({"order": ex.create_order(req), "error": None})
+                    except ApiError as e:
+                        out.append({"order": None, "error": {"code": e.code, "message": e.message}})
+                return {"orders": out}
+            m = _ORDER_PATH.match(path)
+            if m and m.group(2):
+                old, new = ex.amend_order(m.group(1), body)
+                return {"old_order": old, "order": new}
+        elif method == "DELETE":
+            m = _ORDER_PATH.match(path)
+            if m and not m.group(2):
+                return {"order": ex.cancel_order(m.group(1)), "reduced_by": 0}
+        raise ApiError(404, "not_found", f"{method} {path}")
+
+    def _admin(self, path, body):
+        ex = self.exchange
+        if path == "/_admin/trade":
+            return {"filled": ex.external_trade(body["ticker"], body["side"], body["price"], body["count"])}
+        if path == "/_admin/settle":
+            ex.settle(body["ticker"], body["result"])
+            return {"market": ex.market(body["ticker"])}
+        if path == "/_admin/book":
+            ex.set_book(body["ticker"], body.get("yes"), body.get("no"))
+            return {"orderbook": ex.orderbook(body["ticker"])}
+        raise ApiError(404, "not_found")
+
+    def do_GET(self):
+        self._handle("GET")
+
+    def do_POST(self):
+        self._handle("POST")
+
+    def do_DELETE(self):
+        self._handle("DELETE")
+
+
+def make_server(exchange, host="127.0.0.1", port=0):
+    """Bind an HTTP server for `exchange` (port 0 = pick a free port)"""
+    handler = type("FakeKalshiHandler", (_Handler,), {"exchange": exchange})
+    server = ThreadingHTTPServer((host, port), handler)
+    server.daemon_threads = True
+    server.request_queue_size = 256
+    return server
+
+
+def start_in_thread(exchange=None, **kwargs):
+    """Start a server in a daemon thread. Returns (server, base_url, exchange)."""
+    exchange = exchange or FakeExchange(**kwargs)
+    server = make_server(exchange)
+    threading.Thread(target=server.serve_forever, kwargs={"poll_interval": 0.05}, daemon=True).start()
+    host, port = server.server_address[:2]
+    return server, f"http://{host}:{port}", exchange
+
+
+def patch_client(testcase, exchange=None, **extra):
+    """
+    Start a server for `exchange` and point the kalshi client at it for the
+    duration of a unittest `testcase`: BASE_URL, a no-op private key and a
+    well-formed signature, plus any other kalshi attributes in `extra`
+    (e.g. JSON_OUTPUT=False). Everything is undone by the test's cleanups.
+    Returns (server, base_url, exchange).
+    """
+    from unittest.mock import patch
+    import kalshi
+
+    server, base_url, exchange = start_in_thread(exchange)
+    testcase.addCleanup(server.server_close)
+    testcase.addCleanup(server.shutdown)
+    patches = {
+        "BASE_URL": {"new": base_url},
+        "load_private_key": {"return_value": None},
+        "sign_request": {"return_value": FAKE_SIGNATURE},
+        **{name: {"new": value} for name, value in extra.items()},
+    }
+    for target, kwargs in patches.items():
+        patcher = patch.object(kalshi, target, **kwargs)
+        patcher.start()
+        testcase.addCleanup(patcher.stop)
+    return server, base_url, exchange
+
+
+def _arg(flag, default, cast):
+    if flag in sys.argv:
+        i = sys.argv.index(flag)
+        if i + 1 < len(sys.argv):
+            return cast(sys.argv[i + 1])
+    return default
+
+
+if __name__ == "__main__":
+    if "--help" in sys.argv or "-h" in sys.argv:
+        print(__doc__)
+        sys.exit(0)
+    exchange = FakeExchange(
+        btc_price=_arg("--btc-price", 95_000.0, float),
+        markets=_arg("--markets", 40, int),
+        close_in_hours=_arg("--close-in-hours", 6.0, float),
+        latency_ms=_arg("--latency-ms", 0, float),
+        jitter_ms=_arg("--jitter-ms", 0, float),
+        rate_429=_arg("--rate-429", 0.0, float),
+        rate_5xx=_arg("--rate-5xx", 0.0, float),
+        check_auth="--no-auth-check" not in sys.argv,
+    )
+    server = make_server(exchange, port=_arg("--port", 8765, int))
+    host, port = server.server_address[:2]
+    print(f"🧪 Fake Kalshi exchange on http://{host}:{port}{API_PREFIX} ({len(exchange.markets)} markets)")
+    print(f"   export KALSHI_BASE_URL=http://{host}:{port}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print("\nStopped.")
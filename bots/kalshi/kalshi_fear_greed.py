@@ -0,0 +1,145 @@
+#!/usr/bin/env python3
+"""
+Fear & Greed Index store (alternative.me)
+
+The index is published once a day and every response says how long until the
+next update (time_until_update). Daily values are kept in a small local
+history (memory/kalshi-fear-greed.json) and the current value is served from
+it until that update is due; only then is the API hit again. A refetch after
+a gap pulls every missed day in the same call (?limit=N), and --backfill
+loads a long series in one request for backtests and attribution.
+
+Store layout:
+  {"next_update": <unix s>, "history": {"<day start, unix s>": [value, label], ...}}
+
+Usage:
+  python kalshi_fear_greed.py                Show the current value and history span
+  python kalshi_fear_greed.py --backfill N   Fetch the last N days in one request
+"""
+
+import os
+import sys
+import json
+import time
+import bisect
+from pathlib import Path
+
+# === CONFIG ===
+FEAR_GREED_PATH = Path(os.environ.get(
+    "KALSHI_FEAR_GREED_PATH",
+    str(Path(__file__).parent.parent / "memory" / "kalshi-fear-greed.json"),
+))
+API_URL = "https://api.alternative.me/fng/"
+HISTORY_DAYS = 730             # daily values kept locally
+MIN_REFETCH_SECONDS = 10 * 60  # don't re-poll faster than this if the update is late
+DAY_SECONDS = 86400
+
+
+# === STORE ===
+def load_store(path=None):
+    path = Path(path or FEAR_GREED_PATH)
+    try:
+        store = json.loads(path.read_text())
+        return {"next_update": store.get("next_update"), "history": store.get("history") or {}}
+    except (OSError, ValueError):
+        return {"next_update": None, "history": {}}
+
+
+def save_store(store, path=None):
+    path = Path(path or FEAR_GREED_PATH)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    keep = sorted(store["history"], key=int)[-HISTORY_DAYS:]
+    path.write_text(json.dumps({
+        "next_update": store["next_update"],
+        "history": {ts: store["history"][ts] for ts in keep},
+    }))
+
+
+def merge(store, entries, now=None):
+    """Fold API entries into the store; the newest entry's time_until_update sets next_update"""
+    now = time.time() if now is None else now
+    for e in entries:
+        store["history"][str(int(e["timestamp"]))] = [int(e["value"]), e["value_classification"]]
+    until = next((e.get("time_until_update") for e in entries if e.get("time_until_update")), None)
+    wait = int(until) if until else 0
+    store["next_update"] = now + max(wait, MIN_REFETCH_SECONDS)
+    return store
+
+
+def latest(store):
+    """{"value", "label", "timestamp"} for the newest stored day, or None"""
+    if not store["history"]:
+        return None
+    ts = max(store["history"], key=int)
+    value, label = store["history"][ts]
+    return {"value": value, "label": label, "timestamp": int(ts)}
+
+
+def history(store=None):
+    """[(day_ts, value, label)] oldest first"""
+    store = store or load_store()
+    return [(int(ts), *store["history"][ts]) for ts in sorted(store["history"], key=int)]
+
+
+def value_at(ts, series):
+    """Index value in effect at unix time ts (the latest day at or before it), or None"""
+    i = bisect.bisect_right(series, (ts, float("inf"))) - 1
+    if i < 0 or ts - series[i][0] > 2 * DAY_SECONDS:  # no published value near ts
+        return None
+    return series[i][1]
+
+
+# === FETCH ===
+def fetch(limit, fetch_json):
+    """Newest-first daily entries from the API in one request"""
+    return fetch_json(f"{API_URL}?limit={int(limit)}", timeout=10)["data"]
+
+
+def get_current(fetch_json, path=None, now=None):
+    """Current index as {"value", "label"}; fetched only once the published update is due"""
+    now = time.time() if now is None else now
+    store = load_store(path)
+    current = latest(store)
+    if current and store["next_update"] and now < store["next_update"]:
+        return {"value": current["value"], "label": current["label"]}
+
+    # after a gap, pull every missed day in the same call
+    missed = int((now - current["timestamp"]) // DAY_SECONDS) if current else 0
+    limit = min(max(missed, 1), HISTORY_DAYS)
+    try:
+        merge(store, fetch(limit, fetch_json), now)
+        save_store(store, path)
+    except Exception as e:
+        if not current or now - current["timestamp"] > 2 * DAY_SECONDS:
+            raise
+        print(f"⚠️  Fear & Greed fetch failed ({e}) — using stored value")
+    current = latest(store)
+    return {"value": current["value"], "label": current["label"]} if current else None
+
+
+def backfill(days, fetch_json, path=None):
+    """Load the last `days` daily values in one request. Returns the number stored."""
+    store = load_store(path)
+    merge(store, fetch(min(days, HISTORY_DAYS), fetch_json))
+    save_store(store, path)
+    return len(store["history"])
+
+
+# === CLI ===
+if __name__ == "__main__":
+    sys.path.insert(0, str(Path(__file__).parent))
+    if "--backfill" in sys.argv:
+        from kalshi_btc_monitor import _fetch_json_with_retry
+        days = int(sys.argv[sys.argv.index("--backfill") + 1])
+        print(f"📥 {backfill(days, _fetch_json_with_retry)} days stored in {FEAR_GREED_PATH}")
+    store = load_store()
+    current, series = latest(store), history(store)
+    if not current:
+        print("No Fear & Greed history stored yet")
+        sys.exit(0)
+    print(f"😨 Fear & Greed: {current['value']} ({current['label']})")
+    print(f"   {len(series)} days, "
+          f"{time.strftime('%Y-%m-%d', time.gmtime(series[0][0]))} → "
+          f"{time.strftime('%Y-%m-%d', time.gmtime(series[-1][0]))}")
+    if store["next_update"]:
+        print(f"   next update in {max(0, store['next_update'] - time.time()) / 3600:.1f}h")
@@ -0,0 +1,296 @@
+#!/usr/bin/env python3
+"""
+Kalshi Live Trade Ledger
+
+Commands:
+  --sync    Pull new fills + settlements, update live stats
+  --stats   Print current live stats
+
+How it works:
+  1. kalshi_btc_monitor.py (live) calls record_entry() with the signal context for each order
+  2. --sync ingests /portfolio/fills and /portfolio/settlements into append-only
+     JSONL files, starting from a persisted per-stream cursor (last timestamp
+     seen + the row IDs at that timestamp), so a routine sync only pages new rows.
+     With no cursor yet, a cold sync pages the history in time windows concurrently.
+  3. Fills are grouped per ticker, joined to their entry context by order ID and
+     settled from the settlement rows; the resulting trades feed the same
+     _compute_stats used for paper trading. The folded trades are persisted
+     with the cursors and a sync folds only its new rows into them; stats are
+     only recomputed when a sync brought new rows.
+"""
+
+import sys
+import json
+import datetime
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent))
+from kalshi import make_request as kalshi_request
+from kalshi_paper_tracker import _compute_stats, print_stats
+from kalshi_records import PaperTrade
+
+# === PATHS ===
+WORKSPACE        = Path(__file__).parent.parent
+LIVE_FILLS_JSONL = WORKSPACE / "memory" / "kalshi-live-fills.jsonl"
+LIVE_SETTLEMENTS_JSONL = WORKSPACE / "memory" / "kalshi-live-settlements.jsonl"
+LIVE_CURSORS_JSON = WORKSPACE / "memory" / "kalshi-live-cursors.json"
+LIVE_ENTRIES_JSON = WORKSPACE / "memory" / "kalshi-live-entries.json"
+LIVE_STATS_JSON  = WORKSPACE / "memory" / "kalshi-live-stats.json"
+
+PAGE_LIMIT = 200
+COLD_SYNC_DAYS = 365          # how far back a cold sync looks
+COLD_SYNC_WINDOW_DAYS = 7     # history is paged in windows of this size...
+COLD_SYNC_WORKERS = 8         # ...this many at a time
+
+# stream name -> (endpoint, response key, row timestamp field, row id function)
+STREAMS = {
+    "fills": (
+        "/trade-api/v2/portfolio/fills", "fills", "created_time",
+        lambda row: row.get("trade_id") or row.get("fill_id") or f"{row.get('order_id')}:{row.get('created_time')}",
+    ),
+    "settlements": (
+        "/trade-api/v2/portfolio/settlements", "settlements", "settled_time",
+        lambda row: f"{row.get('ticker')}:{row.get('settled_time')}",
+    ),
+}
+
+
+# === PERSISTENCE ===
+def _load_json(path, default):
+    if path.exists():
+        return json.loads(path.read_text())
+    return default
+
+def _save_json(path, payload):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(payload, indent=2))
+
+def _load_rows(path):
+    if not path.exists():
+        return []
+    with open(path) as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+def _append_rows(path, rows):
+    if not rows:
+        return
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, "a") as f:
+        for row in rows:
+            f.write(json.dumps(row, separators=(",", ":")) + "\n")
+
+def _ts(iso_str):
+    """ISO-8601 timestamp -> unix seconds (0 if missing/unparseable)"""
+    try:
+        return int(datetime.datetime.fromisoformat(iso_str.replace("Z", "+00:00")).timestamp())
+    except (AttributeError, ValueError):
+        return 0
+
+
+# === ENTRY CONTEXT (called from monitor) ===
+def record_entry(order_id, recommendation, signal_score, signals, btc, signal_flags=None):
+    """Remember the signal context behind a live order (a Recommendation) so fills can be joined to it later"""
+    entries = _load_json(LIVE_ENTRIES_JSON, {})
+    entries[order_id] = {
+        "timestamp": datetime.datetime.now(datetime.timezone.utc).isoformat(),
+        "ticker": recommendation.ticker,
+        "action": recommendation.action,
+        "strike": recommendation.strike,
+        "signal_score": signal_score,
+        "signals": signals,
+        "signal_flags": signal_flags,
+        "distance_pct": round(recommendation.distance_pct, 3),
+        "btc_price_at_entry": btc["price"],
+        "btc_change_24h_at_entry": round(btc["change_24h"], 2),
+        "settlement_time": recommendation.settlement_time,
+    }
+    _save_json(LIVE_ENTRIES_JSON, entries)
+
+
+# === INGESTION ===
+def _fetch_pages(stream, min_ts=None, max_ts=None):
+    """Page through one stream between min_ts and max_ts. Returns rows or None on error."""
+    endpoint, key, _, _ = STREAMS[stream]
+    rows, cursor = [], ""
+    while True:
+        path = f"{endpoint}?limit={PAGE_LIMIT}"
+        if min_ts is not None:
+            path += f"&min_ts={min_ts}"
+        if max_ts is not None:
+            path += f"&max_ts={max_ts}"
+        if cursor:
+            path += f"&cursor={cursor}"
+        result = kalshi_request("GET", path)
+        if "error" in result:
+            print(f"  ⚠️  {stream}: API error — {result['error']}")
+            return None
+        rows.extend(result.get(key) or [])
+        cursor = result.get("cursor") or ""
+        if not cursor:
+            return rows
+
+
+def _cold_fetch(stream, now):
+    """Page the whole history window-by-window, windows in parallel"""
+    window = COLD_SYNC_WINDOW_DAYS * 86400
+    start = now - COLD_SYNC_DAYS * 86400
+    bounds = [(lo, min(lo + window, now)) for lo in range(start, now, window)]
+    with ThreadPoolExecutor(max_workers=COLD_SYNC_WORKERS) as pool:
+        pages = list(pool.map(lambda b: _fetch_pages(stream, b[0], b[1]), bounds))
+    if any(p is None for p in pages):
+        return None
+    return [row for page in pages for row in page]
+
+
+def sync_stream(stream, cursors, now=None):
+    """
+    Ingest new rows for one stream and advance its cursor in `cursors`.
+    Returns the number of new rows appended, or None if the fetch failed.
+    """
+    rows = _sync_stream(stream, cursors, now)
+    return None if rows is None else len(rows)
+
+
+def _sync_stream(stream, cursors, now=None):
+    """sync_stream, returning the new rows themselves"""
+    _, _, ts_field, row_id = STREAMS[stream]
+    now = now or int(time.time())
+    cursor = cursors.get(stream)
+
+    if cursor:
+        rows = _fetch_pages(stream, min_ts=cursor["last_ts"])
+        seen = set(cursor.get("seen", []))
+        last_ts = cursor["last_ts"]
+    else:
+        print(f"  {stream}: no cursor — cold sync of last {COLD_SYNC_DAYS}d")
+        rows = _cold_fetch(stream, now)
+        seen, last_ts = set(), 0
+    if rows is None:
+        return None
+
+    # min_ts is inclusive and cold windows share edges: drop anything already held
+    new_rows = []
+    for row in sorted(rows, key=lambda r: _ts(r.get(ts_field))):
+        rid = row_id(row)
+        if rid in seen:
+            continue
+        seen.add(rid)
+        new_rows.append(row)
+        last_ts = max(last_ts, _ts(row.get(ts_field)))
+
+    _append_rows(LIVE_FILLS_JSONL if stream == "fills" else LIVE_SETTLEMENTS_JSONL, new_rows)
+    # Only IDs at the boundary second matter for the next inclusive min_ts
+    boundary = [row_id(r) for r in new_rows if _ts(r.get(ts_field)) == last_ts]
+    if cursor and last_ts == cursor["last_ts"]:
+        boundary += cursor.get("seen", [])
+    cursors[stream] = {"last_ts": last_ts, "seen": sorted(set(boundary))}
+    return new_rows
+
+
+def sync_ledger():
+    """
+    Sync fills and settlements (concurrently), fold the new rows into the
+    persisted trades and recompute live stats if anything changed
+    """
+    cursors = _load_json(LIVE_CURSORS_JSON, {})
+    with ThreadPoolExecutor(max_workers=len(STREAMS)) as pool:
+        new_rows = dict(zip(STREAMS, pool.map(lambda s: _sync_stream(s, cursors), STREAMS)))
+    counts = {stream: None if rows is None else len(rows) for stream, rows in new_rows.items()}
+
+    for stream, count in counts.items():
+        if count is not None:
+            print(f"  {stream}: {count} new row(s)")
+
+    # The folded trades are saved with the cursors, so the two always agree
+    state = cursors.get("folded")
+    if state is None:  # first sync since folding was persisted: fold what's ingested so far, once
+        state = fold_rows(_empty_state(), _load_rows(LIVE_FILLS_JSONL), _load_rows(LIVE_SETTLEMENTS_JSONL))
+    elif any(counts.values()):
+        state = fold_rows(state, new_rows["fills"] or [], new_rows["settlements"] or [])
+    cursors["folded"] = state
+    _save_json(LIVE_CURSORS_JSON, cursors)
+
+    stats = _load_json(LIVE_STATS_JSON, None)
+    if stats is None or any(counts.values()):
+        stats = _compute_stats(_trades(state), with_confidence=True)
+        _save_json(LIVE_STATS_JSON, stats)
+    return counts, stats
+
+
+# === TRADES ===
+def _empty_state():
+    return {"trades": {}, "settled": {}}
+
+
+def _trades(state):
+    return [PaperTrade.from_dict(t) for t in state["trades"].values()]
+
+
+def fold_rows(state, fills, settlements, entries=None):
+    """
+    Fold fill and settlement rows into `state` ({"trades": {ticker: trade
+    dict}, "settled": {ticker: settlement row}}), one PaperTrade per ticker —
+    the record _compute_stats expects. A ticker with a settlement row is a
+    win/loss on its net settlement P&L; otherwise open. Returns the state.
+    """
+    entries = _load_json(LIVE_ENTRIES_JSON, {}) if entries is None else entries
+    trades = {ticker: PaperTrade.from_dict(t) for ticker, t in state["trades"].items()}
+    settled = state["settled"]
+    settled.update((s["ticker"], s) for s in settlements)
+
+    touched = {s["ticker"] for s in settlements}
+    for f in sorted(fills, key=lambda r: _ts(r.get("created_time"))):
+        ticker = f["ticker"]
+        touched.add(ticker)
+        side = f.get("side", "yes")
+        price = f.get("yes_price") if side == "yes" else f.get("no_price")
+        sign = 1 if f.get("action", "buy") == "buy" else -1
+        trade = trades.get(ticker)
+        if trade is None:
+            context = entries.get(f.get("order_id"), {})
+            trade = trades[ticker] = PaperTrade.from_dict({
+                **context,
+                "id": f.get("order_id"),
+                "ticker": ticker,
+                "side": side,
+                "timestamp": f.get("created_time"),
+            })
+        trade.contracts += sign * f.get("count", 0)
+        trade.hypothetical_cost_usd = round(
+            trade.hypothetical_cost_usd + sign * f.get("count", 0) * (price or 0) / 100, 2)
+
+    for ticker in touched:
+        trade, s = trades.get(ticker), settled.get(ticker)
+        if trade is None or not s:
+            continue
+        cost = (s.get("yes_total_cost") or 0) + (s.get("no_total_cost") or 0)
+        pnl = round(((s.get("revenue") or 0) - cost) / 100, 2)
+        trade.status = "win" if pnl > 0 else "loss"
+        trade.result_side = s.get("market_result")
+        trade.realized_pnl = pnl
+        trade.resolved_at = s.get("settled_time")
+
+    state["trades"] = {ticker: t.to_dict() for ticker, t in trades.items()}
+    return state
+
+
+def build_trades(fills=None, settlements=None, entries=None):
+    """Fold every ingested fill and settlement from scratch (see fold_rows)"""
+    fills = _load_rows(LIVE_FILLS_JSONL) if fills is None else fills
+    settlements = _load_rows(LIVE_SETTLEMENTS_JSONL) if settlements is None else settlements
+    return _trades(fold_rows(_empty_state(), fills, settlements, entries))
+
+
+# === CLI ===
+if __name__ == "__main__":
+    if "--sync" in sys.argv:
+        _, stats = sync_ledger()
+        print_stats(stats, title="Live Trading")
+    elif "--stats" in sys.argv:
+        print_stats(_load_json(LIVE_STATS_JSON, None) or _compute_stats(build_trades(), with_confidence=True),
+                    title="Live Trading")
+    else:
+        print("Usage: kalshi_live_ledger.py [--sync | --stats]")
+        sys.exit(1)
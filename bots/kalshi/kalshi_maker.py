@@ -0,0 +1,209 @@
+#!/usr/bin/env python3
+"""
+Maker-mode execution: work a buy order inside the spread instead of lifting the ask
+
+  quote     one tick above the best competing bid (our own resting size is
+            left out of the book), never at or through the ask, never above
+            the cap — MAX_ENTRY_COST, and below the taker price it replaces
+  requote   every TICK_SECONDS the order and the book are re-read; when the
+            target price moved the order is amended (cancel/replace, back of
+            the queue), at most once per MIN_REQUOTE_SECONDS so queue
+            priority isn't thrown away on flicker. A book change is answered
+            within one tick plus the request time; ticks whose work overruns
+            TICK_SECONDS are counted.
+  give up   at SETTLEMENT_GUARD_MINUTES before close (or after MAX_WORK_SECONDS)
+            the unfilled remainder is canceled
+
+Reads and writes go through client-side token buckets (READS_PER_SECOND,
+WRITES_PER_SECOND) shared by every order this process works. Only trades
+that aren't urgent are worked this way: if the close is less than
+MIN_LEAD_MINUTES beyond the guard, the monitor crosses the spread as before.
+
+work_order blocks its caller. Under kalshi_scheduler that is the single
+worker every job shares, so MAX_WORK_SECONDS stays below the scheduler's
+shortest job interval (the scheduler caps it at startup): a worked order
+can delay the next refresh or mark by at most one window, never skip one.
+
+Enable with KALSHI_MAKER_MODE=true.
+"""
+
+import os
+import sys
+import time
+import datetime
+import threading
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent))
+from kalshi import make_request as kalshi_request
+from kalshi_execution import (TERMINAL_STATES, amend_order, build_order, cancel_order, filled_count,
+                              get_order, order_price, order_state, submit_orders)
+from kalshi_records import parse_ts
+
+# === CONFIG ===
+MAKER_MODE = os.environ.get("KALSHI_MAKER_MODE", "false").lower() == "true"
+TICK_SECONDS = float(os.environ.get("KALSHI_MAKER_TICK_SEC", "1.0"))
+MIN_REQUOTE_SECONDS = 2.0
+IMPROVE_CENTS = 1
+MAX_WORK_SECONDS = int(os.environ.get("KALSHI_MAKER_MAX_SEC", "180"))  # under the scheduler's 4-min refresh
+MIN_LEAD_MINUTES = 30          # beyond the settlement guard, or the trade is urgent
+READS_PER_SECOND = float(os.environ.get("KALSHI_READS_PER_SEC", "10"))
+WRITES_PER_SECOND = float(os.environ.get("KALSHI_WRITES_PER_SEC", "5"))
+
+
+# === RATE LIMITS ===
+class RateLimiter:
+    """Token bucket: `rate` calls per second with bursts of up to `burst`"""
+
+    def __init__(self, rate, burst=None, clock=time.monotonic, sleep=time.sleep):
+        self.rate = rate
+        self.burst = burst or max(1.0, rate)
+        self.clock = clock
+        self.sleep = sleep
+        self.tokens = self.burst
+        self.updated = clock()
+        self.lock = threading.Lock()
+
+    def acquire(self):
+        """Take one token, sleeping until one is available. Returns the seconds waited."""
+        with self.lock:
+            now = self.clock()
+            self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+            self.tokens -= 1
+            wait = -self.tokens / self.rate if self.tokens < 0 else 0.0
+        if wait:
+            self.sleep(wait)
+        return wait
+
+
+READS = RateLimiter(READS_PER_SECOND)
+WRITES = RateLimiter(WRITES_PER_SECOND)
+
+
+# === QUOTING ===
+def best_bid(orderbook, side, own=None):
+    """Best `side` bid from other traders; `own` = (price, size) of our resting order is left out"""
+    for price, qty in sorted(orderbook.get(side) or [], key=lambda lvl: lvl[0], reverse=True):
+        if own and price == own[0]:
+            qty -= own[1]
+        if qty > 0:
+            return price
+    return 0
+
+
+def best_ask(orderbook, side):
+    """Cheapest price a buyer of `side` could take: 100 - best opposite bid, or None"""
+    opposite = [price for price, qty in orderbook.get("no" if side == "yes" else "yes") or [] if qty > 0]
+    return 100 - max(opposite) if opposite else None
+
+
+def quote_price(orderbook, side, cap, own=None):
+    """Where to rest: best competing bid + IMPROVE_CENTS, below the ask, within the cap; None if < 1¢"""
+    price = best_bid(orderbook, side, own) + IMPROVE_CENTS
+    ask = best_ask(orderbook, side)
+    if ask is not None:
+        price = min(price, ask - 1)
+    price = min(price, cap)
+    return price if price >= 1 else None
+
+
+def price_cap(taker_cents, max_entry_cost):
+    """Highest maker bid: inside MAX_ENTRY_COST and strictly below the taker price it replaces"""
+    return min(max_entry_cost, taker_cents - 1)
+
+
+def give_up_time(settlement_time, guard_minutes, now=None):
+    """
+    Unix time to cancel the remainder: the settlement guard, or MAX_WORK_SECONDS
+    from now. None when the trade is urgent (close within guard + MIN_LEAD_MINUTES).
+    """
+    now = time.time() if now is None else now
+    close = parse_ts(settlement_time)
+    if close is None:
+        return None
+    guard = close - guard_minutes * 60
+    if guard - now < MIN_LEAD_MINUTES * 60:
+        return None
+    return min(guard, now + MAX_WORK_SECONDS)
+
+
+# === REQUOTE LOOP ===
+def _orderbook(ticker, reads):
+    reads.acquire()
+    result = kalshi_request("GET", f"/trade-api/v2/markets/{ticker}/orderbook")
+    if "error" in result:
+        print(f"⚠️  Orderbook fetch failed for {ticker}: {result['error']}")
+        return None
+    return result.get("orderbook") or {}
+
+
+def work_order(ticker, side, count, cap, deadline, clock=time.time, sleep=time.sleep,
+               reads=None, writes=None, tick=None):
+    """
+    Post `count` contracts inside the spread and follow the best bid until the
+    order fills or `deadline` (unix time) passes, then cancel the remainder.
+    Returns (order, stats) — order is the last known order dict or {"error": ...};
+    stats has ticks, requotes, overruns, max_tick_seconds.
+    """
+    reads = reads or READS
+    writes = writes or WRITES
+    tick = tick or TICK_SECONDS
+    stats = {"ticks": 0, "requotes": 0, "overruns": 0, "max_tick_seconds": 0.0}
+
+    book = _orderbook(ticker, reads)
+    price = quote_price(book, side, cap) if book is not None else None
+    if price is None:
+        return {"error": f"no maker price at or under {cap}¢"}, stats
+    writes.acquire()
+    order = submit_orders([build_order(ticker, side, count, price)])[0]
+    if "error" in order:
+        return order, stats
+    print(f"   🪝 Resting {count}x {side.upper()} @ {price}¢ (cap {cap}¢)")
+    quoted_at = next_tick = clock()
+
+    while order_state(order) not in TERMINAL_STATES:
+        next_tick += tick
+        if next_tick >= deadline:
+            break
+        sleep(max(0.0, next_tick - clock()))
+        started = clock()
+        stats["ticks"] += 1
+
+        reads.acquire()
+        latest = get_order(order["order_id"])
+        if "error" not in latest:
+            order = latest
+        if order_state(order) in TERMINAL_STATES:
+            break
+        book = _orderbook(ticker, reads)
+        if book is not None:
+            own = (order_price(order), order.get("remaining_count", count - filled_count(order)))
+            target = quote_price(book, side, cap, own)
+            if target and target != own[0] and started - quoted_at >= MIN_REQUOTE_SECONDS:
+                writes.acquire()
+                amended = amend_order(order, target)
+                if "error" in amended:
+                    print(f"⚠️  Requote to {target}¢ failed: {amended['error']}")
+                else:
+                    print(f"   🪝 Requote {own[0]}¢ → {target}¢ ({filled_count(amended)}/{count} filled)")
+                    order, quoted_at = amended, clock()
+                    stats["requotes"] += 1
+
+        elapsed = clock() - started
+        stats["max_tick_seconds"] = max(stats["max_tick_seconds"], round(elapsed, 3))
+        if elapsed > tick:
+            stats["overruns"] += 1
+            next_tick = clock()  # don't try to catch up on missed ticks
+
+    if order_state(order) not in TERMINAL_STATES:
+        at = datetime.datetime.fromtimestamp(deadline).strftime("%H:%M:%S")
+        print(f"   ⏱️  Maker deadline {at} — canceling remainder ({filled_count(order)}/{count} filled)")
+        writes.acquire()
+        canceled = cancel_order(order["order_id"])
+        if "error" in canceled:  # usually: filled out since the last read
+            print(f"⚠️  Could not cancel {order['order_id']}: {canceled['error']}")
+            canceled = get_order(order["order_id"])
+        if "error" not in canceled:
+            order = canceled
+    return order, stats
@@ -0,0 +1,213 @@
+#!/usr/bin/env python3
+"""
+Request metrics for the Kalshi client and the monitor's external feeds
+
+Set KALSHI_METRICS=true to enable. When disabled every hook is a single
+flag check at the call site, so the cost is effectively zero.
+
+Tracked per (upstream, endpoint):
+  - latency histogram (seconds, whole request including retries)
+  - requests, attempts, failures
+  - retry reasons: 429, 5xx, network
+  - bytes received
+Plus total RSA-PSS signing time for Kalshi requests, and the client cache's
+hit / miss / coalesced / invalidated counts per endpoint (kalshi_cache.py).
+
+At process exit the registry is written as a Prometheus textfile
+(KALSHI_METRICS_PROM) and a JSON summary (KALSHI_METRICS_JSON).
+
+Usage:
+  python kalshi_metrics.py    Print the last JSON summary
+"""
+
+import os
+import sys
+import json
+import atexit
+import threading
+from pathlib import Path
+
+ENABLED = os.environ.get("KALSHI_METRICS", "false").lower() == "true"
+
+WORKSPACE = Path(__file__).parent.parent
+PROM_PATH = Path(os.environ.get("KALSHI_METRICS_PROM", str(WORKSPACE / "memory" / "kalshi-metrics.prom")))
+JSON_PATH = Path(os.environ.get("KALSHI_METRICS_JSON", str(WORKSPACE / "memory" / "kalshi-metrics.json")))
+
+LATENCY_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+RETRY_REASONS = ("429", "5xx", "network")
+
+# Path segment after one of these collections is an identifier, not an endpoint
+_ID_SEGMENTS = {
+    "markets": "{ticker}",
+    "orders": "{order_id}",
+    "events": "{event_ticker}",
+    "series": "{series_ticker}",
+}
+_FIXED_SEGMENTS = {"batched"}
+
+_lock = threading.Lock()
+_endpoints = {}
+_sign = {"count": 0, "seconds": 0.0}
+
+
+class _EndpointStats:
+    __slots__ = ("requests", "attempts", "failures", "bytes", "latency_sum", "buckets", "retries")
+
+    def __init__(self):
+        self.requests = 0
+        self.attempts = 0
+        self.failures = 0
+        self.bytes = 0
+        self.latency_sum = 0.0
+        self.buckets = [0] * (len(LATENCY_BUCKETS) + 1)  # last = +Inf
+        self.retries = dict.fromkeys(RETRY_REASONS, 0)
+
+
+def endpoint_name(path):
+    """Collapse a request path to its endpoint template (no query, IDs replaced)"""
+    parts = path.split("?")[0].strip("/").split("/")
+    for i in range(1, len(parts)):
+        placeholder = _ID_SEGMENTS.get(parts[i - 1])
+        if placeholder and parts[i] not in _FIXED_SEGMENTS:
+            parts[i] = placeholder
+    return "/" + "/".join(parts)
+
+
+def retry_reason(status=None):
+    """Map an HTTP status (or None for a network error) to a retry reason label"""
+    if status is None:
+        return "network"
+    return "429" if status == 429 else "5xx"
+
+
+def _stats(upstream, endpoint):
+    key = (upstream, endpoint)
+    stats = _endpoints.get(key)
+    if stats is None:
+        stats = _endpoints[key] = _EndpointStats()
+    return stats
+
+
+# === RECORDING ===
+def observe(upstream, path, seconds, attempts, ok, nbytes=0):
+    """Record one completed request (after all of its retries)"""
+    with _lock:
+        stats = _stats(upstream, endpoint_name(path))
+        stats.requests += 1
+        stats.attempts += attempts
+        stats.failures += 0 if ok else 1
+        stats.bytes += nbytes
+        stats.latency_sum += seconds
+        for i, bound in enumerate(LATENCY_BUCKETS):
+            if seconds <= bound:
+                stats.buckets[i] += 1
+                break
+        else:
+            stats.buckets[-1] += 1
+
+
+def count_retry(upstream, path, status=None):
+    """Record one retried attempt and why it was retried"""
+    with _lock:
+        _stats(upstream, endpoint_name(path)).retries[retry_reason(status)] += 1
+
+
+def observe_sign(seconds):
+    """Record time spent producing one request signature"""
+    with _lock:
+        _sign["count"] += 1
+        _sign["seconds"] += seconds
+
+
+# === EXPORT ===
+def summary():
+    """Return the registry as a JSON-friendly dict"""
+    with _lock:
+        endpoints = []
+        for (upstream, endpoint), s in sorted(_endpoints.items()):
+            endpoints.append({
+                "upstream": upstream,
+                "endpoint": endpoint,
+                "requests": s.requests,
+                "attempts": s.attempts,
+                "failures": s.failures,
+                "bytes_received": s.bytes,
+                "latency_sum_sec": round(s.latency_sum, 6),
+                "latency_avg_sec": round(s.latency_sum / s.requests, 6) if s.requests else 0.0,
+                "latency_buckets": dict(zip([str(b) for b in LATENCY_BUCKETS] + ["+Inf"], s.buckets)),
+                "retries": dict(s.retries),
+            })
+        signing = {"count": _sign["count"], "seconds": round(_sign["seconds"], 6)}
+    import kalshi_cache  # imports endpoint_name from here
+    return {"endpoints": endpoints, "signing": signing, "cache": kalshi_cache.stats()}
+
+
+def prometheus_text():
+    """Render the registry in Prometheus text exposition format"""
+    lines = [
+        "# TYPE kalshi_request_duration_seconds histogram",
+    ]
+    data = summary()
+    for e in data["endpoints"]:
+        labels = f'upstream="{e["upstream"]}",endpoint="{e["endpoint"]}"'
+        cumulative = 0
+        for bound, count in e["latency_buckets"].items():
+            cumulative += count
+            lines.append(f'kalshi_request_duration_seconds_bucket{{{labels},le="{bound}"}} {cumulative}')
+        lines.append(f"kalshi_request_duration_seconds_sum{{{labels}}} {e['latency_sum_sec']}")
+        lines.append(f"kalshi_request_duration_seconds_count{{{labels}}} {e['requests']}")
+    for name, field in (
+        ("kalshi_request_attempts_total", "attempts"),
+        ("kalshi_request_failures_total", "failures"),
+        ("kalshi_response_bytes_total", "bytes_received"),
+    ):
+        lines.append(f"# TYPE {name} counter")
+        for e in data["endpoints"]:
+            lines.append(f'{name}{{upstream="{e["upstream"]}",endpoint="{e["endpoint"]}"}} {e[field]}')
+    lines.append("# TYPE kalshi_request_retries_total counter")
+    for e in data["endpoints"]:
+        for reason, count in e["retries"].items():
+            lines.append(
+                f'kalshi_request_retries_total{{upstream="{e["upstream"]}",endpoint="{e["endpoint"]}",'
+                f'reason="{reason}"}} {count}'
+            )
+    lines.append("# TYPE kalshi_client_cache_total counter")
+    for endpoint, counts in data["cache"].items():
+        for outcome in ("hit", "miss", "coalesced", "invalidated"):
+            lines.append(f'kalshi_client_cache_total{{endpoint="{endpoint}",outcome="{outcome}"}} {counts[outcome]}')
+    lines.append("# TYPE kalshi_sign_seconds_total counter")
+    lines.append(f"kalshi_sign_seconds_total {data['signing']['seconds']}")
+    lines.append("# TYPE kalshi_sign_total counter")
+    lines.append(f"kalshi_sign_total {data['signing']['count']}")
+    return "\n".join(lines) + "\n"
+
+
+def export(prom_path=None, json_path=None):
+    """Write the Prometheus textfile and JSON summary (atomically, via rename)"""
+    for path, render in (
+        (Path(prom_path or PROM_PATH), prometheus_text),
+        (Path(json_path or JSON_PATH), lambda: json.dumps(summary(), indent=2)),
+    ):
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_suffix(path.suffix + ".tmp")
+        tmp.write_text(render())
+        tmp.replace(path)
+
+
+def _export_at_exit():
+    if _endpoints or _sign["count"]:
+        try:
+            export()
+        except OSError as e:
+            print(f"⚠️  Metrics export failed: {e}")
+
+
+if ENABLED:
+    atexit.register(_export_at_exit)
+
+
+if __name__ == "__main__":
+    if not JSON_PATH.exists():
+        print(f"No metrics summary at {JSON_PATH} (run with KALSHI_METRICS=true)")
+        sys.exit(1)
+    print(JSON_PATH.read_text())
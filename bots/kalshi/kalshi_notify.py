@@ -0,0 +1,324 @@
+#!/usr/bin/env python3
+"""
+Notification outbox: durable queue + background sender
+
+notify(kind, text) writes one row per configured sink to a local SQLite
+outbox (memory/kalshi-outbox.sqlite) and returns — a few milliseconds, and it
+never raises into the caller. A daemon sender thread delivers the rows:
+
+  coalescing  after a wake-up it waits COALESCE_SECONDS so a burst (a resolve
+              settling ten trades, a run of failures) goes out as one digest,
+              up to MAX_BATCH events / MAX_MESSAGE_CHARS per message
+  retries     a failed send is retried with exponential backoff
+              (RETRY_BASE_SECONDS doubling, capped at RETRY_MAX_SECONDS) until
+              MAX_ATTEMPTS; rows are leased while in flight so two processes
+              never deliver the same row
+  exit        short-lived processes give the sender EXIT_FLUSH_SECONDS at exit;
+              anything still pending stays on disk for the next sender
+
+Sinks are enabled by their environment:
+  telegram  KALSHI_TELEGRAM_BOT_TOKEN + KALSHI_TELEGRAM_CHAT_ID
+  webhook   KALSHI_NOTIFY_WEBHOOK   (JSON POST: {"text", "events"})
+  file      KALSHI_NOTIFY_FILE      (appends messages; used by tests)
+KALSHI_NOTIFY_SINKS=telegram,file restricts delivery to the named sinks.
+
+Usage:
+  python kalshi_notify.py --status       Pending / sent / dead rows per sink
+  python kalshi_notify.py --drain        Deliver everything due now
+  python kalshi_notify.py --test "msg"   Queue a test message and deliver it
+"""
+
+import os
+import sys
+import json
+import time
+import atexit
+import threading
+from pathlib import Path
+
+# === CONFIG ===
+OUTBOX_PATH = Path(os.environ.get(
+    "KALSHI_OUTBOX",
+    str(Path(__file__).parent.parent / "memory" / "kalshi-outbox.sqlite"),
+))
+COALESCE_SECONDS = 5.0
+POLL_SECONDS = 60.0          # re-check for retries that came due
+MAX_BATCH = 20
+MAX_MESSAGE_CHARS = 4000     # Telegram caps messages at 4096
+MAX_ATTEMPTS = 8
+RETRY_BASE_SECONDS = 30
+RETRY_MAX_SECONDS = 30 * 60
+LEASE_SECONDS = 60           # in-flight rows are skipped by other senders this long
+EXIT_FLUSH_SECONDS = 3.0
+KEEP_SENT_DAYS = 7
+SEND_TIMEOUT = 10
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS outbox (
+    id INTEGER PRIMARY KEY,
+    sink TEXT NOT NULL,
+    kind TEXT NOT NULL,
+    text TEXT NOT NULL,
+    created REAL NOT NULL,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    next_attempt REAL NOT NULL,
+    lease_until REAL NOT NULL DEFAULT 0,
+    sent REAL,
+    error TEXT
+);
+CREATE INDEX IF NOT EXISTS outbox_due ON outbox (sink, sent, next_attempt);
+"""
+
+
+# === SINKS ===
+def _post_json(url, body):
+    import urllib.request
+
+    req = urllib.request.Request(url, data=json.dumps(body).encode(),
+                                 headers={"Content-Type": "application/json"}, method="POST")
+    with urllib.request.urlopen(req, timeout=SEND_TIMEOUT) as resp:
+        return resp.status
+
+
+class TelegramSink:
+    def __init__(self, token, chat_id):
+        self.url = f"https://api.telegram.org/bot{token}/sendMessage"
+        self.chat_id = chat_id
+
+    def send(self, text, events):
+        _post_json(self.url, {"chat_id": self.chat_id, "text": text})
+
+
+class WebhookSink:
+    def __init__(self, url):
+        self.url = url
+
+    def send(self, text, events):
+        _post_json(self.url, {"text": text, "events": events})
+
+
+class FileSink:
+    def __init__(self, path):
+        self.path = Path(path)
+
+    def send(self, text, events):
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with open(self.path, "a") as f:
+            f.write(text + "\n\n")
+
+
+def configured_sinks(env=None):
+    """{name: sink} for every sink whose environment is set (and listed in KALSHI_NOTIFY_SINKS)"""
+    env = os.environ if env is None else env
+    sinks = {}
+    if env.get("KALSHI_TELEGRAM_BOT_TOKEN") and env.get("KALSHI_TELEGRAM_CHAT_ID"):
+        sinks["telegram"] = TelegramSink(env["KALSHI_TELEGRAM_BOT_TOKEN"], env["KALSHI_TELEGRAM_CHAT_ID"])
+    if env.get("KALSHI_NOTIFY_WEBHOOK"):
+        sinks["webhook"] = WebhookSink(env["KALSHI_NOTIFY_WEBHOOK"])
+    if env.get("KALSHI_NOTIFY_FILE"):
+        sinks["file"] = FileSink(env["KALSHI_NOTIFY_FILE"])
+    only = env.get("KALSHI_NOTIFY_SINKS")
+    if only:
+        names = {s.strip() for s in only.split(",")}
+        sinks = {name: sink for name, sink in sinks.items() if name in names}
+    return sinks
+
+
+# === OUTBOX ===
+def _connect(path=None):
+    import sqlite3
+
+    path = Path(path or OUTBOX_PATH)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    db = sqlite3.connect(path, timeout=2, isolation_level=None)
+    db.execute("PRAGMA journal_mode=WAL")
+    db.execute("PRAGMA synchronous=NORMAL")
+    db.executescript(SCHEMA)
+    return db
+
+
+def enqueue(kind, text, sink_names, path=None, now=None):
+    """Write one outbox row per sink. Returns the number of rows written."""
+    now = time.time() if now is None else now
+    db = _connect(path)
+    try:
+        with db:
+            db.execute("BEGIN IMMEDIATE")
+            db.executemany(
+                "INSERT INTO outbox (sink, kind, text, created, next_attempt) VALUES (?, ?, ?, ?, ?)",
+                [(name, kind, text, now, now) for name in sink_names],
+            )
+    finally:
+        db.close()
+    return len(sink_names)
+
+
+def _claim(db, sink, now):
+    """Lease the due rows for one sink, oldest first, up to one message's worth"""
+    with db:
+        db.execute("BEGIN IMMEDIATE")
+        rows = db.execute(
+            "SELECT id, kind, text, created, attempts FROM outbox "
+            "WHERE sink = ? AND sent IS NULL AND attempts < ? AND next_attempt <= ? AND lease_until <= ? "
+            "ORDER BY id LIMIT ?",
+            (sink, MAX_ATTEMPTS, now, now, MAX_BATCH),
+        ).fetchall()
+        batch, chars = [], 0
+        for row in rows:
+            if batch and chars + len(row[2]) > MAX_MESSAGE_CHARS:
+                break
+            batch.append(row)
+            chars += len(row[2]) + 2
+        if batch:
+            db.execute(
+                f"UPDATE outbox SET lease_until = ? WHERE id IN ({','.join('?' * len(batch))})",
+                (now + LEASE_SECONDS, *(row[0] for row in batch)),
+            )
+    return batch
+
+
+def digest(rows):
+    """One message for a batch: the event itself, or a header plus every event"""
+    if len(rows) == 1:
+        return rows[0][2]
+    kinds = {}
+    for row in rows:
+        kinds[row[1]] = kinds.get(row[1], 0) + 1
+    summary = ", ".join(f"{n} {kind}" for kind, n in kinds.items())
+    return "\n\n".join([f"📬 {len(rows)} Kalshi events ({summary})"] + [row[2] for row in rows])
+
+
+def backoff(attempts):
+    return min(RETRY_MAX_SECONDS, RETRY_BASE_SECONDS * 2 ** (attempts - 1))
+
+
+def drain(sinks, path=None, now=None):
+    """Deliver every due row, one digest per batch per sink. Returns {sink: events delivered}."""
+    delivered = {}
+    db = _connect(path)
+    try:
+        for name, sink in sinks.items():
+            while True:
+                at = time.time() if now is None else now
+                batch = _claim(db, name, at)
+                if not batch:
+                    break
+                ids = [row[0] for row in batch]
+                marks = ",".join("?" * len(ids))
+                events = [{"kind": row[1], "text": row[2], "created": row[3]} for row in batch]
+                try:
+                    sink.send(digest(batch), events)
+                except Exception as e:
+                    attempts = batch[0][4] + 1
+                    db.execute(
+                        f"UPDATE outbox SET attempts = attempts + 1, next_attempt = ?, lease_until = 0, "
+                        f"error = ? WHERE id IN ({marks})",
+                        (at + backoff(attempts), str(e)[:500], *ids),
+                    )
+                    print(f"⚠️  Notify [{name}] failed ({e}) — retry {attempts}/{MAX_ATTEMPTS}")
+                    break
+                db.execute(f"UPDATE outbox SET sent = ?, lease_until = 0 WHERE id IN ({marks})", (at, *ids))
+                delivered[name] = delivered.get(name, 0) + len(batch)
+        cutoff = (time.time() if now is None else now) - KEEP_SENT_DAYS * 86400
+        db.execute("DELETE FROM outbox WHERE sent IS NOT NULL AND sent < ?", (cutoff,))
+    finally:
+        db.close()
+    return delivered
+
+
+def status(path=None):
+    """{sink: {"pending", "sent", "dead"}}"""
+    db = _connect(path)
+    try:
+        rows = db.execute(
+            "SELECT sink, "
+            "SUM(sent IS NULL AND attempts < ?), SUM(sent IS NOT NULL), SUM(sent IS NULL AND attempts >= ?) "
+            "FROM outbox GROUP BY sink",
+            (MAX_ATTEMPTS, MAX_ATTEMPTS),
+        ).fetchall()
+    finally:
+        db.close()
+    return {sink: {"pending": p, "sent": s, "dead": d} for sink, p, s, d in rows}
+
+
+# === SENDER ===
+class Sender(threading.Thread):
+    """Daemon thread draining the outbox: wake -> wait COALESCE_SECONDS -> drain"""
+
+    def __init__(self, sinks, path=None, coalesce=COALESCE_SECONDS, poll=POLL_SECONDS):
+        super().__init__(name="kalshi-notify", daemon=True)
+        self.sinks = sinks
+        self.path = path
+        self.coalesce = coalesce
+        self.poll = poll
+        self.wake = threading.Event()
+        self.stopping = threading.Event()
+
+    def run(self):
+        while not self.stopping.is_set():
+            self.wake.wait(self.poll)
+            self.stopping.wait(self.coalesce)  # let the burst land; stop() cuts this short
+            self.wake.clear()
+            self._drain()
+        self._drain()
+
+    def _drain(self):
+        try:
+            drain(self.sinks, self.path)
+        except Exception as e:
+            print(f"⚠️  Notify outbox unavailable: {e}")
+
+    def stop(self, timeout=EXIT_FLUSH_SECONDS):
+        """Flush what is due and stop, waiting at most `timeout` seconds"""
+        self.stopping.set()
+        self.wake.set()
+        self.join(timeout)
+
+
+_sender = None
+_sender_lock = threading.Lock()
+
+
+def start(sinks=None, path=None):
+    """The process's sender, started on first use and flushed (bounded) at exit; None without sinks"""
+    global _sender
+    with _sender_lock:
+        if _sender is None:
+            sinks = configured_sinks() if sinks is None else sinks
+            if not sinks:
+                return None
+            _sender = Sender(sinks, path)
+            _sender.start()
+            atexit.register(_sender.stop)
+        return _sender
+
+
+def notify(kind, text):
+    """Queue `text` for every configured sink and wake the sender. Never blocks on delivery or raises."""
+    try:
+        sinks = configured_sinks()
+        if not sinks:
+            return
+        enqueue(kind, text, list(sinks))
+        sender = start(sinks)
+        if sender:
+            sender.wake.set()
+    except Exception as e:
+        print(f"⚠️  Could not queue {kind} notification: {e}")
+
+
+# === CLI ===
+if __name__ == "__main__":
+    if "--test" in sys.argv:
+        i = sys.argv.index("--test")
+        enqueue("test", sys.argv[i + 1] if i + 1 < len(sys.argv) else "🔔 Kalshi notify test",
+                list(configured_sinks()))
+    if "--drain" in sys.argv or "--test" in sys.argv:
+        sinks = configured_sinks()
+        if not sinks:
+            print("No notification sinks configured")
+            sys.exit(1)
+        for name, count in drain(sinks).items():
+            print(f"📤 {name}: {count} delivered")
+    for name, counts in status().items():
+        print(f"📬 {name}: {counts['pending']} pending, {counts['sent']} sent, {counts['dead']} dead")
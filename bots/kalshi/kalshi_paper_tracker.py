@@ -3,24 +3,30 @@
 Kalshi Paper Trade Tracker
 
 Commands:
-  --resolve   Check settled markets, mark WIN/LOSS, update stats
+  --resolve   Check settled markets, mark WIN/LOSS, update stats, mark what is still open
+  --mark      Mark open trades to market: unrealized P&L, exposure by settlement, equity curve
   --stats     Print current rolling stats
+  --analytics Win rate / expectancy by signal score, signal, distance and settlement tier
 
 Lifecycle:
   1. kalshi_btc_monitor.py (dry-run) calls log_paper_trade() on each triggered entry
-  2. Resolver cron (daily ~2:30 PM PT) calls this with --resolve
-  3. Stats update automatically; Telegram ping fires at MILESTONE_SAMPLE_SIZE
+  2. kalshi_scheduler.py resolves shortly after each open trade's settlement_time
+     (or run this with --resolve)
+  3. Stats update automatically; each result and the MILESTONE_SAMPLE_SIZE
+     summary are queued to the notification outbox (kalshi_notify.py)
 """
 
 import os
 import sys
 import json
+import time
 import uuid
 import datetime
 from pathlib import Path
 
 sys.path.insert(0, str(Path(__file__).parent))
-from kalshi import make_request as kalshi_request
+from kalshi_records import MAX_BET, MIN_BET, PaperTrade, fmt_usd
+from kalshi_notify import notify
 
 # === PATHS ===
 WORKSPACE         = Path(__file__).parent.parent
@@ -29,26 +35,50 @@ PAPER_STATS_JSON  = WORKSPACE / "memory" / "kalshi-paper-stats.json"
 TRADE_LOG_MD      = WORKSPACE / "memory" / "kalshi-btc-trades.md"
 
 MILESTONE_SAMPLE_SIZE = 20  # Telegram ping when this many trades are resolved
+MAX_RISK_OF_RUIN = 0.05     # go-live ceiling on kalshi_risk's Monte Carlo estimate
+MARKET_BATCH = 100          # tickers per bulk /markets?tickers= request
+
+
+def kalshi_request(method, path, data=None):
+    """kalshi.make_request, imported on first use so --stats never loads the HTTP/auth stack"""
+    from kalshi import make_request
+    return make_request(method, path, data)
 
 
 # === PERSISTENCE ===
-def _load_trades():
-    if PAPER_TRADES_JSON.exists():
-        return json.loads(PAPER_TRADES_JSON.read_text())
+def ledger_paths(strategy=None):
+    """(trades_json, stats_json) for a named strategy's ledger; None = the main paper ledger"""
+    if not strategy:
+        return PAPER_TRADES_JSON, PAPER_STATS_JSON
+    return (PAPER_TRADES_JSON.with_name(f"kalshi-paper-trades-{strategy}.json"),
+            PAPER_STATS_JSON.with_name(f"kalshi-paper-stats-{strategy}.json"))
+
+def marks_path(strategy=None):
+    """Equity-curve points for a ledger: one [ts, realized, unrealized, open_cost] JSON array per line"""
+    trades_json = ledger_paths(strategy)[0]
+    return trades_json.with_name(trades_json.stem.replace("-trades", "-marks") + ".jsonl")
+
+def _load_trades(strategy=None):
+    path = ledger_paths(strategy)[0]
+    if path.exists():
+        return [PaperTrade.from_dict(t) for t in json.loads(path.read_text())]
     return []
 
-def _save_trades(trades):
-    PAPER_TRADES_JSON.parent.mkdir(parents=True, exist_ok=True)
-    PAPER_TRADES_JSON.write_text(json.dumps(trades, indent=2))
+def _save_trades(trades, strategy=None):
+    path = ledger_paths(strategy)[0]
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps([t.to_dict() for t in trades], indent=2))
 
-def _load_stats():
-    if PAPER_STATS_JSON.exists():
-        return json.loads(PAPER_STATS_JSON.read_text())
+def _load_stats(strategy=None):
+    path = ledger_paths(strategy)[1]
+    if path.exists():
+        return json.loads(path.read_text())
     return _empty_stats()
 
-def _save_stats(stats):
-    PAPER_STATS_JSON.parent.mkdir(parents=True, exist_ok=True)
-    PAPER_STATS_JSON.write_text(json.dumps(stats, indent=2))
+def _save_stats(stats, strategy=None):
+    path = ledger_paths(strategy)[1]
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(stats, indent=2))
 
 def _empty_stats():
     return {
@@ -67,6 +97,9 @@ def _empty_stats():
         "last_updated": None,
     }
 
+def _tag(strategy):
+    return f" [{strategy}]" if strategy else ""
+
 def _append_md(action, details):
     """Append a section to the markdown trade log"""
     timestamp = datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S PST")
@@ -81,91 +114,104 @@ def _append_md(action, details):
 
 
 # === LOG PAPER TRADE (called from monitor) ===
-def log_paper_trade(recommendation, signal_score, signals, btc, settlement_time=None):
+def log_paper_trade(recommendation, signal_score, signals, btc, strategy=None, signal_flags=None):
     """
-    Record a dry-run paper trade entry.
+    Record a dry-run paper trade entry for a Recommendation.
+    With an order-book fill (from the monitor's select_market, or a simulated
+    one from kalshi_simulator) the trade is sized to the fill; without one it
+    is sized at the quoted cost.
+    `strategy` selects a per-strategy ledger (see kalshi_strategies.py);
+    `signal_flags` are score_signals' per-signal booleans, kept for analytics.
     Returns the trade ID string.
     """
-    trade_id = str(uuid.uuid4())[:8].upper()
-    timestamp = datetime.datetime.now(datetime.timezone.utc).isoformat()
-
-    cost_cents = int(recommendation["cost"].replace("¢", ""))
-    side = "no" if "NO" in recommendation["action"] else "yes"
-
-    # Mirror live position sizing (must match kalshi_btc_monitor.py constants)
-    min_bet, max_bet = 100, 300
-    contracts = max(1, int(min_bet * 100 / cost_cents))
-    if contracts * cost_cents / 100 > max_bet:
-        contracts = int(max_bet * 100 / cost_cents)
-    total_cost = round(contracts * cost_cents / 100, 2)
-    potential_profit = round(contracts * (100 - cost_cents) / 100, 2)
-
-    trade = {
-        "id": trade_id,
-        "timestamp": timestamp,
-        "ticker": recommendation["ticker"],
-        "side": side,
-        "action": recommendation["action"],
-        "strike": recommendation["strike"],
-        "entry_cost_cents": cost_cents,
-        "contracts": contracts,
-        "hypothetical_cost_usd": total_cost,
-        "potential_profit_usd": potential_profit,
-        "signal_score": signal_score,
-        "signals": signals,
-        "btc_price_at_entry": btc["price"],
-        "btc_change_24h_at_entry": round(btc["change_24h"], 2),
-        "settlement_time": settlement_time,
-        "status": "open",
-        "result_side": None,
-        "realized_pnl": None,
-        "resolved_at": None,
-    }
+    cost_cents = recommendation.cost_cents
+    fill = recommendation.fill
+    if fill:
+        contracts = fill["contracts"]
+        total_cost = round(fill["total_cents"] / 100, 2)
+        avg_cost = round(fill["avg_cost"], 2)
+    else:
+        # Mirror live position sizing
+        contracts = max(1, int(MIN_BET * 100 / cost_cents))
+        if contracts * cost_cents / 100 > MAX_BET:
+            contracts = int(MAX_BET * 100 / cost_cents)
+        total_cost = round(contracts * cost_cents / 100, 2)
+        avg_cost = float(cost_cents)
+    potential_profit = round(contracts - total_cost, 2)
+
+    trade = PaperTrade(
+        id=str(uuid.uuid4())[:8].upper(),
+        timestamp=datetime.datetime.now(datetime.timezone.utc).isoformat(),
+        ticker=recommendation.ticker,
+        side=recommendation.side,
+        action=recommendation.action,
+        strike=recommendation.strike,
+        entry_cost_cents=cost_cents,
+        avg_entry_cost_cents=avg_cost,
+        contracts=contracts,
+        fill_model=fill.get("model", "book") if fill else "quote",
+        hypothetical_cost_usd=total_cost,
+        potential_profit_usd=potential_profit,
+        signal_score=signal_score,
+        signals=signals,
+        signal_flags=signal_flags,
+        distance_pct=round(recommendation.distance_pct, 3),
+        btc_price_at_entry=btc["price"],
+        btc_change_24h_at_entry=round(btc["change_24h"], 2),
+        settlement_time=recommendation.settlement_time,
+    )
 
-    trades = _load_trades()
+    trades = _load_trades(strategy)
     trades.append(trade)
-    _save_trades(trades)
-
-    _append_md("PAPER TRADE OPENED", {
-        "id": trade_id,
-        "ticker": trade["ticker"],
-        "action": trade["action"],
-        "strike": trade["strike"],
-        "entry": f"{cost_cents}¢ × {contracts} contracts = ${total_cost:.2f} at risk",
+    _save_trades(trades, strategy)
+
+    _append_md(f"PAPER TRADE OPENED{_tag(strategy)}", {
+        "id": trade.id,
+        "ticker": trade.ticker,
+        "action": trade.action,
+        "strike": fmt_usd(trade.strike),
+        "entry": f"{avg_cost:g}¢ × {contracts} contracts = ${total_cost:.2f} at risk",
         "if_win": f"+${potential_profit:.2f}",
         "signal_score": f"{signal_score}/5",
-        "btc_at_entry": f"${btc['price']:,.2f} ({btc['change_24h']:+.2f}% 24h)",
-        "thesis": recommendation.get("thesis", ""),
+        "btc_at_entry": f"{fmt_usd(btc['price'])} ({btc['change_24h']:+.2f}% 24h)",
+        "thesis": recommendation.thesis,
     })
 
-    return trade_id
+    return trade.id
 
 
 # === RESOLVER ===
-def resolve_paper_trades():
+def resolve_paper_trades(strategy=None, market_cache=None):
     """
     For each open paper trade, check if the market has settled.
-    Mark WIN/LOSS, compute P&L, recompute rolling stats.
+    Mark WIN/LOSS, compute P&L, recompute rolling stats, and mark the trades
+    still open to market from the same quotes (fetched in bulk).
+    `strategy` selects a per-strategy ledger; `market_cache` (ticker -> API
+    result) lets several ledgers share one market lookup per ticker.
 
     Returns: (newly_resolved, milestone_reached, stats)
     """
-    trades = _load_trades()
-    open_trades = [t for t in trades if t["status"] == "open"]
+    trades = _load_trades(strategy)
+    open_trades = [t for t in trades if t.status == "open"]
+    market_cache = {} if market_cache is None else market_cache
 
     if not open_trades:
         print("No open paper trades to resolve.")
-        return 0, False, _load_stats()
+        return 0, False, _load_stats(strategy)
 
     print(f"Resolving {len(open_trades)} open paper trade(s)...")
-    prev_resolved = sum(1 for t in trades if t["status"] in ("win", "loss"))
+    prefetch_markets([t.ticker for t in open_trades], market_cache)
+    prev_resolved = sum(1 for t in trades if t.status in ("win", "loss"))
     newly_resolved = 0
 
     for trade in trades:
-        if trade["status"] != "open":
+        if trade.status != "open":
             continue
 
-        ticker = trade["ticker"]
-        result = kalshi_request("GET", f"/trade-api/v2/markets/{ticker}")
+        ticker = trade.ticker
+        result = market_cache.get(ticker)
+        if result is None:
+            result = market_cache[ticker] = kalshi_request("GET", f"/trade-api/v2/markets/{ticker}")
 
         if "error" in result:
             print(f"  ⚠️  {ticker}: API error — {result['error']}")
@@ -179,41 +225,44 @@ def resolve_paper_trades():
             continue
 
         result_side = market.get("result", "")
-        trade["result_side"] = result_side
-        trade["resolved_at"] = datetime.datetime.now(datetime.timezone.utc).isoformat()
+        trade.result_side = result_side
+        trade.resolved_at = datetime.datetime.now(datetime.timezone.utc).isoformat()
 
-        cost_cents = trade["entry_cost_cents"]
-        contracts = trade["contracts"]
+        contracts = trade.contracts
+        total_cost = trade.hypothetical_cost_usd
 
-        if result_side == trade["side"]:
-            pnl = round(contracts * (100 - cost_cents) / 100, 2)
-            trade["status"] = "win"
-            trade["realized_pnl"] = pnl
+        if result_side == trade.side:
+            pnl = round(contracts - total_cost, 2)
+            trade.status = "win"
+            trade.realized_pnl = pnl
             outcome_str = f"WIN  +${pnl:.2f}"
             emoji = "✅"
         else:
-            pnl = round(-contracts * cost_cents / 100, 2)
-            trade["status"] = "loss"
-            trade["realized_pnl"] = pnl
+            pnl = round(-total_cost, 2)
+            trade.status = "loss"
+            trade.realized_pnl = pnl
             outcome_str = f"LOSS -${abs(pnl):.2f}"
             emoji = "❌"
 
         newly_resolved += 1
-        print(f"  {emoji} [{trade['id']}] {ticker} → {outcome_str}")
+        print(f"  {emoji} [{trade.id}] {ticker} → {outcome_str}")
+        notify("resolved", f"{emoji} Paper{_tag(strategy)} {trade.side.upper()} {ticker} → {outcome_str}")
 
-        _append_md(f"PAPER TRADE {trade['status'].upper()}", {
-            "id": trade["id"],
+        _append_md(f"PAPER TRADE {trade.status.upper()}{_tag(strategy)}", {
+            "id": trade.id,
             "ticker": ticker,
-            "our_side": trade["side"].upper(),
+            "our_side": trade.side.upper(),
             "market_result": result_side.upper(),
             "outcome": outcome_str,
-            "signal_score": f"{trade['signal_score']}/5",
+            "signal_score": f"{trade.signal_score}/5",
         })
 
-    _save_trades(trades)
+    _save_trades(trades, strategy)
 
-    stats = _compute_stats(trades)
-    _save_stats(stats)
+    stats = _compute_stats(trades, with_confidence=True)
+    if any(t.status == "open" for t in trades):
+        stats["mark"] = _mark(trades, strategy, market_cache)  # same quotes, no extra requests
+    _save_stats(stats, strategy)
 
     # Milestone: first time crossing MILESTONE_SAMPLE_SIZE resolved trades
     new_resolved_total = stats["total_resolved"]
@@ -221,23 +270,137 @@ def resolve_paper_trades():
         new_resolved_total >= MILESTONE_SAMPLE_SIZE and
         prev_resolved < MILESTONE_SAMPLE_SIZE
     )
+    if milestone_reached:
+        notify("milestone", milestone_telegram_message(stats) + _tag(strategy))
 
     return newly_resolved, milestone_reached, stats
 
 
+# === MARK TO MARKET ===
+def prefetch_markets(tickers, market_cache):
+    """Fill market_cache (ticker -> {"market": ...}) with bulk /markets?tickers= requests"""
+    missing = [t for t in dict.fromkeys(tickers) if t not in market_cache]
+    for i in range(0, len(missing), MARKET_BATCH):
+        batch = missing[i:i + MARKET_BATCH]
+        result = kalshi_request("GET", f"/trade-api/v2/markets?tickers={','.join(batch)}&limit={len(batch)}")
+        if "error" in result:
+            print(f"  ⚠️  Bulk market fetch failed: {result['error']} — falling back to per-ticker lookups")
+            return
+        for market in result.get("markets", []):
+            market_cache[market["ticker"]] = {"market": market}
+
+
+def _mark_value(trade, market):
+    """Dollars an open trade would fetch now: its side's bid, or the payout once settled"""
+    if market.get("status") in ("settled", "finalized") and market.get("result"):
+        per_contract = 100 if market["result"] == trade.side else 0
+    else:
+        per_contract = market.get(f"{trade.side}_bid") or 0
+    return trade.contracts * per_contract / 100
+
+
+def _load_marks(strategy=None):
+    path = marks_path(strategy)
+    if not path.exists():
+        return []
+    return [json.loads(line) for line in path.read_text().splitlines() if line]
+
+
+def _mark(trades, strategy, market_cache):
+    """Mark open trades from market_cache, append an equity point, return the mark summary"""
+    open_trades = [t for t in trades if t.status == "open"]
+    prefetch_markets([t.ticker for t in open_trades], market_cache)
+
+    exposure = {}
+    open_cost = open_value = 0.0
+    unmarked = 0
+    for t in open_trades:
+        result = market_cache.get(t.ticker)
+        if result is None or "error" in result:
+            unmarked += 1
+            value = t.hypothetical_cost_usd  # no quote: carry at cost
+        else:
+            value = _mark_value(t, result.get("market", result))
+        open_cost += t.hypothetical_cost_usd
+        open_value += value
+        bucket = exposure.setdefault(t.settlement_time or "unknown", [0, 0.0, 0.0])
+        bucket[0] += 1
+        bucket[1] += t.hypothetical_cost_usd
+        bucket[2] += value
+
+    realized = sum((t.realized_pnl or 0.0 for t in trades if t.status in ("win", "loss")), 0.0)
+    unrealized = open_value - open_cost
+    point = [int(time.time()), round(realized, 2), round(unrealized, 2), round(open_cost, 2)]
+    path = marks_path(strategy)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, "a") as f:
+        f.write(json.dumps(point, separators=(",", ":")) + "\n")
+
+    peak = max_dd = 0.0
+    for _, r, u, _ in _load_marks(strategy):
+        equity = r + u
+        peak = max(peak, equity)
+        max_dd = max(max_dd, peak - equity)
+
+    return {
+        "timestamp": datetime.datetime.fromtimestamp(point[0], datetime.timezone.utc).isoformat(),
+        "open_trades": len(open_trades),
+        "unmarked": unmarked,
+        "open_cost_usd": round(open_cost, 2),
+        "open_value_usd": round(open_value, 2),
+        "unrealized_pnl": round(unrealized, 2),
+        "equity": round(realized + unrealized, 2),
+        "current_drawdown": round(peak - (realized + unrealized), 2),
+        "max_drawdown_marked": round(max_dd, 2),
+        "exposure": [
+            {"settlement": settle, "trades": n, "cost_usd": round(cost, 2), "value_usd": round(value, 2)}
+            for settle, (n, cost, value) in sorted(exposure.items())
+        ],
+    }
+
+
+def mark_to_market(strategy=None, market_cache=None):
+    """Mark a ledger's open trades (bulk quotes), store the summary in its stats. Returns the mark."""
+    market_cache = {} if market_cache is None else market_cache
+    trades = _load_trades(strategy)
+    mark = _mark(trades, strategy, market_cache)
+    stats = _load_stats(strategy)
+    stats["mark"] = mark
+    _save_stats(stats, strategy)
+    return mark
+
+
+def _mark_lines(mark):
+    unquoted = f", {mark['unmarked']} unquoted" if mark["unmarked"] else ""
+    lines = [
+        f"  Unrealized:   ${mark['unrealized_pnl']:+.2f} on ${mark['open_cost_usd']:.2f} open "
+        f"({mark['open_trades']} trades{unquoted})",
+        f"  Equity:       ${mark['equity']:+.2f}  (drawdown ${mark['current_drawdown']:.2f}, "
+        f"max incl. open risk ${mark['max_drawdown_marked']:.2f})",
+    ]
+    for e in mark["exposure"]:
+        lines.append(f"    settles {e['settlement'][:16].replace('T', ' ')}  {e['trades']:>3} trades  "
+                     f"${e['cost_usd']:>9,.2f} at risk  marked ${e['value_usd']:,.2f}")
+    return lines
+
+
 # === STATS ===
-def _compute_stats(trades):
-    resolved = [t for t in trades if t["status"] in ("win", "loss")]
-    wins     = [t for t in resolved if t["status"] == "win"]
-    losses   = [t for t in resolved if t["status"] == "loss"]
+def _compute_stats(trades, with_confidence=False):
+    """
+    Rolling stats over a list of PaperTrade records. with_confidence adds
+    kalshi_risk's bootstrap intervals and risk of ruin under "confidence".
+    """
+    resolved = [t for t in trades if t.status in ("win", "loss")]
+    wins     = [t for t in resolved if t.status == "win"]
+    losses   = [t for t in resolved if t.status == "loss"]
 
     now = datetime.datetime.now(datetime.timezone.utc)
 
     def pnl_since(days):
         cutoff = (now - datetime.timedelta(days=days)).isoformat()
         return round(sum(
-            t["realized_pnl"] for t in resolved
-            if (t.get("resolved_at") or "") >= cutoff
+            t.realized_pnl for t in resolved
+            if (t.resolved_at or "") >= cutoff
         ), 2)
 
     total      = len(resolved)
@@ -245,25 +408,25 @@ def _compute_stats(trades):
     loss_count = len(losses)
     win_rate   = win_count / total if total > 0 else 0.0
 
-    avg_win  = sum(t["realized_pnl"] for t in wins)   / win_count  if wins   else 0.0
-    avg_loss = sum(abs(t["realized_pnl"]) for t in losses) / loss_count if losses else 0.0
+    avg_win  = sum(t.realized_pnl for t in wins)   / win_count  if wins   else 0.0
+    avg_loss = sum(abs(t.realized_pnl) for t in losses) / loss_count if losses else 0.0
     expectancy = (avg_win * win_rate) - (avg_loss * (1 - win_rate)) if total > 0 else 0.0
 
     # Max drawdown over cumulative P&L curve
     cumulative = peak = max_dd = 0.0
-    for t in sorted(resolved, key=lambda x: x.get("resolved_at", "")):
-        cumulative += t["realized_pnl"]
+    for t in sorted(resolved, key=lambda x: x.resolved_at or ""):
+        cumulative += t.realized_pnl
         if cumulative > peak:
             peak = cumulative
         dd = peak - cumulative
         if dd > max_dd:
             max_dd = dd
 
-    total_pnl = sum(t["realized_pnl"] for t in resolved)
+    total_pnl = sum(t.realized_pnl for t in resolved)
 
-    return {
+    stats = {
         "total_resolved":  total,
-        "open_trades":     sum(1 for t in trades if t["status"] == "open"),
+        "open_trades":     sum(1 for t in trades if t.status == "open"),
         "wins":            win_count,
         "losses":          loss_count,
         "win_rate":        round(win_rate, 4),
@@ -276,29 +439,68 @@ def _compute_stats(trades):
         "last_30d_pnl":    pnl_since(30),
         "last_updated":    now.isoformat(),
     }
+    if with_confidence:
+        from kalshi_risk import confidence  # numpy (optional) only loads when resampling
+        stats["confidence"] = confidence(trades)
+    return stats
 
 
-def print_stats(stats=None):
+def verdict(stats):
+    """
+    "go", "no" or "wait". With confidence intervals the call is made on the
+    interval, not the point estimate: expectancy must be positive across the
+    whole interval (and risk of ruin under MAX_RISK_OF_RUIN) to go live, and
+    is only called negative when the whole interval is below zero.
+    """
+    ci = stats.get("confidence")
+    if ci:
+        if ci["expectancy"][1] < 0:
+            return "no"
+        if ci["expectancy"][0] > 0 and stats["win_rate"] >= 0.40 and ci["risk_of_ruin"] <= MAX_RISK_OF_RUIN:
+            return "go"
+        return "wait"
+    if stats["expectancy"] > 0 and stats["win_rate"] >= 0.40:
+        return "go"
+    return "no" if stats["expectancy"] < 0 else "wait"
+
+
+def _ci_lines(stats):
+    """Interval / risk-of-ruin lines shared by print_stats and the milestone message"""
+    ci = stats.get("confidence")
+    if not ci:
+        return []
+    level = f"{ci['level']:.0%} CI"
+    return [
+        f"  {level} Expectancy: ${ci['expectancy'][0]:+.2f} … ${ci['expectancy'][1]:+.2f}",
+        f"  {level} Win Rate:   {ci['win_rate'][0]:.0%} … {ci['win_rate'][1]:.0%}",
+        f"  {level} Max DD:     ${ci['max_drawdown'][0]:.2f} … ${ci['max_drawdown'][1]:.2f}",
+        f"  Risk of Ruin:      {ci['risk_of_ruin']:.1%}  (${ci['bankroll']:,.0f} bankroll, "
+        f"{ci['horizon']} trades, {ci['resamples']:,} resamples)",
+    ]
+
+
+def print_stats(stats=None, title="Paper Trading"):
     """Print formatted rolling stats to stdout"""
     if stats is None:
         stats = _load_stats()
+        if stats["total_resolved"] and "confidence" not in stats:  # saved before intervals existed
+            stats = _compute_stats(_load_trades(), with_confidence=True)
 
     total = stats["total_resolved"]
     if total == 0:
-        print("No resolved paper trades yet.")
+        print(f"No resolved {title.split()[0].lower()} trades yet.")
         return stats
 
-    verdict = ""
+    call = ""
     if total >= 10:
-        if stats["expectancy"] > 0 and stats["win_rate"] >= 0.40:
-            verdict = "  → ✅ Positive expectancy — monitor for go-live"
-        elif stats["expectancy"] < 0:
-            verdict = "  → ❌ Negative expectancy — needs tuning"
-        else:
-            verdict = "  → ⏳ Marginal — collect more data"
+        call = {
+            "go": "  → ✅ Positive expectancy — monitor for go-live",
+            "no": "  → ❌ Negative expectancy — needs tuning",
+            "wait": "  → ⏳ Marginal — collect more data",
+        }[verdict(stats)]
 
     print(f"\n{'─'*42}")
-    print(f"📊 Paper Trading  ({total} resolved, {stats['open_trades']} open)")
+    print(f"📊 {title}  ({total} resolved, {stats['open_trades']} open)")
     print(f"{'─'*42}")
     print(f"  Win Rate:     {stats['win_rate']:.0%}  ({stats['wins']}W / {stats['losses']}L)")
     print(f"  Total P&L:    ${stats['total_pnl']:+.2f}")
@@ -308,8 +510,14 @@ def print_stats(stats=None):
     print(f"  Max Drawdown: ${stats['max_drawdown']:.2f}")
     print(f"  7-day P&L:    ${stats['last_7d_pnl']:+.2f}")
     print(f"  30-day P&L:   ${stats['last_30d_pnl']:+.2f}")
-    if verdict:
-        print(verdict)
+    for line in _ci_lines(stats):
+        print(line)
+    if stats.get("mark"):
+        print(f"  Marked at {stats['mark']['timestamp'][:16].replace('T', ' ')} UTC:")
+        for line in _mark_lines(stats["mark"]):
+            print(line)
+    if call:
+        print(call)
     print(f"{'─'*42}")
     return stats
 
@@ -324,14 +532,14 @@ def milestone_telegram_message(stats):
         f"Expectancy:  ${stats['expectancy']:+.2f} / trade",
         f"Max Drawdown: ${stats['max_drawdown']:.2f}",
         f"7-day P&L:   ${stats['last_7d_pnl']:+.2f}",
+        *(line.strip() for line in _ci_lines(stats)),
         "",
     ]
-    if stats["expectancy"] > 0 and stats["win_rate"] >= 0.40:
-        lines.append("✅ Positive expectancy — ready for go-live review")
-    elif stats["expectancy"] < 0:
-        lines.append("❌ Negative expectancy — tune strategy before going live")
-    else:
-        lines.append("⏳ Marginal results — collect more data")
+    lines.append({
+        "go": "✅ Positive expectancy — ready for go-live review",
+        "no": "❌ Negative expectancy — tune strategy before going live",
+        "wait": "⏳ Marginal results — collect more data",
+    }[verdict(stats)])
 
     return "\n".join(lines)
 
@@ -343,12 +551,20 @@ if __name__ == "__main__":
         if stats["total_resolved"] > 0:
             print_stats(stats)
         if milestone:
-            # Print milestone message — cron delivery picks this up
+            # Already queued to the notification outbox; printed for the run log
             print("\n" + milestone_telegram_message(stats))
         elif resolved_count == 0:
             sys.exit(0)  # Nothing resolved — stay silent
+    elif "--mark" in sys.argv:
+        mark = mark_to_market()
+        print(f"📈 Paper ledger marked to market ({mark['timestamp'][:16].replace('T', ' ')} UTC)")
+        for line in _mark_lines(mark):
+            print(line)
     elif "--stats" in sys.argv:
         print_stats()
+    elif "--analytics" in sys.argv:
+        from kalshi_analytics import fear_greed_history, print_report
+        print_report(_load_trades(), fear_greed=fear_greed_history())
     else:
-        print("Usage: kalshi_paper_tracker.py [--resolve | --stats]")
+        print("Usage: kalshi_paper_tracker.py [--resolve | --mark | --stats | --analytics]")
         sys.exit(1)
@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+"""
+Kept-alive HTTP(S) connections for the Kalshi client
+
+urllib opens a new TCP connection — and for HTTPS a new TLS handshake — for
+every request. urlopen() here has the same contract (a readable response, or
+urllib.error.HTTPError for 4xx/5xx) but checks a connection out of a small
+per-host pool and returns it afterwards, so a warm process pays one round
+trip per request instead of three or four.
+
+  idle      connections unused for IDLE_SECONDS are closed rather than reused
+            (servers drop idle keep-alives; 30s is well inside the usual 60s)
+  stale     if a reused connection turns out to have been closed by the
+            server, the request is sent once more on a fresh connection
+  size      at most MAX_IDLE idle connections are kept per host
+
+Responses are read in full before the connection goes back to the pool.
+kalshi.py uses this when KEEPALIVE is on (the resident agent turns it on);
+cassette recording / replay always goes through urllib.
+"""
+
+import io
+import time
+import threading
+import http.client
+import urllib.error
+from urllib.parse import urlsplit
+
+# === CONFIG ===
+IDLE_SECONDS = 30
+MAX_IDLE = 8
+
+_lock = threading.Lock()
+_idle = {}   # (scheme, netloc) -> [(connection, last_used)]
+_counts = {"opened": 0, "reused": 0, "stale": 0}
+
+# a kept-alive connection the server already closed fails like this
+_STALE_ERRORS = (http.client.RemoteDisconnected, ConnectionResetError, BrokenPipeError)
+
+
+class _Response(io.BytesIO):
+    """Fully read response body with the bits of urllib's response the client uses"""
+
+    def __init__(self, body, status, headers):
+        super().__init__(body)
+        self.status = status
+        self.headers = headers
+
+
+def _checkout(key, timeout):
+    now = time.monotonic()
+    with _lock:
+        idle = _idle.get(key, [])
+        while idle:
+            conn, used = idle.pop()
+            if now - used < IDLE_SECONDS:
+                _counts["reused"] += 1
+                if conn.sock is not None:
+                    conn.sock.settimeout(timeout)
+                return conn, True
+            conn.close()
+        _counts["opened"] += 1
+    cls = http.client.HTTPSConnection if key[0] == "https" else http.client.HTTPConnection
+    return cls(key[1], timeout=timeout), False
+
+
+def _checkin(key, conn):
+    with _lock:
+        idle = _idle.setdefault(key, [])
+        if len(idle) < MAX_IDLE:
+            idle.append((conn, time.monotonic()))
+            return
+    conn.close()
+
+
+def urlopen(req, timeout=30):
+    """Send a urllib.request.Request on a pooled connection"""
+    url = urlsplit(req.full_url)
+    key = (url.scheme, url.netloc)
+    path = url.path + (f"?{url.query}" if url.query else "")
+    headers = dict(req.header_items())
+
+    for attempt in (1, 2):
+        conn, reused = _checkout(key, timeout)
+        try:
+            conn.request(req.get_method(), path, body=req.data, headers=headers)
+            response = conn.getresponse()
+            body = response.read()
+        except _STALE_ERRORS:
+            conn.close()
+            if reused and attempt == 1:
+                with _lock:
+                    _counts["stale"] += 1
+                continue
+            raise
+        except BaseException:
+            conn.close()
+            raise
+        if response.will_close:
+            conn.close()
+        else:
+            _checkin(key, conn)
+        if response.status >= 400:
+            raise urllib.error.HTTPError(req.full_url, response.status, response.reason,
+                                         response.headers, io.BytesIO(body))
+        return _Response(body, response.status, response.headers)
+
+
+def stats():
+    """{"opened", "reused", "stale", "idle"} since the process started (or reset())"""
+    with _lock:
+        return {**_counts, "idle": sum(len(v) for v in _idle.values())}
+
+
+def reset():
+    """Close every idle connection and zero the counters"""
+    with _lock:
+        for idle in _idle.values():
+            for conn, _ in idle:
+                conn.close()
+        _idle.clear()
+        _counts.update(dict.fromkeys(_counts, 0))
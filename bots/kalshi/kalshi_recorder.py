@@ -0,0 +1,396 @@
+#!/usr/bin/env python3
+"""
+KXBTCD market snapshot recorder
+
+Snapshots every open KXBTCD market (bids, asks, volume, open interest) on a
+fixed cadence, optionally with the order books of the markets nearest the
+money, so backtests have real Kalshi history to replay.
+
+Storage: one file per UTC day, memory/kalshi-snapshots/KXBTCD-YYYY-MM-DD.kss
+(env KALSHI_SNAPSHOT_DIR), made of independent chunks of up to
+CHUNK_SNAPSHOTS snapshots:
+
+  frame   = start_ms:int64  end_ms:int64  length:uint32  zlib(payload)
+  payload = header_len:uint32  header JSON  ts column  value columns
+
+Each column is snapshot-major (n snapshots x k tickers) and delta-encoded
+along time per ticker, so a quote that did not change is a run of zero
+bytes and compresses to almost nothing. The frame's start/end are stored
+uncompressed, so a reader skips chunks outside its time range without
+inflating them, and decodes only the tickers it was asked for.
+A writer that opens a day file first cuts off a torn final frame left by a
+crash, so later chunks stay readable; SIGTERM flushes the buffer like Ctrl-C.
+
+Usage:
+  python kalshi_recorder.py [--cadence 1] [--books 10] [--duration SECONDS]
+  python kalshi_recorder.py --read [--since ISO] [--until ISO] [--ticker T ...]   NDJSON to stdout
+  python kalshi_recorder.py --info
+"""
+
+import os
+import sys
+import json
+import time
+import zlib
+import signal
+import struct
+import threading
+import datetime
+from array import array
+from concurrent.futures import ThreadPoolExecutor
+from itertools import accumulate
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+# === CONFIG ===
+SNAPSHOT_DIR = Path(os.environ.get(
+    "KALSHI_SNAPSHOT_DIR",
+    str(Path(__file__).parent.parent / "memory" / "kalshi-snapshots"),
+))
+SERIES = "KXBTCD"
+CHUNK_SNAPSHOTS = 60      # one chunk per minute at a 1s cadence
+BOOK_DEPTH = 10           # price levels kept per side when recording books
+BOOK_WORKERS = 5
+COMPRESS_LEVEL = 6
+
+QUOTE_FIELDS = ("yes_bid", "yes_ask", "no_bid", "no_ask", "volume", "open_interest")
+
+_FRAME = struct.Struct("<qqI")
+_HEADER_LEN = struct.Struct("<I")
+
+
+# === ENCODING ===
+def _book_columns(depth):
+    return tuple(f"{side}_{kind}{i}" for side in ("yes", "no") for i in range(depth) for kind in ("p", "q"))
+
+
+def _flatten_book(book, depth):
+    """Top `depth` bid levels per side (best first) as a flat tuple, zero padded"""
+    out = []
+    for side in ("yes", "no"):
+        levels = sorted((book or {}).get(side) or [], key=lambda lvl: lvl[0], reverse=True)[:depth]
+        for price, qty in levels:
+            out += (price, qty)
+        out += (0, 0) * (depth - len(levels))
+    return tuple(out)
+
+
+def _unflatten_book(values, depth):
+    book = {}
+    for s, side in enumerate(("yes", "no")):
+        base = s * depth * 2
+        book[side] = [[values[base + 2 * i], values[base + 2 * i + 1]]
+                      for i in range(depth) if values[base + 2 * i + 1]]
+    return book
+
+
+def encode_chunk(snapshots, depth=0):
+    """
+    snapshots: [(ts_ms, {ticker: values_tuple})] in time order, values laid out
+    as QUOTE_FIELDS followed by the flattened book (if depth). Returns a frame.
+    """
+    tickers = sorted({t for _, rows in snapshots for t in rows})
+    columns = ("present",) + QUOTE_FIELDS + (_book_columns(depth) if depth else ())
+    width = len(columns) - 1
+    n, k = len(snapshots), len(tickers)
+    blank = (0,) * width
+
+    ts = array("q", (s[0] for s in snapshots))
+    prev_ts = ts[0]
+    for i in range(1, n):
+        ts[i], prev_ts = ts[i] - prev_ts, ts[i]
+
+    cols = [array("i", bytes(4 * n * k)) for _ in columns]
+    prev = [(0,) + blank] * k
+    for s, (_, rows) in enumerate(snapshots):
+        base = s * k
+        for j, ticker in enumerate(tickers):
+            values = rows.get(ticker)
+            current = (1,) + values if values is not None else (0,) + blank
+            last = prev[j]
+            if current != last:
+                for c in range(width + 1):
+                    if current[c] != last[c]:
+                        cols[c][base + j] = current[c] - last[c]
+                prev[j] = current
+
+    header = json.dumps({"n": n, "tickers": tickers, "columns": columns, "depth": depth}).encode()
+    payload = b"".join([_HEADER_LEN.pack(len(header)), header, ts.tobytes()] + [c.tobytes() for c in cols])
+    body = zlib.compress(payload, COMPRESS_LEVEL)
+    return _FRAME.pack(snapshots[0][0], snapshots[-1][0], len(body)) + body
+
+
+def decode_chunk(body, tickers=None):
+    """Yield rows {"ts", "ticker", <quote fields>, ["book"]} from one chunk payload"""
+    payload = zlib.decompress(body)
+    (header_len,) = _HEADER_LEN.unpack_from(payload)
+    offset = _HEADER_LEN.size + header_len
+    header = json.loads(payload[_HEADER_LEN.size:offset])
+    n, names, depth = header["n"], header["tickers"], header["depth"]
+    k = len(names)
+
+    ts = array("q")
+    ts.frombytes(payload[offset:offset + 8 * n])
+    offset += 8 * n
+    for i in range(1, n):
+        ts[i] += ts[i - 1]
+
+    cols = []
+    for _ in header["columns"]:
+        col = array("i")
+        col.frombytes(payload[offset:offset + 4 * n * k])
+        offset += 4 * n * k
+        cols.append(col)
+
+    # Undo the time deltas per wanted ticker: its column slice is strided by k
+    wanted = [j for j, name in enumerate(names) if tickers is None or name in tickers]
+    series = {j: [list(accumulate(col[j::k])) for col in cols] for j in wanted}
+    quotes = len(QUOTE_FIELDS)
+    for s in range(n):
+        for j in wanted:
+            present, *values = [c[s] for c in series[j]]
+            if not present:
+                continue
+            row = {"ts": ts[s] / 1000, "ticker": names[j]}
+            row.update(zip(QUOTE_FIELDS, values[:quotes]))
+            if depth:
+                row["book"] = _unflatten_book(values[quotes:], depth)
+            yield row
+
+
+# === WRITER ===
+def _day(ts_ms):
+    return datetime.datetime.fromtimestamp(ts_ms / 1000, datetime.timezone.utc).strftime("%Y-%m-%d")
+
+
+def day_path(day, directory=None):
+    return Path(directory or SNAPSHOT_DIR) / f"{SERIES}-{day}.kss"
+
+
+class SnapshotWriter:
+    """Buffers snapshots and appends a compressed chunk every CHUNK_SNAPSHOTS, rolling files daily"""
+
+    def __init__(self, directory=None, depth=0, chunk_snapshots=CHUNK_SNAPSHOTS):
+        self.directory = Path(directory or SNAPSHOT_DIR)
+        self.depth = depth
+        self.chunk_snapshots = chunk_snapshots
+        self.buffer = []
+        self.day = None
+        self.bytes_written = 0
+        self.chunks_written = 0
+        self._opened = set()   # day files checked for a torn tail
+
+    def add(self, ts_ms, markets, books=None):
+        """Record one snapshot. markets: Market records or API dicts; books: {ticker: orderbook}."""
+        day = _day(ts_ms)
+        if self.day is not None and day != self.day:
+            self.flush()
+        self.day = day
+
+        rows = {}
+        for m in markets:
+            if isinstance(m, dict):
+                ticker, values = m["ticker"], tuple(m.get(f) or 0 for f in QUOTE_FIELDS)
+            else:
+                ticker, values = m.ticker, tuple(getattr(m, f) or 0 for f in QUOTE_FIELDS)
+            if self.depth:
+                values += _flatten_book((books or {}).get(ticker), self.depth)
+            rows[ticker] = values
+        self.buffer.append((ts_ms, rows))
+        if len(self.buffer) >= self.chunk_snapshots:
+            self.flush()
+
+    def flush(self):
+        if not self.buffer:
+            return
+        frame = encode_chunk(self.buffer, self.depth)
+        path = day_path(self.day, self.directory)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        if path not in self._opened:
+            truncate_torn_tail(path)  # a crash mid-append must not corrupt what we add after it
+            self._opened.add(path)
+        with open(path, "ab") as f:
+            f.write(frame)
+        self.bytes_written += len(frame)
+        self.chunks_written += 1
+        self.buffer = []
+
+    close = flush
+
+
+def _whole_frames_end(path):
+    """Offset just past the last complete, readable frame in `path`"""
+    end = last_start = 0
+    size = path.stat().st_size
+    with open(path, "rb") as f:
+        while True:
+            frame = f.read(_FRAME.size)
+            if len(frame) < _FRAME.size:
+                break
+            first, last, length = _FRAME.unpack(frame)
+            if first > last or end + _FRAME.size + length > size:
+                break
+            f.seek(length, os.SEEK_CUR)
+            last_start, end = end, end + _FRAME.size + length
+        if end:  # a torn header can still describe a length that fits: check the last body inflates
+            f.seek(last_start + _FRAME.size)
+            try:
+                zlib.decompress(f.read(end - last_start - _FRAME.size))
+            except zlib.error:
+                return last_start
+    return end
+
+
+def truncate_torn_tail(path):
+    """Cut a partially written final frame off `path` (left by a crash). Returns the bytes dropped."""
+    if not path.exists():
+        return 0
+    end = _whole_frames_end(path)
+    dropped = path.stat().st_size - end
+    if dropped:
+        print(f"⚠️  {path.name}: dropping {dropped} bytes of torn chunk at offset {end}")
+        with open(path, "r+b") as f:
+            f.truncate(end)
+    return dropped
+
+
+# === READER ===
+def iter_chunks(path, start_ms=None, end_ms=None):
+    """Yield (start_ms, end_ms, body) for chunks overlapping the range; stops at a torn final frame"""
+    with open(path, "rb") as f:
+        while True:
+            frame = f.read(_FRAME.size)
+            if len(frame) < _FRAME.size:
+                return
+            first, last, length = _FRAME.unpack(frame)
+            if (start_ms is not None and last < start_ms) or (end_ms is not None and first > end_ms):
+                f.seek(length, os.SEEK_CUR)
+                continue
+            body = f.read(length)
+            if len(body) < length:
+                return
+            yield first, last, body
+
+
+def read_snapshots(start=None, end=None, tickers=None, directory=None):
+    """
+    Stream rows back in time order. start/end are unix seconds (inclusive),
+    tickers an optional collection to keep.
+    """
+    directory = Path(directory or SNAPSHOT_DIR)
+    start_ms = None if start is None else int(start * 1000)
+    end_ms = None if end is None else int(end * 1000)
+    tickers = set(tickers) if tickers else None
+    first_day = _day(start_ms) if start_ms is not None else ""
+    last_day = _day(end_ms) if end_ms is not None else "9999"
+
+    for path in sorted(directory.glob(f"{SERIES}-*.kss")):
+        day = path.stem[len(SERIES) + 1:]
+        if not first_day <= day <= last_day:
+            continue
+        for _, _, body in iter_chunks(path, start_ms, end_ms):
+            for row in decode_chunk(body, tickers):
+                ts_ms = row["ts"] * 1000
+                if (start_ms is None or ts_ms >= start_ms) and (end_ms is None or ts_ms <= end_ms):
+                    yield row
+
+
+# === RECORDER ===
+def _nearest_the_money(markets, count):
+    """Tickers whose YES ask is closest to 50¢"""
+    ranked = sorted(markets, key=lambda m: abs((m.yes_ask or 100) - 50))
+    return [m.ticker for m in ranked[:count]]
+
+
+def record(cadence=1.0, books=0, duration=None, writer=None):
+    """Snapshot on a fixed cadence until `duration` seconds pass (or Ctrl-C / SIGTERM)"""
+    from kalshi_btc_monitor import get_btc_markets, get_orderbook
+
+    writer = writer or SnapshotWriter(depth=BOOK_DEPTH if books else 0)
+    pool = ThreadPoolExecutor(max_workers=BOOK_WORKERS) if books else None
+    started = next_tick = time.monotonic()
+    snapshots = skipped = 0
+    if threading.current_thread() is threading.main_thread():
+        # a service stop flushes the buffered chunk like Ctrl-C does
+        signal.signal(signal.SIGTERM, signal.default_int_handler)
+    print(f"⏺️  Recording {SERIES} every {cadence:g}s{f' with {books} books' if books else ''} → {writer.directory}")
+    try:
+        while duration is None or time.monotonic() - started < duration:
+            ts_ms = int(time.time() * 1000)
+            markets = get_btc_markets()
+            book_map = None
+            if pool and markets:
+                tickers = _nearest_the_money(markets, books)
+                book_map = dict(zip(tickers, pool.map(get_orderbook, tickers)))
+            if markets:
+                writer.add(ts_ms, markets, book_map)
+                snapshots += 1
+
+            next_tick += cadence
+            delay = next_tick - time.monotonic()
+            if delay < 0:
+                # Fell behind: drop the missed ticks rather than bunching up
+                missed = int(-delay // cadence) + 1
+                skipped += missed
+                next_tick += missed * cadence
+                delay = next_tick - time.monotonic()
+            time.sleep(max(0.0, delay))
+    except KeyboardInterrupt:
+        pass
+    finally:
+        writer.close()
+        if pool:
+            pool.shutdown()
+    print(f"⏹️  {snapshots} snapshots, {skipped} skipped ticks, "
+          f"{writer.chunks_written} chunks, {writer.bytes_written / 1024:,.1f} KB")
+    return snapshots, skipped
+
+
+def print_info(directory=None):
+    directory = Path(directory or SNAPSHOT_DIR)
+    for path in sorted(directory.glob(f"{SERIES}-*.kss")):
+        chunks = snapshots = 0
+        for _, _, body in iter_chunks(path):
+            payload = zlib.decompress(body)
+            (header_len,) = _HEADER_LEN.unpack_from(payload)
+            snapshots += json.loads(payload[_HEADER_LEN.size:_HEADER_LEN.size + header_len])["n"]
+            chunks += 1
+        size = path.stat().st_size
+        print(f"  {path.name}  {chunks:>5} chunks  {snapshots:>7} snapshots  "
+              f"{size / 1024:>9,.1f} KB  ({size / max(1, snapshots):,.0f} B/snapshot)")
+
+
+# === CLI ===
+def _arg(flag, default=None):
+    if flag in sys.argv:
+        i = sys.argv.index(flag)
+        if i + 1 < len(sys.argv):
+            return sys.argv[i + 1]
+    return default
+
+
+def _ts_arg(flag):
+    value = _arg(flag)
+    if value is None:
+        return None
+    return datetime.datetime.fromisoformat(value.replace("Z", "+00:00")).timestamp()
+
+
+if __name__ == "__main__":
+    if "--read" in sys.argv:
+        tickers = [sys.argv[i + 1] for i, a in enumerate(sys.argv[:-1]) if a == "--ticker"]
+        try:
+            for row in read_snapshots(_ts_arg("--since"), _ts_arg("--until"), tickers or None):
+                sys.stdout.write(json.dumps(row) + "\n")
+        except BrokenPipeError:
+            pass
+    elif "--info" in sys.argv:
+        print_info()
+    else:
+        duration = _arg("--duration")
+        record(
+            cadence=float(_arg("--cadence", 1.0)),
+            books=int(_arg("--books", 0)),
+            duration=float(duration) if duration else None,
+        )
@@ -0,0 +1,167 @@
+#!/usr/bin/env python3
+"""
+Typed records for markets, recommendations and paper trades
+
+Prices are integer cents and strikes floats, parsed once when a record is
+built from the API or the ledger. Display strings ("27¢", "$78,499.99") are
+produced only at the print/log boundary via display() / the fmt_* helpers,
+never parsed back.
+"""
+
+import datetime
+from dataclasses import dataclass, fields
+
+# score_signals' five signals, in display order
+SIGNAL_NAMES = ("1_24h_momentum", "2_1h_momentum", "3_range_position", "4_fear_greed", "5_volume")
+
+# Position sizing in dollars: the monitor sizes trades with these and the
+# risk model simulates the same sizing
+MIN_BET = 100
+MAX_BET = 300
+
+
+# === FORMATTING ===
+def fmt_cents(cents):
+    return f"{cents}¢"
+
+
+def fmt_usd(amount):
+    return f"${amount:,.2f}"
+
+
+def parse_strike(value):
+    """Strike as a float from a number, a "$78,499.99" string or a KXBTCD ticker (…-T78499.99)"""
+    if value is None or isinstance(value, (int, float)):
+        return value
+    try:
+        if "-T" in value:
+            return float(value.split("-T")[1])
+        return float(value.replace("$", "").replace(",", ""))
+    except (IndexError, ValueError):
+        return None
+
+
+def parse_ts(iso_str):
+    """ISO-8601 timestamp -> unix seconds, or None if missing/unparseable"""
+    try:
+        return datetime.datetime.fromisoformat(iso_str.replace("Z", "+00:00")).timestamp()
+    except (AttributeError, ValueError):
+        return None
+
+
+# === MARKET ===
+@dataclass(slots=True)
+class Market:
+    """One open market as returned by /markets"""
+    ticker: str
+    strike: float = None
+    close_time: str = None
+    close_ts: float = None
+    status: str = ""
+    yes_bid: int = 0
+    yes_ask: int = 0
+    no_bid: int = 0
+    no_ask: int = 0
+    volume: int = 0
+    open_interest: int = 0
+
+    @classmethod
+    def from_api(cls, m):
+        close_time = m.get("close_time")
+        return cls(
+            ticker=m["ticker"],
+            strike=parse_strike(m["ticker"]),
+            close_time=close_time,
+            close_ts=parse_ts(close_time),
+            status=m.get("status") or "",
+            yes_bid=m.get("yes_bid") or 0,
+            yes_ask=m.get("yes_ask") or 0,
+            no_bid=m.get("no_bid") or 0,
+            no_ask=m.get("no_ask") or 0,
+            volume=m.get("volume") or 0,
+            open_interest=m.get("open_interest") or 0,
+        )
+
+
+# === RECOMMENDATION ===
+@dataclass(slots=True)
+class Recommendation:
+    """A candidate entry. `fill` is the order-book fill from select_market, if priced."""
+    action: str              # "BUY YES" / "BUY NO"
+    ticker: str
+    strike: float
+    btc_price: float
+    distance_pct: float
+    cost_cents: int          # quoted ask, or the rounded book-fill average
+    settlement_time: str = None
+    fill: dict = None
+    thesis: str = ""
+
+    @property
+    def side(self):
+        return "no" if self.action == "BUY NO" else "yes"
+
+    @property
+    def avg_cost(self):
+        return self.fill["avg_cost"] if self.fill else float(self.cost_cents)
+
+    def display(self):
+        """Formatted fields for printing and the markdown trade log"""
+        out = {
+            "action": self.action,
+            "ticker": self.ticker,
+            "strike": fmt_usd(self.strike),
+            "current_price": fmt_usd(self.btc_price),
+            "distance": f"{self.distance_pct:.2f}%",
+            "implied_prob": f"{self.avg_cost:.0f}%",
+            "cost": fmt_cents(self.cost_cents),
+            "potential_profit": fmt_cents(100 - self.cost_cents),
+        }
+        if self.fill:
+            fill = self.fill
+            out["fill"] = f"{fill['contracts']} @ {fill['avg_cost']:.1f}¢ avg (limit {fill['limit_price']}¢)"
+        if self.thesis:
+            out["thesis"] = self.thesis
+        return out
+
+
+# === PAPER TRADE ===
+@dataclass(slots=True)
+class PaperTrade:
+    """One ledger entry — paper trades, and live trades folded from fills"""
+    id: str
+    ticker: str
+    side: str
+    timestamp: str = None
+    action: str = ""
+    strike: float = None
+    entry_cost_cents: int = 0
+    avg_entry_cost_cents: float = 0.0
+    contracts: int = 0
+    fill_model: str = None        # "quote", "book" (walked ladder) or "sim" (matching engine)
+    hypothetical_cost_usd: float = 0.0
+    potential_profit_usd: float = 0.0
+    signal_score: int = None
+    signals: dict = None          # display strings, for the log
+    signal_flags: dict = None     # signal name -> fired (bool), for analytics
+    distance_pct: float = None
+    btc_price_at_entry: float = None
+    btc_change_24h_at_entry: float = None
+    settlement_time: str = None
+    status: str = "open"
+    result_side: str = None
+    realized_pnl: float = None
+    resolved_at: str = None
+
+    @classmethod
+    def from_dict(cls, d):
+        """Build from a ledger row; older rows stored the strike as "$99,000.00"."""
+        trade = cls(**{name: d[name] for name in _PAPER_TRADE_FIELDS if name in d})
+        trade.strike = parse_strike(trade.strike)
+        return trade
+
+    def to_dict(self):
+        return {name: getattr(self, name) for name in _PAPER_TRADE_FIELDS}
+
+
+_PAPER_TRADE_FIELDS = tuple(f.name for f in fields(PaperTrade))
@@ -0,0 +1,167 @@
+#!/usr/bin/env python3
+"""
+Bootstrap confidence intervals and Monte Carlo risk of ruin for a ledger
+
+  confidence intervals  expectancy, win rate and max drawdown, from
+                        RESAMPLES bootstrap resamples of the resolved trades
+  risk of ruin          share of simulated paths of RUIN_HORIZON_TRADES trades,
+                        resampled from the ledger's return per dollar staked
+                        and sized at MIN_BET..MAX_BET, on which a
+                        BANKROLL_USD bankroll falls below MIN_BET
+
+With numpy the resamples are vectorized passes (index matrix -> gather ->
+cumsum / running max) in chunks of CHUNK_ELEMENTS so memory stays flat, and
+the win-rate interval is drawn directly as Binomial(n, p)/n, which is exactly
+its bootstrap distribution. 100k resamples of a few hundred trades take a
+fraction of a second; longer ledgers get fewer resamples (at most
+WORK_BUDGET resampled values) so every resolve stays under a second.
+Without numpy the same estimates use FALLBACK_RESAMPLES in plain Python.
+"""
+
+import os
+import random
+
+try:
+    import numpy as np
+except ImportError:  # optional: pure-Python resampling
+    np = None
+
+from kalshi_records import MAX_BET, MIN_BET
+
+# === CONFIG ===
+RESAMPLES = 100_000
+FALLBACK_RESAMPLES = 2_000
+CONFIDENCE = 0.95
+MIN_TRADES = 5                  # below this the intervals are noise — don't report them
+CHUNK_ELEMENTS = 4_000_000      # resampled values materialized at once
+WORK_BUDGET = 10_000_000        # resampled values per estimate (caps resamples for long ledgers)
+MIN_RESAMPLES = 2_000
+BANKROLL_USD = float(os.environ.get("KALSHI_BANKROLL_USD", "1000"))
+RUIN_HORIZON_TRADES = 100
+
+
+def _series(trades):
+    """(pnl, win, return per dollar staked, stake) lists over resolved trades, in resolution order"""
+    resolved = sorted((t for t in trades if t.status in ("win", "loss")), key=lambda t: t.resolved_at or "")
+    pnl = [t.realized_pnl or 0.0 for t in resolved]
+    win = [t.status == "win" for t in resolved]
+    stake = [min(max(t.hypothetical_cost_usd or MIN_BET, MIN_BET), MAX_BET) for t in resolved]
+    ret = [p / (t.hypothetical_cost_usd or s) for p, t, s in zip(pnl, resolved, stake)]
+    return pnl, win, ret, stake
+
+
+def _interval(values, level):
+    tail = (1 - level) / 2
+    if np is not None:
+        lo, hi = np.quantile(values, [tail, 1 - tail])
+        return float(lo), float(hi)
+    ordered = sorted(values)
+    last = len(ordered) - 1
+    return ordered[int(tail * last)], ordered[int(round((1 - tail) * last))]
+
+
+# === BOOTSTRAP ===
+def resample_count(n):
+    """RESAMPLES, reduced for long ledgers so one estimate stays within WORK_BUDGET"""
+    if np is None:
+        return FALLBACK_RESAMPLES
+    return max(MIN_RESAMPLES, min(RESAMPLES, WORK_BUDGET // max(1, n)))
+
+
+def bootstrap(pnl, win, resamples=None, level=CONFIDENCE, seed=None):
+    """{"expectancy", "win_rate", "max_drawdown"} -> (lo, hi) over bootstrap resamples of the trades"""
+    n = len(pnl)
+    if np is None:
+        return _bootstrap_python(pnl, win, resamples or resample_count(n), level, seed)
+
+    resamples = resamples or resample_count(n)
+    rng = np.random.default_rng(seed)
+    pnl = np.asarray(pnl, dtype=np.float64)
+    expectancy = np.empty(resamples)
+    drawdown = np.empty(resamples)
+    rows = max(1, CHUNK_ELEMENTS // n)
+    for start in range(0, resamples, rows):
+        stop = min(resamples, start + rows)
+        curve = np.cumsum(pnl[rng.integers(0, n, size=(stop - start, n))], axis=1)
+        peak = np.maximum.accumulate(curve, axis=1)
+        np.maximum(peak, 0.0, out=peak)  # the curve starts at 0
+        np.subtract(peak, curve, out=peak)
+        expectancy[start:stop] = curve[:, -1] / n
+        drawdown[start:stop] = peak.max(axis=1)
+    win_rate = rng.binomial(n, sum(win) / n, size=resamples) / n
+    return {
+        "expectancy": _interval(expectancy, level),
+        "win_rate": _interval(win_rate, level),
+        "max_drawdown": _interval(drawdown, level),
+    }
+
+
+def _bootstrap_python(pnl, win, resamples, level, seed):
+    rng = random.Random(seed)
+    n = len(pnl)
+    expectancy, win_rate, drawdown = [], [], []
+    for _ in range(resamples):
+        idx = [rng.randrange(n) for _ in range(n)]
+        cumulative = peak = max_dd = 0.0
+        for i in idx:
+            cumulative += pnl[i]
+            peak = max(peak, cumulative)
+            max_dd = max(max_dd, peak - cumulative)
+        expectancy.append(cumulative / n)
+        win_rate.append(sum(win[i] for i in idx) / n)
+        drawdown.append(max_dd)
+    return {
+        "expectancy": _interval(expectancy, level),
+        "win_rate": _interval(win_rate, level),
+        "max_drawdown": _interval(drawdown, level),
+    }
+
+
+# === RISK OF RUIN ===
+def risk_of_ruin(ret, stake, bankroll=None, horizon=RUIN_HORIZON_TRADES, paths=None, seed=None):
+    """Share of simulated paths whose equity drops below MIN_BET within `horizon` trades"""
+    bankroll = BANKROLL_USD if bankroll is None else bankroll
+    n = len(ret)
+    if np is None:
+        rng = random.Random(seed)
+        paths = paths or FALLBACK_RESAMPLES
+        ruined = 0
+        for _ in range(paths):
+            equity = bankroll
+            for _ in range(horizon):
+                i = rng.randrange(n)
+                equity += ret[i] * stake[i]
+                if equity < MIN_BET:
+                    ruined += 1
+                    break
+        return ruined / paths
+
+    paths = paths or RESAMPLES
+    rng = np.random.default_rng(seed)
+    ret = np.asarray(ret, dtype=np.float64)
+    stake = np.asarray(stake, dtype=np.float64)
+    ruined = 0
+    rows = max(1, CHUNK_ELEMENTS // horizon)
+    for start in range(0, paths, rows):
+        idx = rng.integers(0, n, size=(min(rows, paths - start), horizon))
+        equity = bankroll + np.cumsum(ret[idx] * stake[idx], axis=1)
+        ruined += int((equity < MIN_BET).any(axis=1).sum())
+    return ruined / paths
+
+
+# === SUMMARY ===
+def confidence(trades, resamples=None, seed=None):
+    """Stats-file section: intervals + risk of ruin, or None with fewer than MIN_TRADES resolved"""
+    pnl, win, ret, stake = _series(trades)
+    if len(pnl) < MIN_TRADES:
+        return None
+    intervals = bootstrap(pnl, win, resamples or resample_count(len(pnl)), seed=seed)
+    paths = resamples or resample_count(RUIN_HORIZON_TRADES)
+    out = {"level": CONFIDENCE, "resamples": resamples or resample_count(len(pnl))}
+    for name, (lo, hi) in intervals.items():
+        digits = 4 if name == "win_rate" else 2
+        out[name] = [round(lo, digits), round(hi, digits)]
+    out["risk_of_ruin"] = round(risk_of_ruin(ret, stake, paths=paths, seed=seed), 4)
+    out["bankroll"] = BANKROLL_USD
+    out["horizon"] = RUIN_HORIZON_TRADES
+    return out
@@ -0,0 +1,302 @@
+#!/usr/bin/env python3
+"""
+In-process job scheduler for the Kalshi bots (replaces the separate crons)
+
+Jobs:
+  monitor   run_monitor() — cadence tightens as the nearest market close approaches
+            (MONITOR_CADENCE)
+  resolver  resolve paper trades (main + per-strategy ledgers) — scheduled from the
+            open trades' settlement_time + RESOLVE_DELAY_SECONDS, retried every
+            RESOLVE_RETRY_SECONDS until they settle, RESOLVE_IDLE_SECONDS when nothing is open
+  refresh   refresh the BTC cache and the open-market close times the monitor
+            cadence is planned from
+  mark      mark open paper trades to market every MARK_SECONDS (equity curve)
+
+All jobs run one at a time on this process's single worker, so they never
+overlap, and share one warm API client: the signing key and client modules
+are loaded once at startup instead of on every cold cron start. Every delay
+is jittered by ±JITTER_FRACTION so runs don't line up with other clients.
+A lock file keeps a second scheduler from starting. Job failures are queued
+to the notification outbox, whose sender runs alongside the jobs.
+
+A monitor run in maker mode works its order on that worker for up to
+kalshi_maker.MAX_WORK_SECONDS, so at startup that window is capped below the
+shortest job interval (shortest_interval): other jobs run late by at most
+one window instead of piling up behind it.
+
+Usage:
+  python kalshi_scheduler.py [--jobs monitor,resolver,refresh,mark] [--once]
+"""
+
+import os
+import sys
+import time
+import random
+import signal
+import datetime
+import threading
+import traceback
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent))
+from kalshi_notify import notify
+from kalshi_records import parse_ts
+
+# === CONFIG ===
+LOCK_PATH = Path(os.environ.get(
+    "KALSHI_SCHEDULER_LOCK",
+    str(Path(__file__).parent.parent / "memory" / "kalshi-scheduler.lock"),
+))
+JITTER_FRACTION = 0.1
+
+# (hours until nearest market close, minutes between monitor runs)
+MONITOR_CADENCE = [
+    (2,  5),
+    (4,  10),
+    (8,  20),
+    (float("inf"), 30),
+]
+RESOLVE_DELAY_SECONDS = 10 * 60     # Kalshi settles a few minutes after close
+RESOLVE_RETRY_SECONDS = 15 * 60     # past due but not settled yet
+RESOLVE_IDLE_SECONDS = 6 * 3600     # no open trades
+REFRESH_SECONDS = 4 * 60            # inside the monitor's 5-minute BTC cache TTL, unless a
+                                    # worked maker order holds the worker past it
+MARK_SECONDS = 15 * 60
+PLAN_RETRY_SECONDS = 15 * 60        # a job whose plan failed (e.g. unreadable ledger) tries again
+
+
+# === JOBS ===
+class Job:
+    """A named callable and a function planning its next run: plan(now) -> unix time"""
+
+    __slots__ = ("name", "fn", "plan", "next_run", "runs", "failures", "last_seconds")
+
+    def __init__(self, name, fn, plan):
+        self.name = name
+        self.fn = fn
+        self.plan = plan
+        self.next_run = 0.0
+        self.runs = 0
+        self.failures = 0
+        self.last_seconds = None
+
+
+def jittered(delay, fraction=JITTER_FRACTION, rng=random):
+    return max(0.0, delay * (1 + rng.uniform(-fraction, fraction)))
+
+
+def monitor_interval(next_close_ts, now):
+    """Seconds until the next monitor run, tighter as the nearest close approaches"""
+    hours = float("inf") if next_close_ts is None else (next_close_ts - now) / 3600
+    for max_hours, minutes in MONITOR_CADENCE:
+        if hours <= max_hours:
+            return minutes * 60
+    return MONITOR_CADENCE[-1][1] * 60
+
+
+def shortest_interval(jitter=JITTER_FRACTION):
+    """Shortest gap the scheduler can plan between two runs of one job, after jitter"""
+    return min(REFRESH_SECONDS, MARK_SECONDS, MONITOR_CADENCE[0][1] * 60) * (1 - jitter)
+
+
+def next_resolve_time(trades, now):
+    """When the resolver should next run, from the open trades' settlement times"""
+    settles = [parse_ts(t.settlement_time) for t in trades if t.status == "open"]
+    if not settles:
+        return now + RESOLVE_IDLE_SECONDS
+    due = [ts + RESOLVE_DELAY_SECONDS for ts in settles if ts is not None]
+    if not due or min(due) <= now:  # past due but unsettled (or no settlement time): poll
+        return now + RESOLVE_RETRY_SECONDS
+    return min(due)
+
+
+class Scheduler:
+    """Runs due jobs sequentially on the calling thread; one job at a time, never overlapping"""
+
+    def __init__(self, jobs, clock=time.time, jitter=JITTER_FRACTION):
+        self.jobs = list(jobs)
+        self.clock = clock
+        self.jitter = jitter
+        self.stop_event = threading.Event()
+        now = clock()
+        for job in self.jobs:
+            job.next_run = now  # everything runs once on startup
+
+    def run_pending(self):
+        """Run every job that is due, earliest first. Returns the names run."""
+        ran = []
+        for job in sorted(self.jobs, key=lambda j: j.next_run):
+            if self.stop_event.is_set() or job.next_run > self.clock():
+                continue
+            self._run(job)
+            ran.append(job.name)
+        return ran
+
+    def _run(self, job):
+        started = time.perf_counter()
+        failed = True
+        try:
+            job.fn()
+            failed = False
+        except SystemExit as e:  # run_monitor exits on API errors
+            print(f"⚠️  [{job.name}] exited ({e.code})")
+            notify("error", f"⚠️ Scheduler job {job.name} exited ({e.code})")
+        except Exception as e:
+            print(f"⚠️  [{job.name}] failed:\n{traceback.format_exc()}")
+            notify("error", f"⚠️ Scheduler job {job.name} failed: {type(e).__name__}: {e}")
+        job.runs += 1
+        job.last_seconds = time.perf_counter() - started
+        now = self.clock()
+        try:
+            delay = job.plan(now) - now
+        except Exception as e:  # e.g. the resolver reading a half-written ledger
+            failed = True
+            delay = PLAN_RETRY_SECONDS
+            print(f"⚠️  [{job.name}] planning failed:\n{traceback.format_exc()}")
+            notify("error", f"⚠️ Scheduler job {job.name} planning failed: {type(e).__name__}: {e}")
+        if failed:
+            job.failures += 1
+        job.next_run = now + jittered(max(0.0, delay), self.jitter)
+        at = datetime.datetime.fromtimestamp(job.next_run).strftime("%H:%M:%S")
+        print(f"🗓️  [{job.name}] done in {job.last_seconds:.1f}s — next at {at}")
+
+    def run_forever(self):
+        while not self.stop_event.is_set():
+            self.run_pending()
+            wake = min(job.next_run for job in self.jobs)
+            self.stop_event.wait(max(0.0, min(60.0, wake - self.clock())))
+
+    def stop(self, *_):
+        self.stop_event.set()
+
+
+# === WIRING ===
+class _State:
+    next_close_ts = None   # nearest open-market close, from the refresh job
+
+
+def _strategy_names():
+    import kalshi_strategies
+    if not kalshi_strategies.STRATEGIES_JSON.exists():
+        return []
+    return list(kalshi_strategies.load_strategies())
+
+
+def _all_paper_trades():
+    import kalshi_paper_tracker as tracker
+    trades = tracker._load_trades()
+    for name in _strategy_names():
+        trades += tracker._load_trades(name)
+    return trades
+
+
+def run_resolver():
+    import kalshi_paper_tracker as tracker
+    market_cache = {}
+    _, milestone, stats = tracker.resolve_paper_trades(market_cache=market_cache)
+    if milestone:
+        print("\n" + tracker.milestone_telegram_message(stats))
+    for name in _strategy_names():
+        tracker.resolve_paper_trades(strategy=name, market_cache=market_cache)
+
+
+def run_mark():
+    import kalshi_paper_tracker as tracker
+    market_cache = {}
+    for name in [None] + _strategy_names():
+        if any(t.status == "open" for t in tracker._load_trades(name)):
+            tracker.mark_to_market(name, market_cache)
+
+
+def run_refresh():
+    import kalshi_btc_monitor as monitor
+    monitor.get_btc_data()  # writes the BTC cache on success
+    now = time.time()
+    closes = [m.close_ts for m in monitor.get_btc_markets() if m.close_ts and m.close_ts > now]
+    _State.next_close_ts = min(closes) if closes else None
+
+
+def run_monitor_job():
+    import kalshi_btc_monitor as monitor
+    monitor.run_monitor()
+
+
+def build_jobs(names=("monitor", "resolver", "refresh", "mark")):
+    available = {
+        # refresh first so the monitor's first cadence is planned from real close times
+        "refresh": Job("refresh", run_refresh, lambda now: now + REFRESH_SECONDS),
+        "monitor": Job("monitor", run_monitor_job,
+                       lambda now: now + monitor_interval(_State.next_close_ts, now)),
+        "resolver": Job("resolver", run_resolver,
+                        lambda now: next_resolve_time(_all_paper_trades(), now)),
+        "mark": Job("mark", run_mark, lambda now: now + MARK_SECONDS),
+    }
+    return [job for name, job in available.items() if name in names]
+
+
+def cap_maker_window():
+    """Keep a worked maker order inside the shortest job interval. Returns the window in seconds."""
+    import kalshi_maker as maker
+    limit = int(shortest_interval())
+    if maker.MAX_WORK_SECONDS > limit:
+        print(f"⚠️  Maker window {maker.MAX_WORK_SECONDS}s would block the scheduler — capping at {limit}s")
+        maker.MAX_WORK_SECONDS = limit
+    return maker.MAX_WORK_SECONDS
+
+
+def warm_client():
+    """Load the signing key once for every job in this process"""
+    import kalshi
+    if not kalshi.cassette.replaying():
+        kalshi.load_private_key()
+
+
+def acquire_lock(path=None):
+    """Exclusive lock so only one scheduler runs. Returns the open lock file, or None if taken."""
+    import fcntl
+
+    path = Path(path or LOCK_PATH)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    f = open(path, "a+")
+    try:
+        fcntl.flock(f, fcntl.LOCK_EX | fcntl.LOCK_NB)
+    except BlockingIOError:
+        f.close()
+        return None
+    f.seek(0)
+    f.truncate()
+    f.write(str(os.getpid()))
+    f.flush()
+    return f
+
+
+# === CLI ===
+def _arg(flag, default=None):
+    if flag in sys.argv:
+        i = sys.argv.index(flag)
+        if i + 1 < len(sys.argv):
+            return sys.argv[i + 1]
+    return default
+
+
+if __name__ == "__main__":
+    lock = acquire_lock()
+    if lock is None:
+        print(f"❌ Another scheduler holds {LOCK_PATH}")
+        sys.exit(1)
+
+    warm_client()
+    cap_maker_window()
+    import kalshi_notify
+    kalshi_notify.start()  # also delivers anything left pending by earlier runs
+    scheduler = Scheduler(build_jobs(_arg("--jobs", "monitor,resolver,refresh,mark").split(",")))
+    signal.signal(signal.SIGTERM, scheduler.stop)
+    print(f"🗓️  Scheduler started: {', '.join(job.name for job in scheduler.jobs)}")
+    try:
+        if "--once" in sys.argv:
+            scheduler.run_pending()
+        else:
+            scheduler.run_forever()
+    except KeyboardInterrupt:
+        pass
+    print("🗓️  Scheduler stopped")
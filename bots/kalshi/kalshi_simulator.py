@@ -0,0 +1,392 @@
+#!/usr/bin/env python3
+"""
+Local matching-engine simulator for paper fills and backtests
+
+Paper limit orders are matched against a stream of Kalshi order book
+snapshots (recorded by kalshi_recorder.py, or polled live in daemon mode)
+with price-time priority instead of filling instantly at the quote:
+
+  - an order reaches the book `latency_ms` after it is submitted (cancels too)
+  - on arrival it takes any crossing liquidity (opposite-side bids at
+    >= 100 - limit, best first, at their price) and rests the remainder
+  - a resting order joins the back of its price level: everything already
+    shown there is queued ahead of it
+  - between two snapshots, bids that disappeared at or above a price are
+    inferred as trades — split between the YES and NO sides by depletion and
+    capped by the market's volume change when the snapshot carries one.
+    Trades at a level work through the queue ahead first, then our orders
+    in time order; trades below a level fill it up to the traded size
+  - a level shrinking only moves our queue position up when it falls below
+    the quantity ahead of us (cancels are assumed to come from behind)
+  - opposite-side bids arriving at a price that crosses a resting order
+    fill it at its own price (we are the best bid for them)
+
+Fills are partial wherever the liquidity runs out. The engine is pure
+bookkeeping over dicts, so it processes tens of thousands of book updates
+per second and drives backtests as easily as a live paper session.
+
+Usage:
+  python kalshi_simulator.py --backtest --ticker T --side yes --price 40 --count 100
+                             [--since ISO] [--latency-ms 250]
+"""
+
+import os
+import sys
+import time
+import datetime
+from dataclasses import dataclass, field
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+# === CONFIG ===
+LATENCY_MS = int(os.environ.get("KALSHI_SIM_LATENCY_MS", "250"))
+POLL_INTERVAL_SECONDS = 1.0   # daemon mode book refresh
+
+
+# === ORDERS ===
+@dataclass(slots=True)
+class SimOrder:
+    """A paper limit order to buy `side` at up to `price` cents"""
+    id: str
+    ticker: str
+    side: str
+    price: int
+    count: int
+    submitted_ts: float
+    active_ts: float
+    status: str = "pending"        # pending -> resting -> executed / canceled
+    filled: int = 0
+    cost_cents: int = 0
+    ahead: int = 0                 # contracts queued in front of us at our price
+    cancel_ts: float = None
+    fills: list = field(default_factory=list)   # [(ts, count, price, is_taker)]
+
+    @property
+    def remaining(self):
+        return self.count - self.filled
+
+    @property
+    def avg_cost(self):
+        return self.cost_cents / self.filled if self.filled else 0.0
+
+    def as_fill(self):
+        """The fill dict shape select_market/log_paper_trade use, or None if nothing filled"""
+        if not self.filled:
+            return None
+        return {"contracts": self.filled, "total_cents": self.cost_cents,
+                "avg_cost": self.avg_cost, "limit_price": self.price, "model": "sim"}
+
+
+def _levels(book, side):
+    """{price: qty} for one side of an API/recorder orderbook ({side: [[price, qty], ...]})"""
+    return {int(p): int(q) for p, q in (book or {}).get(side) or [] if q}
+
+
+def _other(side):
+    return "no" if side == "yes" else "yes"
+
+
+# === ENGINE ===
+class MatchingEngine:
+    """Price-time priority matching of paper orders against external book snapshots"""
+
+    def __init__(self, latency_ms=LATENCY_MS):
+        self.latency = latency_ms / 1000
+        self.books = {}       # ticker -> {"yes": {price: qty}, "no": {price: qty}}
+        self.volume = {}      # ticker -> last seen cumulative volume
+        self.orders = {}      # id -> SimOrder (insertion order = time priority)
+        self.working = {}     # ticker -> [SimOrder] pending or resting
+        self.now = 0.0
+        self.updates = 0
+        self._next_id = 0
+
+    # --- order entry ---
+    def submit(self, ts, ticker, side, price, count):
+        """Send an order at ts; it reaches the book latency_ms later"""
+        self._next_id += 1
+        order = SimOrder(id=f"SIM{self._next_id}", ticker=ticker, side=side, price=int(price),
+                         count=int(count), submitted_ts=ts, active_ts=ts + self.latency)
+        self.orders[order.id] = order
+        self.working.setdefault(ticker, []).append(order)
+        if ts >= self.now:
+            self.advance(ts)
+        return order
+
+    def cancel(self, ts, order_id):
+        """Request a cancel at ts; orders can still fill until it lands"""
+        order = self.orders[order_id]
+        if order.status in ("pending", "resting"):
+            order.cancel_ts = ts + self.latency
+        self.advance(ts)
+        return order
+
+    # --- market data ---
+    def on_book(self, ts, ticker, book, volume=None):
+        """Apply one book snapshot for a ticker ({"yes": [[p, q]], "no": [[p, q]]})"""
+        self.advance(ts)
+        self.updates += 1
+        new = {"yes": _levels(book, "yes"), "no": _levels(book, "no")}
+        old = self.books.get(ticker)
+        traded = None
+        if volume is not None:
+            last = self.volume.get(ticker)
+            traded = None if last is None else max(0, volume - last)
+            self.volume[ticker] = volume
+        self.books[ticker] = new
+
+        orders = self.working.get(ticker)
+        if not orders or old is None:
+            return
+        resting = [o for o in orders if o.status == "resting"]
+        if not resting:
+            return
+        for side, trades in _inferred_trades(old, new, traded).items():
+            for price, qty in trades:
+                self._trade(ts, [o for o in resting if o.side == side], price, qty)
+        for o in resting:
+            if o.status == "resting":  # cancels from behind: only a level below our queue moves us up
+                o.ahead = min(o.ahead, new[o.side].get(o.price, 0))
+        self._cross_resting(ts, ticker)
+        self._prune(ticker)
+
+    def on_trade(self, ts, ticker, side, price, count):
+        """An executed print: a seller hit `side` bids down to `price` for `count` contracts"""
+        self.advance(ts)
+        resting = [o for o in self.working.get(ticker, ()) if o.status == "resting" and o.side == side]
+        self._trade(ts, resting, price, count)
+        self._prune(ticker)
+
+    def feed(self, rows):
+        """Drive the engine from kalshi_recorder.read_snapshots rows (which carry "book")"""
+        for row in rows:
+            if "book" in row:
+                self.on_book(row["ts"], row["ticker"], row["book"], row.get("volume"))
+        return self
+
+    # --- clock ---
+    def advance(self, ts):
+        """Move the clock to ts, landing any orders and cancels that arrive on the way"""
+        self.now = max(self.now, ts)
+        for ticker, orders in list(self.working.items()):
+            touched = False
+            for o in orders:
+                if o.status == "pending" and o.active_ts <= ts:
+                    self._arrive(o)
+                    touched = True
+                if o.cancel_ts is not None and o.cancel_ts <= ts and o.status == "resting":
+                    o.status = "canceled"
+                    touched = True
+            if touched:
+                self._prune(ticker)
+
+    # --- matching ---
+    def _arrive(self, o):
+        book = self.books.setdefault(o.ticker, {"yes": {}, "no": {}})
+        if o.cancel_ts is not None and o.cancel_ts <= o.active_ts:
+            o.status = "canceled"
+            return
+        opposite = book[_other(o.side)]
+        for level in sorted(opposite, reverse=True):
+            cost = 100 - level
+            if cost > o.price or not o.remaining:
+                break
+            take = min(opposite[level], o.remaining)
+            opposite[level] -= take  # our paper fill consumes it until the next snapshot
+            if not opposite[level]:
+                del opposite[level]
+            self._fill(o, o.active_ts, take, cost, True)
+        if o.remaining:
+            o.status = "resting"
+            o.ahead = book[o.side].get(o.price, 0)
+
+    def _trade(self, ts, resting, price, qty):
+        """
+        qty contracts sold into bids down to `price`: better levels trade first,
+        and within a level the queue ahead, then our orders by time
+        """
+        levels = {}
+        for o in resting:
+            if o.status == "resting" and o.price >= price:
+                levels.setdefault(o.price, []).append(o)
+        for level in sorted(levels, reverse=True):
+            if qty <= 0:
+                break
+            reached, before = 0, 0  # how far into this level's queue the trade got
+            for o in levels[level]:
+                position = o.ahead + before
+                before += o.remaining
+                reached = max(reached, position + o.remaining)
+                take = min(o.remaining, max(0, qty - position))
+                o.ahead = max(0, o.ahead - qty)
+                if take:
+                    self._fill(o, ts, take, o.price, False)
+            qty -= min(qty, reached)
+
+    def _cross_resting(self, ts, ticker):
+        """New opposite bids at or above 100 - our price trade with our resting bids first"""
+        opposite_by_side = self.books[ticker]
+        for o in sorted((o for o in self.working[ticker] if o.status == "resting"),
+                        key=lambda o: -o.price):
+            opposite = opposite_by_side[_other(o.side)]
+            for level in sorted(opposite, reverse=True):
+                if 100 - level > o.price or not o.remaining:
+                    break
+                take = min(opposite[level], o.remaining)
+                opposite[level] -= take
+                if not opposite[level]:
+                    del opposite[level]
+                self._fill(o, ts, take, o.price, False)
+
+    def _fill(self, o, ts, count, price, is_taker):
+        if count <= 0:
+            return
+        o.filled += count
+        o.cost_cents += count * price
+        o.fills.append((ts, count, price, is_taker))
+        if not o.remaining:
+            o.status = "executed"
+
+    def _prune(self, ticker):
+        orders = self.working.get(ticker)
+        if orders is not None and any(o.status in ("executed", "canceled") for o in orders):
+            orders = [o for o in orders if o.status in ("pending", "resting")]
+            if orders:
+                self.working[ticker] = orders
+            else:
+                del self.working[ticker]
+
+    def close(self, ts=None):
+        """Cancel everything still working (end of the fill window / backtest)"""
+        self.advance(self.now if ts is None else ts)
+        for orders in self.working.values():
+            for o in orders:
+                o.status = "canceled"
+        self.working = {}
+
+
+def _inferred_trades(old, new, traded=None):
+    """
+    {side: [(price, qty)]} trades implied by bids that vanished between two
+    snapshots, best price first. `traded` (the volume change) caps the total,
+    split between the sides in proportion to their depletion.
+    """
+    depleted = {}
+    for side in ("yes", "no"):
+        before, after = old[side], new[side]
+        levels = []
+        for price in sorted(before, reverse=True):
+            gone = before[price] - after.get(price, 0)
+            if gone > 0:
+                levels.append((price, gone))
+        depleted[side] = levels
+    total = sum(q for levels in depleted.values() for _, q in levels)
+    if not total:
+        return {}
+    out = {}
+    for side, levels in depleted.items():
+        budget = sum(q for _, q in levels)
+        if traded is not None:
+            budget = traded * budget // total
+        trades = []
+        for price, gone in levels:
+            if budget <= 0:
+                break
+            take = min(gone, budget)
+            trades.append((price, take))
+            budget -= take
+        if trades:
+            out[side] = trades
+    return out
+
+
+# === PAPER FILLS (daemon mode) ===
+def simulate_paper_fill(recommendation, contracts, seconds, latency_ms=LATENCY_MS,
+                        poll_interval=POLL_INTERVAL_SECONDS):
+    """
+    Work a paper limit order for a Recommendation against the live book for
+    `seconds`, like the live order's fill window. Returns the fill dict
+    ({"contracts", "total_cents", "avg_cost", "limit_price"}) or None.
+    """
+    from kalshi import make_request as kalshi_request
+    from kalshi_btc_monitor import get_orderbook
+
+    ticker = recommendation.ticker
+    limit = recommendation.fill["limit_price"] if recommendation.fill else recommendation.cost_cents
+
+    def volume():
+        market = kalshi_request("GET", f"/trade-api/v2/markets/{ticker}")
+        return (market.get("market") or {}).get("volume") if "error" not in market else None
+
+    engine = MatchingEngine(latency_ms)
+    book = get_orderbook(ticker)
+    if book is None:
+        return None
+    started = time.time()
+    engine.on_book(started, ticker, book, volume())
+    order = engine.submit(started, ticker, recommendation.side, limit, contracts)
+    deadline = started + seconds
+    while order.status in ("pending", "resting") and time.time() < deadline:
+        time.sleep(min(poll_interval, max(0.0, deadline - time.time())))
+        book = get_orderbook(ticker)
+        if book is not None:
+            engine.on_book(time.time(), ticker, book, volume())
+    engine.close(time.time())
+    return order.as_fill()
+
+
+# === BACKTEST ===
+def backtest_order(ticker, side, price, count, start=None, end=None, latency_ms=LATENCY_MS, directory=None):
+    """Submit one order at the first recorded book at/after `start` and replay until `end`"""
+    from kalshi_recorder import read_snapshots
+
+    engine = MatchingEngine(latency_ms)
+    order = None
+    for row in read_snapshots(start, end, [ticker], directory):
+        if "book" not in row:
+            continue
+        engine.on_book(row["ts"], ticker, row["book"], row.get("volume"))
+        if order is None:
+            order = engine.submit(row["ts"], ticker, side, price, count)
+        elif order.status not in ("pending", "resting"):
+            break
+    engine.close()
+    return order, engine
+
+
+# === CLI ===
+def _arg(flag, default=None):
+    if flag in sys.argv:
+        i = sys.argv.index(flag)
+        if i + 1 < len(sys.argv):
+            return sys.argv[i + 1]
+    return default
+
+
+def _ts_arg(flag):
+    value = _arg(flag)
+    if value is None:
+        return None
+    return datetime.datetime.fromisoformat(value.replace("Z", "+00:00")).timestamp()
+
+
+if __name__ == "__main__":
+    if "--backtest" not in sys.argv or not _arg("--ticker"):
+        print("Usage: kalshi_simulator.py --backtest --ticker T --side yes|no --price CENTS --count N "
+              "[--since ISO] [--until ISO] [--latency-ms MS]")
+        sys.exit(1)
+    started = time.perf_counter()
+    order, engine = backtest_order(
+        _arg("--ticker"), _arg("--side", "yes"), int(_arg("--price", "50")), int(_arg("--count", "100")),
+        _ts_arg("--since"), _ts_arg("--until"), int(_arg("--latency-ms", str(LATENCY_MS))),
+    )
+    elapsed = time.perf_counter() - started
+    if order is None:
+        print("No recorded books for that ticker/range (record with kalshi_recorder.py --books N)")
+        sys.exit(1)
+    print(f"🧮 {order.side.upper()} {order.ticker} @ {order.price}¢ × {order.count}: "
+          f"{order.filled} filled{f' @ {order.avg_cost:.1f}¢ avg' if order.filled else ''} ({order.status})")
+    for ts, count, price, is_taker in order.fills:
+        when = datetime.datetime.fromtimestamp(ts, datetime.timezone.utc).strftime("%H:%M:%S")
+        print(f"   {when}  {count:>5} @ {price}¢  {'taker' if is_taker else 'maker'}")
+    print(f"({engine.updates} book updates in {elapsed:.2f}s)")
@@ -0,0 +1,151 @@
+#!/usr/bin/env python3
+"""
+Multi-strategy paper runner
+
+Runs several named strategy configs side by side over ONE data fetch per
+cycle: BTC price, Fear & Greed and the KXBTCD market list are fetched once
+(concurrently) and every strategy scores and selects against that snapshot.
+Order books are fetched once per ticker and shared, so an extra strategy
+costs CPU only, plus any book no other strategy already priced. Each
+strategy logs paper trades into its own ledger
+(memory/kalshi-paper-trades-<name>.json).
+
+Config: memory/kalshi-strategies.json (env KALSHI_STRATEGIES) maps a name to
+overrides of the monitor's thresholds (see kalshi_btc_monitor.strategy_config):
+
+  {
+    "baseline": {},
+    "strict":   {"min_signal_score": 4},
+    "cheap":    {"max_entry_cost": 25, "min_fill_fraction": 0.8}
+  }
+
+Usage:
+  python kalshi_strategies.py            Run one cycle for every strategy
+  python kalshi_strategies.py --resolve  Resolve every strategy's open paper trades
+  python kalshi_strategies.py --stats    Compare strategies side by side
+"""
+
+import os
+import sys
+import json
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent))
+import kalshi_btc_monitor as monitor
+import kalshi_paper_tracker as tracker
+
+# === CONFIG ===
+STRATEGIES_JSON = Path(os.environ.get(
+    "KALSHI_STRATEGIES",
+    str(Path(__file__).parent.parent / "memory" / "kalshi-strategies.json"),
+))
+DEFAULT_STRATEGIES = {"baseline": {}}
+
+
+def load_strategies(path=None):
+    """{name: cfg} with each config's overrides applied to the monitor defaults"""
+    path = Path(path or STRATEGIES_JSON)
+    overrides = json.loads(path.read_text()) if path.exists() else DEFAULT_STRATEGIES
+    return {name: monitor.strategy_config(**(o or {})) for name, o in overrides.items()}
+
+
+# === SHARED FETCH ===
+def fetch_snapshot():
+    """Fetch everything the strategies read, once and concurrently"""
+    with ThreadPoolExecutor(max_workers=3) as pool:
+        btc = pool.submit(monitor.get_btc_data)
+        fear_greed = pool.submit(monitor.get_fear_greed)
+        markets = pool.submit(monitor.get_btc_markets)
+        return {"btc": btc.result(), "fear_greed": fear_greed.result(), "markets": markets.result()}
+
+
+# === EVALUATION ===
+def evaluate(name, cfg, snapshot, book_cache):
+    """
+    Run one strategy against a snapshot: gate, score, select, and log a paper
+    trade to its ledger. Returns {"strategy", "score", "trade_id", "reason"}.
+    """
+    btc, markets = snapshot["btc"], snapshot["markets"]
+    result = {"strategy": name, "score": None, "trade_id": None, "reason": ""}
+    if not btc:
+        result["reason"] = "BTC data unavailable"
+        return result
+    if abs(btc["change_24h"]) < cfg["min_24h_momentum"]:
+        result["reason"] = f"24h momentum below ±{cfg['min_24h_momentum']}%"
+        return result
+
+    bullish = btc["change_24h"] > 0
+    score, breakdown, fired = monitor.score_signals(btc, snapshot["fear_greed"], bullish, cfg)
+    result["score"] = score
+    if score < cfg["min_signal_score"]:
+        result["reason"] = f"score {score} < {cfg['min_signal_score']}"
+        return result
+    if not markets:
+        result["reason"] = "no open KXBTCD markets"
+        return result
+
+    recommendation = monitor.select_market(markets, btc["price"], bullish, cfg, book_cache)
+    if not recommendation:
+        result["reason"] = "no market met distance/cost/depth filters"
+        return result
+
+    recommendation.thesis = monitor.thesis(btc, bullish, score, len(breakdown), recommendation.strike)
+    result["trade_id"] = tracker.log_paper_trade(
+        recommendation, score, breakdown, btc, strategy=name, signal_flags=fired)
+    result["reason"] = f"{recommendation.action} {recommendation.ticker} @ {recommendation.cost_cents}¢"
+    return result
+
+
+def run_cycle(strategies=None, snapshot=None):
+    """Fetch once, evaluate every strategy. Returns the per-strategy results."""
+    strategies = strategies or load_strategies()
+    started = time.perf_counter()
+    snapshot = snapshot or fetch_snapshot()
+    fetched = time.perf_counter()
+
+    book_cache = {}
+    results = [evaluate(name, cfg, snapshot, book_cache) for name, cfg in strategies.items()]
+    done = time.perf_counter()
+
+    print(f"\n🧪 {len(results)} strategies — fetch {(fetched - started)*1000:.0f}ms, "
+          f"evaluate {(done - fetched)*1000:.0f}ms, {len(book_cache)} order book(s)")
+    for r in results:
+        emoji = "📝" if r["trade_id"] else "😴"
+        score = "-" if r["score"] is None else r["score"]
+        print(f"   {emoji} {r['strategy']:<16} score {score}  {r['reason']}")
+
+    monitor.log_trade("STRATEGY CYCLE", {
+        r["strategy"]: f"{r['trade_id'] or 'NO TRADE'} — {r['reason']}" for r in results
+    })
+    return results
+
+
+# === RESOLVE / STATS ===
+def resolve_all(strategies=None):
+    """Resolve every strategy's ledger, sharing one market lookup per ticker"""
+    strategies = strategies or load_strategies()
+    market_cache = {}
+    for name in strategies:
+        print(f"\n[{name}]")
+        tracker.resolve_paper_trades(strategy=name, market_cache=market_cache)
+
+
+def print_comparison(strategies=None):
+    strategies = strategies or load_strategies()
+    print(f"\n{'strategy':<16}{'resolved':>9}{'open':>6}{'win %':>7}{'P&L':>10}{'exp/trade':>11}{'max DD':>9}")
+    for name in strategies:
+        s = tracker._compute_stats(tracker._load_trades(name))
+        print(f"{name:<16}{s['total_resolved']:>9}{s['open_trades']:>6}{s['win_rate']:>7.0%}"
+              f"{s['total_pnl']:>+10.2f}{s['expectancy']:>+11.2f}{s['max_drawdown']:>9.2f}")
+
+
+# === CLI ===
+if __name__ == "__main__":
+    if "--resolve" in sys.argv:
+        resolve_all()
+    elif "--stats" in sys.argv:
+        print_comparison()
+    else:
+        run_cycle()
@@ -0,0 +1,133 @@
+#!/usr/bin/env python3
+"""
+Stage-level tracing for monitor runs
+
+  tracer = start(profile=False)
+  with span("btc_fetch"):
+      ...
+  stop()
+
+Each span records wall and CPU time. With profile=True each span also runs
+under cProfile and takes tracemalloc snapshots on entry/exit, and
+write_report() dumps per-stage hot functions and allocation growth — enough
+to tell network waits (wall >> cpu) from JSON parsing or key handling (cpu).
+
+span() outside a started tracer is a no-op, so library code can be wrapped
+unconditionally.
+"""
+
+import io
+import time
+import datetime
+import cProfile
+import pstats
+import tracemalloc
+from contextlib import contextmanager
+from pathlib import Path
+
+REPORT_TOP_FUNCTIONS = 15
+REPORT_TOP_ALLOCATIONS = 10
+
+_current = None
+
+
+def _snapshot():
+    """tracemalloc snapshot without the tracer's own bookkeeping"""
+    return tracemalloc.take_snapshot().filter_traces((
+        tracemalloc.Filter(False, tracemalloc.__file__),
+        tracemalloc.Filter(False, __file__),
+        tracemalloc.Filter(False, "*/contextlib.py"),
+    ))
+
+
+class Tracer:
+    """Collects spans for one run"""
+
+    def __init__(self, profile=False):
+        self.profile = profile
+        self.spans = []       # [{"name", "wall_ms", "cpu_ms"}], in completion order
+        self._profiles = {}   # name -> pstats text
+        self._allocations = {}  # name -> [tracemalloc StatisticDiff]
+        self.started_at = datetime.datetime.now()
+
+    @contextmanager
+    def span(self, name):
+        profiler = before = None
+        if self.profile:
+            before = _snapshot()
+            profiler = cProfile.Profile()
+            profiler.enable()
+        wall0, cpu0 = time.perf_counter(), time.process_time()
+        try:
+            yield
+        finally:
+            wall = time.perf_counter() - wall0
+            cpu = time.process_time() - cpu0
+            record = {"name": name, "wall_ms": round(wall * 1000, 1), "cpu_ms": round(cpu * 1000, 1)}
+            if profiler:
+                profiler.disable()
+                after = _snapshot()
+                diff = after.compare_to(before, "lineno")
+                record["alloc_kb"] = round(sum(d.size_diff for d in diff) / 1024, 1)
+                out = io.StringIO()
+                pstats.Stats(profiler, stream=out).sort_stats("cumulative").print_stats(REPORT_TOP_FUNCTIONS)
+                self._profiles[name] = out.getvalue()
+                self._allocations[name] = diff[:REPORT_TOP_ALLOCATIONS]
+            self.spans.append(record)
+
+    def summary(self):
+        """One-line per-stage timing summary, for log entries"""
+        return " · ".join(f"{s['name']} {s['wall_ms']:.0f}ms/{s['cpu_ms']:.0f}ms cpu" for s in self.spans)
+
+    def write_report(self, directory):
+        """Write the per-stage profile report. Returns the report path."""
+        directory = Path(directory)
+        directory.mkdir(parents=True, exist_ok=True)
+        path = directory / f"kalshi-profile-{self.started_at.strftime('%Y%m%d-%H%M%S')}.txt"
+        lines = [f"Monitor profile — {self.started_at.strftime('%Y-%m-%d %H:%M:%S PST')}", ""]
+        lines.append(f"{'stage':<16}{'wall ms':>10}{'cpu ms':>10}{'alloc KB':>10}")
+        for s in self.spans:
+            lines.append(f"{s['name']:<16}{s['wall_ms']:>10.1f}{s['cpu_ms']:>10.1f}{s.get('alloc_kb', 0):>10.1f}")
+        for s in self.spans:
+            name = s["name"]
+            lines += ["", "=" * 72, f"STAGE {name}", "=" * 72]
+            if name in self._allocations:
+                lines.append("Top allocation growth:")
+                lines += [f"  {d}" for d in self._allocations[name]]
+            if name in self._profiles:
+                lines += ["", self._profiles[name]]
+        path.write_text("\n".join(lines) + "\n")
+        return path
+
+
+def start(profile=False):
+    """Start a tracer for this run and make it current"""
+    global _current
+    if profile and not tracemalloc.is_tracing():
+        tracemalloc.start()
+    _current = Tracer(profile=profile)
+    return _current
+
+
+def stop():
+    """Detach the current tracer. Returns it."""
+    global _current
+    tracer, _current = _current, None
+    if tracer and tracer.profile and tracemalloc.is_tracing():
+        tracemalloc.stop()
+    return tracer
+
+
+@contextmanager
+def span(name):
+    """Time a stage on the current tracer (no-op if none is running)"""
+    if _current is None:
+        yield
+        return
+    with _current.span(name):
+        yield
+
+
+def current_summary():
+    """Timing summary of the current tracer so far, or "" if none is running"""
+    return _current.summary() if _current else ""
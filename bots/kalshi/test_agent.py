@@ -0,0 +1,79 @@
+import io
+import json
+import os
+import socket
+import sys
+import tempfile
+import threading
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+
+os.environ.setdefault("KALSHI_API_KEY_ID", "test-key")
+sys.path.insert(0, str(Path(__file__).parent))
+
+import kalshi  # noqa: E402
+import kalshi_agent as agent  # noqa: E402
+import kalshi_cache as cache  # noqa: E402
+import kalshi_fake_exchange as fake  # noqa: E402
+import kalshi_pool as pool  # noqa: E402
+
+
+class AgentTest(unittest.TestCase):
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.socket_path = Path(tmp.name) / "agent.sock"
+        self.server, self.base_url, self.exchange = fake.patch_client(
+            self, fake.FakeExchange(markets=5), AGENT_SOCKET=self.socket_path, KEEPALIVE=True, JSON_OUTPUT=False)
+        pool.reset()
+        cache.reset()
+        self.addCleanup(pool.reset)
+        self.addCleanup(cache.reset)
+        self.tickers = list(self.exchange.markets)
+
+    def start_agent(self):
+        server = agent.make_server(self.socket_path)
+        threading.Thread(target=server.serve_forever, kwargs={"poll_interval": 0.05}, daemon=True).start()
+        self.addCleanup(server.server_close)
+        self.addCleanup(server.shutdown)
+        self.assertEqual(self.socket_path.stat().st_mode & 0o777, 0o600)
+
+    def forward(self, *argv, stdin=None):
+        out = io.StringIO()
+        return kalshi.forward(list(argv), stdin=stdin, out=out), out.getvalue()
+
+    def test_forwarded_commands_match_in_process_and_reuse_one_connection(self):
+        self.start_agent()
+        code, out = self.forward("market", "--json", self.tickers[0], "-", stdin="\n".join(self.tickers[1:]))
+        self.assertEqual(code, 0)
+        self.assertEqual(sorted(json.loads(line)["ticker"] for line in out.splitlines()), sorted(self.tickers))
+
+        code, out = self.forward("balance")
+        self.assertEqual(code, 0)
+        self.assertIn(f"${self.exchange.balance / 100:,.2f}", out)
+        self.assertEqual(self.forward("buy", self.tickers[0], "maybe", "1", "50")[0], 1)
+
+        stats = agent.ping(self.socket_path)
+        self.assertEqual(stats["commands"], 3)
+        self.assertEqual(stats["pool"]["opened"], 1)
+        self.assertGreaterEqual(stats["pool"]["reused"], 1)
+
+    def test_runs_in_process_without_a_live_agent_on_this_base_url(self):
+        self.assertIsNone(self.forward("balance")[0])  # no socket file
+
+        stale = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        stale.bind(str(self.socket_path))
+        stale.close()  # file left behind by an agent that died
+        self.assertIsNone(self.forward("balance")[0])
+
+        self.start_agent()
+        requests = self.exchange.requests
+        with patch.object(kalshi, "BASE_URL", "https://demo-api.kalshi.co"):
+            self.assertIsNone(self.forward("balance")[0])
+        self.assertEqual(self.exchange.requests, requests)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,69 @@
+import os
+import sys
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+
+os.environ.setdefault("KALSHI_API_KEY_ID", "test-key")
+sys.path.insert(0, str(Path(__file__).parent))
+
+import kalshi_analytics as analytics  # noqa: E402
+from kalshi_records import SIGNAL_NAMES, PaperTrade  # noqa: E402
+
+
+def trade(i, status, pnl, score, distance, hours, fired):
+    return PaperTrade(
+        id=str(i), ticker="T", side="no", status=status, realized_pnl=pnl, signal_score=score,
+        distance_pct=distance, timestamp="2026-02-03T10:00:00+00:00",
+        settlement_time=f"2026-02-03T{10 + hours:02d}:00:00+00:00",
+        signal_flags={name: name in fired for name in SIGNAL_NAMES},
+    )
+
+
+TRADES = [
+    trade(1, "win", 50.0, 4, 1.5, 3, {"1_24h_momentum", "5_volume"}),
+    trade(2, "loss", -100.0, 4, 2.5, 3, {"1_24h_momentum"}),
+    trade(3, "win", 30.0, 3, 2.5, 6, {"5_volume"}),
+    trade(4, "open", None, 5, 2.5, 6, set(SIGNAL_NAMES)),
+    # Written before signal_flags/distance_pct existed
+    PaperTrade.from_dict({
+        "id": "5", "ticker": "T", "side": "no", "status": "loss", "realized_pnl": -20.0, "signal_score": 3,
+        "strike": "$99,000.00", "btc_price_at_entry": 95_000.0,
+        "signals": {"1_24h_momentum": "✅ -1.20% (strong)", "5_volume": "❌ $20.0B (low)"},
+    }),
+]
+
+
+class AttributionTest(unittest.TestCase):
+    def check(self, report):
+        by = {section: {r[0]: r[1:] for r in rows} for section, rows in report.items()}
+        self.assertEqual(by["signal score"]["4/5"], (2, 0.5, -50.0, -25.0))
+        self.assertEqual(by["signal score"]["3/5"][:1], (2,))
+        self.assertEqual(by["signals"]["24h momentum ✅"], (3, 1 / 3, -70.0, -23.33))
+        self.assertEqual(by["signals"]["volume ✅"][:3], (2, 1.0, 80.0))
+        self.assertEqual(by["distance"]["2-3%"][:1], (2,))
+        self.assertEqual(by["distance"]["3-5%"][:1], (1,))  # legacy row: 4.2% from strike/price
+        self.assertEqual(by["time to settlement"]["2-4h"][:1], (2,))
+        self.assertEqual(by["time to settlement"]["4-8h"][:1], (1,))
+
+    def test_attribution(self):
+        self.check(analytics.attribution(TRADES))
+
+    def test_pure_python_fallback_matches(self):
+        with patch.object(analytics, "np", None):
+            self.check(analytics.attribution(TRADES))
+
+    def test_fear_greed_at_entry_from_history(self):
+        day = 1_770_076_800  # 2026-02-03 00:00 UTC
+        series = [(day - 86400, 80, "Extreme Greed"), (day, 50, "Neutral")]
+        for backend in (analytics.np, None):
+            with patch.object(analytics, "np", backend):
+                rows = {r[0]: r[1:] for r in analytics.attribution(TRADES, series)["fear & greed"]}
+                self.assertEqual(rows["47-55"], (3, 2 / 3, -20.0, -6.67))  # the legacy row has no timestamp
+                self.assertEqual(rows["76+"][0], 0)
+        self.assertNotIn("fear & greed", analytics.attribution(TRADES))
+
+
+if __name__ == "__main__":
+    unittest.main()
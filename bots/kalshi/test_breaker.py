@@ -0,0 +1,91 @@
+import os
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+
+os.environ.setdefault("KALSHI_API_KEY_ID", "test-key")
+sys.path.insert(0, str(Path(__file__).parent))
+
+import kalshi  # noqa: E402
+import kalshi_breaker as breaker  # noqa: E402
+import kalshi_fake_exchange as fake  # noqa: E402
+
+HOST = "api.coingecko.com"
+
+
+class BreakerStateTest(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        patcher = patch.object(breaker, "STATE_PATH", Path(self.tmp.name) / "breakers.json")
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.addCleanup(self.tmp.cleanup)
+
+    def test_opens_after_consecutive_failures_and_half_opens_with_one_probe(self):
+        self.assertFalse(breaker.record_failure(HOST, now=0))
+        breaker.record_success(HOST)  # an answer resets the count
+        for _ in range(breaker.FAILURE_THRESHOLD - 1):
+            self.assertFalse(breaker.record_failure(HOST, now=0))
+        self.assertTrue(breaker.record_failure(HOST, now=0))
+
+        self.assertFalse(breaker.allow(HOST, now=breaker.COOLDOWN_SECONDS - 1))
+        self.assertTrue(breaker.allow(HOST, now=breaker.COOLDOWN_SECONDS))   # the probe
+        self.assertFalse(breaker.allow(HOST, now=breaker.COOLDOWN_SECONDS))  # everyone else waits
+        self.assertEqual(breaker.state(HOST), "half_open")
+
+        # failed probe: open again for twice as long
+        self.assertTrue(breaker.record_failure(HOST, now=100))
+        self.assertFalse(breaker.allow(HOST, now=100 + breaker.COOLDOWN_SECONDS))
+        self.assertTrue(breaker.allow(HOST, now=100 + 2 * breaker.COOLDOWN_SECONDS))
+
+        breaker.record_success(HOST)
+        self.assertEqual(breaker.state(HOST), "closed")
+        self.assertEqual(breaker.quality_note(), "")
+
+    def test_client_errors_count_as_answers(self):
+        breaker.record_failure(HOST, now=0)
+        self.assertFalse(breaker.record_http_error(HOST, 429))
+        self.assertEqual(breaker.snapshot(), {})
+        for _ in range(breaker.FAILURE_THRESHOLD):
+            tripped = breaker.record_http_error(HOST, 503, now=0)
+        self.assertTrue(tripped)
+        self.assertIn(f"{HOST} open", breaker.quality_note())
+
+    def test_lost_probe_is_offered_again_after_its_lease(self):
+        for _ in range(breaker.FAILURE_THRESHOLD):
+            breaker.record_failure(HOST, now=0)
+        probe_at = breaker.COOLDOWN_SECONDS
+        self.assertTrue(breaker.allow(HOST, now=probe_at))
+        self.assertFalse(breaker.allow(HOST, now=probe_at + breaker.PROBE_LEASE_SECONDS - 1))
+        self.assertTrue(breaker.allow(HOST, now=probe_at + breaker.PROBE_LEASE_SECONDS))
+
+
+class ClientBreakerTest(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        patcher = patch.object(breaker, "STATE_PATH", Path(self.tmp.name) / "breakers.json")
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        # every request fails with a 5xx before it is handled
+        _, _, self.exchange = fake.patch_client(self, fake.FakeExchange(markets=1, rate_5xx=1.0))
+
+    @patch("kalshi.cassette.sleep", return_value=None)
+    def test_dead_api_fails_fast_once_the_breaker_opens(self, _sleep):
+        first = kalshi.make_request("GET", "/trade-api/v2/portfolio/balance")
+        self.assertIn("HTTP 50", first["error"])
+        self.assertEqual(self.exchange.requests, kalshi.MAX_RETRIES)
+
+        second = kalshi.make_request("GET", "/trade-api/v2/portfolio/balance")
+        self.assertIn("circuit open", second["error"])
+        meta = {}
+        self.assertEqual(list(kalshi.iter_request("/trade-api/v2/markets", "markets", meta=meta)), [])
+        self.assertIn("circuit open", meta["error"])
+        self.assertEqual(self.exchange.requests, kalshi.MAX_RETRIES)
+
+
+if __name__ == "__main__":
+    unittest.main()
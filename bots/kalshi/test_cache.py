@@ -0,0 +1,93 @@
+import os
+import sys
+import threading
+import time
+import unittest
+from pathlib import Path
+
+
+os.environ.setdefault("KALSHI_API_KEY_ID", "test-key")
+sys.path.insert(0, str(Path(__file__).parent))
+
+import kalshi  # noqa: E402
+import kalshi_cache as cache  # noqa: E402
+import kalshi_execution as execution  # noqa: E402
+import kalshi_fake_exchange as fake  # noqa: E402
+
+BALANCE = "/trade-api/v2/portfolio/balance"
+POSITIONS = "/trade-api/v2/portfolio/positions"
+
+
+class SingleFlightTest(unittest.TestCase):
+    def setUp(self):
+        cache.reset()
+        self.addCleanup(cache.reset)
+
+    def test_concurrent_identical_gets_share_one_fetch(self):
+        release, calls = threading.Event(), []
+
+        def fetch():
+            calls.append(1)
+            release.wait(5)
+            return {"orderbook": {"yes": [[40, 10]]}}
+
+        key = ("http://x", "/trade-api/v2/markets/T1/orderbook")
+        results = []
+        threads = [threading.Thread(target=lambda: results.append(cache.get(key, fetch))) for _ in range(8)]
+        for t in threads:
+            t.start()
+        while cache.stats().get("/trade-api/v2/markets/{ticker}/orderbook", {}).get("coalesced", 0) < 7:
+            time.sleep(0.001)  # until every follower has joined the flight
+        release.set()
+        for t in threads:
+            t.join()
+
+        self.assertEqual(len(calls), 1)
+        self.assertEqual(results, [{"orderbook": {"yes": [[40, 10]]}}] * 8)
+        # order books are coalesced, never cached
+        cache.get(key, fetch)
+        self.assertEqual(len(calls), 2)
+
+    def test_read_in_flight_across_a_write_is_not_cached(self):
+        key = ("http://x", BALANCE)
+
+        def fetch():
+            cache.invalidate_after_write("/trade-api/v2/portfolio/orders")  # our order lands mid-read
+            return {"balance": 100}
+
+        cache.get(key, fetch)
+        self.assertEqual(cache.get(key, lambda: {"balance": 90}), {"balance": 90})
+        self.assertEqual(cache.get(key, lambda: {"balance": 80}), {"balance": 90})
+
+
+class ClientCacheTest(unittest.TestCase):
+    def setUp(self):
+        cache.reset()
+        self.addCleanup(cache.reset)
+        self.server, self.base_url, self.exchange = fake.patch_client(self, fake.FakeExchange(markets=5))
+
+    def test_portfolio_reads_are_cached_until_our_order_invalidates_them(self):
+        before = self.exchange.requests
+        balance = kalshi.make_request("GET", BALANCE)
+        self.assertEqual(kalshi.make_request("GET", BALANCE), balance)
+        self.assertEqual(kalshi.make_request("GET", POSITIONS)["market_positions"], [])
+        kalshi.make_request("GET", POSITIONS)
+        self.assertEqual(self.exchange.requests - before, 2)
+
+        ticker = next(iter(self.exchange.markets))
+        book = kalshi.make_request("GET", f"/trade-api/v2/markets/{ticker}/orderbook")["orderbook"]
+        best_no_bid, qty = book["no"][-1]
+        execution.submit_orders([execution.build_order(ticker, "yes", qty, 100 - best_no_bid)])
+
+        positions = kalshi.make_request("GET", POSITIONS)["market_positions"]
+        self.assertEqual([(p["ticker"], p["position"]) for p in positions], [(ticker, qty)])
+        self.assertLess(kalshi.make_request("GET", BALANCE)["balance"], balance["balance"])
+
+        stats = cache.stats()
+        self.assertEqual(stats[BALANCE]["hit"], 1)
+        self.assertEqual(stats[BALANCE]["invalidated"], 1)
+        self.assertEqual(stats[POSITIONS]["miss"], 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,86 @@
+import gzip
+import json
+import os
+import sys
+import tempfile
+import unittest
+import urllib.request
+from pathlib import Path
+from unittest.mock import patch
+
+
+os.environ.setdefault("KALSHI_API_KEY_ID", "test-key")
+sys.path.insert(0, str(Path(__file__).parent))
+
+import kalshi  # noqa: E402
+import kalshi_cassette as cassette  # noqa: E402
+import kalshi_fake_exchange as fake  # noqa: E402
+
+
+class CassetteTest(unittest.TestCase):
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.path = Path(tmp.name) / "session.jsonl.gz"
+        self.server, _, self.exchange = fake.patch_client(self, fake.FakeExchange(markets=5, rate_429=0.3))
+        patcher = patch.object(cassette, "CASSETTE_PATH", str(self.path))
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def session(self):
+        ticker = next(iter(self.exchange.markets))
+        return [
+            kalshi.make_request("GET", "/trade-api/v2/portfolio/balance"),
+            kalshi.make_request("GET", f"/trade-api/v2/markets/{ticker}/orderbook"),
+            kalshi.make_request("POST", "/trade-api/v2/portfolio/orders",
+                                {"ticker": ticker, "action": "buy", "side": "no", "type": "limit",
+                                 "count": 1, "no_price": 1}),
+            kalshi.make_request("GET", "/trade-api/v2/portfolio/orders?status=resting"),
+        ]
+
+    @patch("kalshi.time.sleep", return_value=None)
+    def test_replay_reproduces_recorded_session_offline(self, _sleep):
+        with patch.object(cassette, "MODE", "record"):
+            recorded = self.session()
+        requests = self.exchange.requests
+
+        with patch.object(cassette, "MODE", "replay"), patch.object(cassette, "_replay", None), \
+                patch.object(kalshi, "load_private_key", side_effect=AssertionError("key loaded")):
+            replayed = self.session()
+
+        self.assertEqual(replayed, recorded)
+        self.assertEqual(self.exchange.requests, requests)  # nothing reached the exchange
+        self.assertTrue(all("error" not in r for r in recorded))
+
+    def test_signatures_are_redacted(self):
+        with patch.object(cassette, "MODE", "record"), patch.object(self.exchange, "rate_429", 0):
+            kalshi.make_request("GET", "/trade-api/v2/portfolio/balance")
+
+        [entry] = cassette.load(self.path)
+        headers = {k.lower(): v for k, v in entry["request_headers"].items()}
+        self.assertEqual(headers["kalshi-access-signature"], cassette.REDACTED)
+        self.assertEqual(headers["kalshi-access-key"], cassette.REDACTED)
+        self.assertNotIn(fake.FAKE_SIGNATURE, gzip.decompress(self.path.read_bytes()).decode())
+        self.assertEqual(cassette.redact_url("https://x/api?x_cg_demo_api_key=abc&ids=bitcoin"),
+                         f"https://x/api?x_cg_demo_api_key={cassette.REDACTED}&ids=bitcoin")
+
+    def test_realtime_replay_keeps_the_recorded_timeline(self):
+        def entry(path, offset, elapsed):
+            return {"offset": offset, "elapsed": elapsed, "method": "GET", "url": f"http://x{path}",
+                    "body": None, "status": 200, "headers": {}, "response": "{}"}
+
+        lines = [entry("/a", 0.0, 0.5), entry("/b", 2.0, 0.5)]
+        self.path.write_bytes(gzip.compress("".join(json.dumps(e) + "\n" for e in lines).encode()))
+        now = cassette.time.monotonic()
+        with patch.object(cassette, "MODE", "replay"), patch.object(cassette, "REALTIME", True), \
+                patch.object(cassette, "_replay", None), patch.object(cassette, "_started", now - 1.0), \
+                patch("kalshi_cassette.time.sleep") as sleep:
+            cassette.urlopen(urllib.request.Request("http://x/a"))  # due at 0.5s: already late
+            self.assertFalse(sleep.called)
+            cassette.urlopen(urllib.request.Request("http://x/b"))  # due at 2.5s: ~1.5s away
+        [(delay,), _] = sleep.call_args
+        self.assertAlmostEqual(delay, 1.5, delta=0.25)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,66 @@
+import io
+import json
+import os
+import sys
+import unittest
+from contextlib import redirect_stdout
+from pathlib import Path
+from unittest.mock import patch
+
+
+os.environ.setdefault("KALSHI_API_KEY_ID", "test-key")
+sys.path.insert(0, str(Path(__file__).parent))
+
+import kalshi  # noqa: E402
+import kalshi_fake_exchange as fake  # noqa: E402
+
+
+class CliTest(unittest.TestCase):
+    def setUp(self):
+        self.server, _, self.exchange = fake.patch_client(self, fake.FakeExchange(markets=45), JSON_OUTPUT=False)
+        self.tickers = list(self.exchange.markets)
+
+    def run_cli(self, *args, stdin=""):
+        out = io.StringIO()
+        with patch.object(sys, "argv", ["kalshi.py", *args]), patch.object(sys, "stdin", io.StringIO(stdin)), \
+                redirect_stdout(out):
+            try:
+                kalshi.main()
+                code = 0
+            except SystemExit as e:
+                code = e.code or 0
+        return code, out.getvalue()
+
+    def test_market_watchlist_from_args_and_stdin_as_ndjson(self):
+        stdin = "\n".join(self.tickers[2:]) + "\n# watchlist end\n"
+        requests = self.exchange.requests
+        code, out = self.run_cli("market", "--json", self.tickers[0], self.tickers[1], "-", "KXNOPE", stdin=stdin)
+
+        records = [json.loads(line) for line in out.splitlines()]
+        self.assertEqual(code, 1)  # one ticker doesn't exist
+        self.assertEqual(records.count({"ticker": "KXNOPE", "error": "market not found"}), 1)
+        self.assertEqual(sorted(r["ticker"] for r in records if "error" not in r), sorted(self.tickers))
+        # 46 tickers in batches of MARKET_BATCH, not one request each
+        self.assertEqual(self.exchange.requests - requests, -(-46 // kalshi.MARKET_BATCH))
+
+    def test_every_command_has_json_output(self):
+        code, out = self.run_cli("--json", "balance")
+        self.assertEqual((code, json.loads(out)["balance"]), (0, self.exchange.balance))
+        code, out = self.run_cli("buy", self.tickers[0], "yes", "2", "99", "--json")
+        self.assertEqual((code, json.loads(out)["ticker"]), (0, self.tickers[0]))
+        for cmd in ("positions", "orders", "events"):
+            code, out = self.run_cli(cmd, "--json")
+            self.assertEqual(code, 0)
+            for line in out.splitlines():
+                self.assertIsInstance(json.loads(line), dict)
+        code, out = self.run_cli("buy", self.tickers[0], "maybe", "2", "50", "--json")
+        self.assertEqual((code, json.loads(out)), (1, {"error": "Side must be 'yes' or 'no'"}))
+
+    def test_text_output_is_unchanged_for_one_market(self):
+        code, out = self.run_cli("market", self.tickers[0])
+        self.assertEqual(code, 0)
+        self.assertIn(f"Ticker: {self.tickers[0]}", out)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,48 @@
+import io
+import json
+import os
+import sys
+import unittest
+from pathlib import Path
+
+
+os.environ.setdefault("KALSHI_API_KEY_ID", "test-key")
+sys.path.insert(0, str(Path(__file__).parent))
+
+import kalshi_codec as codec  # noqa: E402
+
+
+def stream(payload):
+    return io.BytesIO(json.dumps(payload, indent=1).encode())
+
+
+class CodecTest(unittest.TestCase):
+    def test_roundtrip(self):
+        obj = {"ticker": "KXBTCD-26FEB0317-T78499.99", "count": 3, "note": "é"}
+        self.assertEqual(codec.loads(codec.dumps(obj)), obj)
+
+    def test_streams_list_across_tiny_chunks(self):
+        markets = [{"ticker": f"T{i}", "yes_bid": i, "volume": 123456789 + i, "rules": "x" * 40,
+                    "title": "Bitcoin ≥ $95k?", "extra": None} for i in range(25)]
+        meta = {}
+        for chunk_size in (1, 3, 7, 4096):
+            meta = {}
+            items = list(codec.iter_items(stream({"markets": markets, "cursor": "abc"}),
+                                          "markets", ("ticker", "volume", "extra"), meta, chunk_size))
+            self.assertEqual(items, [{"ticker": m["ticker"], "volume": m["volume"], "extra": None} for m in markets])
+            self.assertEqual(meta["cursor"], "abc")
+        self.assertEqual(meta["_bytes"], len(json.dumps({"markets": markets, "cursor": "abc"}, indent=1).encode()))
+
+    def test_meta_before_list_and_empty_list(self):
+        meta = {}
+        self.assertEqual(list(codec.iter_items(stream({"cursor": None, "markets": []}), "markets", meta=meta)), [])
+        self.assertEqual(meta["cursor"], None)
+        self.assertEqual(list(codec.iter_items(io.BytesIO(b"{}"), "markets")), [])
+
+    def test_malformed_body_raises(self):
+        with self.assertRaises(ValueError):
+            list(codec.iter_items(io.BytesIO(b'{"markets": [{"a": 1} {"a": 2}]}'), "markets"))
+
+
+if __name__ == "__main__":
+    unittest.main()
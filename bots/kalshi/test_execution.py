@@ -0,0 +1,126 @@
+import os
+import sys
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+from urllib.parse import parse_qsl, urlsplit
+
+
+os.environ.setdefault("KALSHI_API_KEY_ID", "test-key")
+sys.path.insert(0, str(Path(__file__).parent))
+
+import kalshi_execution as execution  # noqa: E402
+
+
+class FakeExchange:
+    """In-memory stand-in for the order endpoints make_request talks to"""
+
+    def __init__(self):
+        self.orders = {}
+        self.calls = []
+        self.listed = []  # ticker filter of each resting-orders listing
+
+    def fill(self, order_id, count):
+        order = self.orders[order_id]
+        order["fill_count"] += count
+        order["remaining_count"] -= count
+        if order["remaining_count"] == 0:
+            order["status"] = "executed"
+
+    def __call__(self, method, path, data=None):
+        self.calls.append((method, path.split("?")[0]))
+        base, query = execution.ORDERS_PATH, dict(parse_qsl(urlsplit(path).query))
+        if method == "POST" and path == f"{base}/batched":
+            out = []
+            for req in data["orders"]:
+                if req["count"] <= 0:
+                    out.append({"order": None, "error": {"code": "invalid_order"}})
+                    continue
+                order_id = f"ord-{len(self.orders) + 1}"
+                self.orders[order_id] = {
+                    **req, "order_id": order_id, "status": "resting",
+                    "initial_count": req["count"], "remaining_count": req["count"], "fill_count": 0,
+                }
+                out.append({"order": dict(self.orders[order_id]), "error": None})
+            return {"orders": out}
+        if method == "GET" and path.startswith(f"{base}?status=resting"):
+            self.listed.append(query.get("ticker"))
+            return {"orders": [dict(o) for o in self.orders.values() if o["status"] == "resting"
+                               and query.get("ticker", o["ticker"]) == o["ticker"]], "cursor": ""}
+        order_id = path[len(base) + 1:].split("/")[0]
+        order = self.orders[order_id]
+        if method == "GET":
+            return {"order": dict(order)}
+        if method == "DELETE":
+            order["status"] = "canceled"
+            order["remaining_count"] = 0
+            return {"order": dict(order)}
+        if method == "POST" and path.endswith("/amend"):
+            order["yes_price" if order["side"] == "yes" else "no_price"] = data.get("yes_price") or data.get("no_price")
+            return {"old_order": dict(order), "order": dict(order)}
+        return {"error": f"HTTP 404: {method} {path}"}
+
+
+class ExecutionTest(unittest.TestCase):
+    def setUp(self):
+        self.exchange = FakeExchange()
+        patcher = patch.object(execution, "kalshi_request", self.exchange)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_batch_submit_is_one_round_trip_with_per_order_errors(self):
+        orders = execution.submit_orders([
+            execution.build_order("T1", "yes", 10, 30),
+            execution.build_order("T2", "no", 0, 30),
+            execution.build_order("T3", "no", 5, 25),
+        ])
+        self.assertEqual(len(self.exchange.calls), 1)
+        self.assertEqual(orders[0]["status"], "resting")
+        self.assertIn("error", orders[1])
+        self.assertEqual(orders[2]["no_price"], 25)
+
+    def test_poll_only_looks_up_orders_that_left_the_resting_set(self):
+        a, b = execution.submit_orders([
+            execution.build_order("T1", "yes", 10, 30),
+            execution.build_order("T2", "yes", 10, 30),
+        ])
+        tracker = execution.OrderTracker([a, b])
+        self.exchange.fill(a["order_id"], 10)
+        self.exchange.fill(b["order_id"], 4)
+        self.exchange.calls.clear()
+
+        changed = tracker.poll()
+
+        self.assertEqual({o["order_id"] for o in changed}, {a["order_id"], b["order_id"]})
+        self.assertEqual(self.exchange.calls, [
+            ("GET", execution.ORDERS_PATH),
+            ("GET", execution.ORDERS_PATH),
+            ("GET", f"{execution.ORDERS_PATH}/{a['order_id']}"),
+        ])
+        self.assertEqual(self.exchange.listed, ["T1", "T2"])  # only the tracked orders' tickers
+        self.assertEqual(tracker.state(a["order_id"]), execution.EXECUTED)
+        self.assertEqual(tracker.state(b["order_id"]), execution.PARTIALLY_FILLED)
+
+    @patch("kalshi_execution.time.sleep", return_value=None)
+    def test_unfilled_orders_are_canceled_after_deadline(self, _sleep):
+        order = execution.submit_orders([execution.build_order("T1", "no", 10, 30)])[0]
+        tracker = execution.OrderTracker([order])
+
+        self.assertFalse(tracker.wait(timeout=0))
+        tracker.expire_unfilled("cancel")
+
+        self.assertTrue(tracker.done())
+        self.assertEqual(tracker.state(order["order_id"]), execution.CANCELED)
+
+    def test_amend_reprices_working_orders(self):
+        order = execution.submit_orders([execution.build_order("T1", "no", 10, 30)])[0]
+        tracker = execution.OrderTracker([order])
+
+        acted = tracker.expire_unfilled("amend", price_for=lambda o: o["no_price"] + 2)
+
+        self.assertEqual(acted[0]["no_price"], 32)
+        self.assertEqual(tracker.state(order["order_id"]), execution.RESTING)
+
+
+if __name__ == "__main__":
+    unittest.main()
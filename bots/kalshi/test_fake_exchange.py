@@ -0,0 +1,91 @@
+import json
+import os
+import sys
+import unittest
+import urllib.request
+from pathlib import Path
+from unittest.mock import patch
+
+
+os.environ.setdefault("KALSHI_API_KEY_ID", "test-key")
+sys.path.insert(0, str(Path(__file__).parent))
+
+import kalshi  # noqa: E402
+import kalshi_execution as execution  # noqa: E402
+import kalshi_fake_exchange as fake  # noqa: E402
+
+
+class FakeExchangeTest(unittest.TestCase):
+    def setUp(self):
+        self.server, self.base_url, self.exchange = fake.patch_client(self, fake.FakeExchange(markets=30))
+
+    def admin(self, path, payload):
+        req = urllib.request.Request(
+            f"{self.base_url}/_admin/{path}", data=json.dumps(payload).encode(), method="POST")
+        with urllib.request.urlopen(req) as resp:
+            return json.loads(resp.read())
+
+    def test_markets_paginate_with_series_filter(self):
+        seen, cursor = [], ""
+        while True:
+            result = kalshi.make_request(
+                "GET", f"/trade-api/v2/markets?series_ticker=KXBTCD&status=open&limit=8&cursor={cursor}")
+            seen += [m["ticker"] for m in result["markets"]]
+            cursor = result["cursor"]
+            if not cursor:
+                break
+        self.assertEqual(len(seen), 30)
+        self.assertEqual(kalshi.make_request("GET", "/trade-api/v2/markets?series_ticker=KXETH")["markets"], [])
+
+    def test_iter_all_streams_every_page(self):
+        meta = {}
+        markets = list(kalshi.iter_all(
+            "/trade-api/v2/markets?series_ticker=KXBTCD&status=open&limit=8", "markets", ("ticker",), meta))
+        self.assertEqual(len(markets), 30)
+        self.assertEqual(set(markets[0]), {"ticker"})
+        self.assertNotIn("error", meta)
+
+    def test_malformed_signature_is_rejected(self):
+        with patch.object(kalshi, "sign_request", return_value="not-a-signature"):
+            result = kalshi.make_request("GET", "/trade-api/v2/portfolio/balance")
+        self.assertIn("HTTP 401", result["error"])
+
+    def test_crossing_order_fills_and_shows_in_positions(self):
+        ticker = next(iter(self.exchange.markets))
+        book = kalshi.make_request("GET", f"/trade-api/v2/markets/{ticker}/orderbook")["orderbook"]
+        best_no_bid, qty = book["no"][-1]
+
+        [order] = execution.submit_orders([execution.build_order(ticker, "yes", qty, 100 - best_no_bid)])
+
+        self.assertEqual(execution.order_state(order), execution.EXECUTED)
+        positions = kalshi.make_request("GET", "/trade-api/v2/portfolio/positions")["market_positions"]
+        self.assertEqual(positions, [{**positions[0], "ticker": ticker, "position": qty}])
+
+    def test_resting_order_fills_from_outside_trade_then_settles(self):
+        ticker = next(iter(self.exchange.markets))
+        [order] = execution.submit_orders([execution.build_order(ticker, "no", 10, 1)])
+        tracker = execution.OrderTracker([order])
+
+        self.admin("trade", {"ticker": ticker, "side": "no", "price": 1, "count": 4})
+        tracker.poll()
+        self.assertEqual(tracker.state(order["order_id"]), execution.PARTIALLY_FILLED)
+
+        self.admin("settle", {"ticker": ticker, "result": "no"})
+        tracker.poll()
+        self.assertEqual(tracker.state(order["order_id"]), execution.CANCELED)
+        market = kalshi.make_request("GET", f"/trade-api/v2/markets/{ticker}")["market"]
+        self.assertEqual((market["status"], market["result"]), ("settled", "no"))
+        [settlement] = kalshi.make_request("GET", "/trade-api/v2/portfolio/settlements")["settlements"]
+        self.assertEqual(settlement["revenue"], 400)
+
+    @patch("kalshi.time.sleep", return_value=None)
+    def test_injected_429s_are_retried_by_the_client(self, _sleep):
+        self.exchange.rate_429 = 0.5
+        with patch.object(kalshi.cache, "ENABLED", False):  # every call goes to the exchange
+            results = [kalshi.make_request("GET", "/trade-api/v2/portfolio/balance") for _ in range(20)]
+        self.assertGreater(self.exchange.requests, 20)
+        self.assertGreater(sum(1 for r in results if "balance" in r), 10)
+
+
+if __name__ == "__main__":
+    unittest.main()
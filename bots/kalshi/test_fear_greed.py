@@ -0,0 +1,80 @@
+import os
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+
+os.environ.setdefault("KALSHI_API_KEY_ID", "test-key")
+sys.path.insert(0, str(Path(__file__).parent))
+
+import kalshi_fear_greed as fng  # noqa: E402
+
+DAY = 1_770_076_800  # 2026-02-03 00:00 UTC
+
+
+def entry(day, value, until=None):
+    e = {"value": str(value), "value_classification": "Neutral", "timestamp": str(day)}
+    if until is not None:
+        e["time_until_update"] = str(until)
+    return e
+
+
+class FakeAPI:
+    def __init__(self, days):
+        self.days = days  # newest first
+        self.urls = []
+
+    def __call__(self, url, timeout=None):
+        self.urls.append(url)
+        limit = int(url.rsplit("limit=", 1)[1])
+        return {"data": self.days[:limit]}
+
+
+class FearGreedStoreTest(unittest.TestCase):
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.path = Path(tmp.name) / "fng.json"
+
+    def test_serves_from_store_until_next_update(self):
+        api = FakeAPI([entry(DAY, 50, until=3600)])
+        now = DAY + 600
+        self.assertEqual(fng.get_current(api, self.path, now), {"value": 50, "label": "Neutral"})
+        self.assertEqual(fng.get_current(api, self.path, now + 3000), {"value": 50, "label": "Neutral"})
+        self.assertEqual(len(api.urls), 1)
+
+        api.days = [entry(DAY + 86400, 61, until=86000), entry(DAY, 50)]
+        self.assertEqual(fng.get_current(api, self.path, DAY + 86400 + 60)["value"], 61)
+        self.assertEqual(len(api.urls), 2)
+
+    def test_gap_is_refilled_in_one_request(self):
+        api = FakeAPI([entry(DAY, 50, until=60)])
+        fng.get_current(api, self.path, DAY + 600)
+        api.days = [entry(DAY + d * 86400, 50 + d, until=60) for d in range(4, -1, -1)]
+        fng.get_current(api, self.path, DAY + 4 * 86400 + 600)
+        self.assertTrue(api.urls[-1].endswith("?limit=4"))
+        self.assertEqual([v for _, v, _ in fng.history(fng.load_store(self.path))], [50, 51, 52, 53, 54])
+
+    def test_fetch_failure_falls_back_to_recent_value(self):
+        fng.get_current(FakeAPI([entry(DAY, 50, until=60)]), self.path, DAY + 600)
+
+        def down(url, timeout=None):
+            raise OSError("unreachable")
+        self.assertEqual(fng.get_current(down, self.path, DAY + 7200)["value"], 50)
+        with self.assertRaises(OSError):
+            fng.get_current(down, self.path, DAY + 5 * 86400)
+
+    def test_backfill_and_value_at(self):
+        api = FakeAPI([entry(DAY - d * 86400, 40 + d) for d in range(30)])
+        self.assertEqual(fng.backfill(30, api, self.path), 30)
+        self.assertEqual(api.urls, [f"{fng.API_URL}?limit=30"])
+        series = fng.history(fng.load_store(self.path))
+        self.assertEqual(fng.value_at(DAY + 3600, series), 40)
+        self.assertEqual(fng.value_at(DAY - 86400 + 1, series), 41)
+        self.assertIsNone(fng.value_at(DAY - 40 * 86400, series))
+        self.assertIsNone(fng.value_at(DAY + 10 * 86400, series))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,131 @@
+import os
+import sys
+import tempfile
+import time
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+from urllib.parse import parse_qs, urlparse
+
+
+os.environ.setdefault("KALSHI_API_KEY_ID", "test-key")
+sys.path.insert(0, str(Path(__file__).parent))
+
+import kalshi_live_ledger as ledger  # noqa: E402
+from kalshi_records import Recommendation  # noqa: E402
+
+NOW = int(time.time())
+
+
+def iso(ts):
+    import datetime
+    return datetime.datetime.fromtimestamp(ts, datetime.timezone.utc).isoformat().replace("+00:00", "Z")
+
+
+class FakePortfolio:
+    """Serves fills/settlements with min_ts/max_ts filtering and 2-row pages"""
+
+    def __init__(self):
+        self.fills = []
+        self.settlements = []
+        self.rows_served = 0
+
+    def __call__(self, method, path, data=None):
+        url = urlparse(path)
+        q = {k: v[0] for k, v in parse_qs(url.query).items()}
+        if url.path.endswith("/fills"):
+            rows, key, field = self.fills, "fills", "created_time"
+        else:
+            rows, key, field = self.settlements, "settlements", "settled_time"
+        lo, hi = int(q.get("min_ts", 0)), int(q.get("max_ts", 2**40))
+        match = [r for r in rows if lo <= ledger._ts(r[field]) <= hi]
+        start = int(q.get("cursor") or 0)
+        page = match[start:start + 2]
+        self.rows_served += len(page)
+        more = start + 2 < len(match)
+        return {key: page, "cursor": str(start + 2) if more else ""}
+
+
+class LiveLedgerTest(unittest.TestCase):
+    def setUp(self):
+        tmp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp_dir.cleanup)
+        tmp = Path(tmp_dir.name)
+        for name in ("LIVE_FILLS_JSONL", "LIVE_SETTLEMENTS_JSONL", "LIVE_CURSORS_JSON",
+                     "LIVE_ENTRIES_JSON", "LIVE_STATS_JSON"):
+            patcher = patch.object(ledger, name, tmp / name.lower())
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        self.api = FakePortfolio()
+        patcher = patch.object(ledger, "kalshi_request", self.api)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def fill(self, trade_id, ts, ticker="T1", count=100, price=30, order_id="ord-1"):
+        self.api.fills.append({
+            "trade_id": trade_id, "order_id": order_id, "ticker": ticker, "side": "no",
+            "action": "buy", "count": count, "no_price": price, "created_time": iso(ts),
+        })
+
+    def test_routine_sync_only_pulls_new_rows(self):
+        for i in range(5):
+            self.fill(f"f{i}", NOW - 86400 * 20 + i)
+        cursors = {}
+        self.assertEqual(ledger.sync_stream("fills", cursors, now=NOW), 5)
+
+        self.api.rows_served = 0
+        self.fill("f5", NOW - 10)
+        self.assertEqual(ledger.sync_stream("fills", cursors, now=NOW), 1)
+        # The inclusive min_ts re-serves only the boundary row, which is deduped
+        self.assertLessEqual(self.api.rows_served, 2)
+        self.assertEqual(ledger.sync_stream("fills", cursors, now=NOW), 0)
+        self.assertEqual(len(ledger._load_rows(ledger.LIVE_FILLS_JSONL)), 6)
+
+    def test_trades_join_entry_context_and_feed_paper_stats(self):
+        ledger.record_entry(
+            "ord-1",
+            Recommendation("BUY NO", "T1", 99_000.0, 95_000.0, 4.2, 30),
+            signal_score=4, signals={}, btc={"price": 95000, "change_24h": -1.234},
+        )
+        self.fill("f1", NOW - 100, count=100, price=30)
+        self.fill("f2", NOW - 90, count=50, price=32)
+        self.fill("f3", NOW - 80, ticker="T2", order_id="ord-2")
+        self.api.settlements.append({
+            "ticker": "T1", "market_result": "no", "yes_total_cost": 0,
+            "no_total_cost": 4600, "revenue": 15000, "settled_time": iso(NOW - 10),
+        })
+
+        counts, stats = ledger.sync_ledger()
+
+        self.assertEqual(counts, {"fills": 3, "settlements": 1})
+        trades = {t.ticker: t for t in ledger.build_trades()}
+        self.assertEqual(trades["T1"].signal_score, 4)
+        self.assertEqual(trades["T1"].strike, 99_000.0)
+        self.assertEqual(trades["T1"].contracts, 150)
+        self.assertEqual(trades["T1"].realized_pnl, 104.0)
+        self.assertEqual(trades["T2"].status, "open")
+        self.assertEqual((stats["wins"], stats["open_trades"]), (1, 1))
+
+    def test_sync_folds_only_new_rows_into_persisted_trades(self):
+        self.fill("f1", NOW - 100, count=100, price=30)
+        ledger.sync_ledger()
+
+        self.fill("f2", NOW - 90, count=50, price=32)
+        self.api.settlements.append({
+            "ticker": "T1", "market_result": "no", "yes_total_cost": 0,
+            "no_total_cost": 4600, "revenue": 15000, "settled_time": iso(NOW - 10),
+        })
+        with patch.object(ledger, "_load_rows", side_effect=AssertionError("reloaded history")):
+            counts, stats = ledger.sync_ledger()
+            self.assertEqual(counts, {"fills": 1, "settlements": 1})
+            with patch.object(ledger, "_compute_stats", side_effect=AssertionError("recomputed")):
+                self.assertEqual(ledger.sync_ledger()[1], stats)  # nothing new
+
+        folded = {t.ticker: t for t in ledger._trades(ledger._load_json(ledger.LIVE_CURSORS_JSON, {})["folded"])}
+        rebuilt = {t.ticker: t for t in ledger.build_trades()}
+        self.assertEqual(folded, rebuilt)
+        self.assertEqual((folded["T1"].contracts, folded["T1"].realized_pnl), (150, 104.0))
+
+
+if __name__ == "__main__":
+    unittest.main()
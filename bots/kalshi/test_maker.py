@@ -0,0 +1,123 @@
+import os
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+
+os.environ.setdefault("KALSHI_API_KEY_ID", "test-key")
+sys.path.insert(0, str(Path(__file__).parent))
+
+import kalshi_btc_monitor as monitor  # noqa: E402
+import kalshi_fake_exchange as fake  # noqa: E402
+import kalshi_maker as maker  # noqa: E402
+from kalshi_execution import CANCELED, EXECUTED, filled_count, order_state  # noqa: E402
+from kalshi_records import Recommendation  # noqa: E402
+
+
+class FakeClock:
+    """Time that only moves when the code under test sleeps; runs scripted steps as it passes them"""
+
+    def __init__(self, start=1000.0, steps=None):
+        self.now = start
+        self.steps = sorted((steps or {}).items())
+        self.slept = []
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.slept.append(seconds)
+        self.now += seconds
+        while self.steps and self.steps[0][0] <= self.now:
+            self.steps.pop(0)[1]()
+
+
+class QuoteTest(unittest.TestCase):
+    def test_quotes_one_tick_inside_within_cap_ignoring_our_own_size(self):
+        book = {"yes": [[20, 100], [22, 10]], "no": [[70, 100]]}  # yes ask 30
+        self.assertEqual(maker.quote_price(book, "yes", cap=28), 23)
+        self.assertEqual(maker.quote_price(book, "yes", cap=21), 21)
+        # our 10 @ 22 is the best bid: don't chase ourselves
+        self.assertEqual(maker.quote_price(book, "yes", cap=28, own=(22, 10)), 21)
+        # one-tick spread: join below the ask rather than cross
+        self.assertEqual(maker.quote_price({"yes": [[29, 5]], "no": [[70, 5]]}, "yes", cap=35), 29)
+
+    def test_urgent_trades_are_not_worked(self):
+        close = "2026-02-03T20:00:00Z"
+        close_ts = 1_770_148_800
+        guard = 90
+        self.assertIsNone(maker.give_up_time(close, guard, now=close_ts - (guard + 10) * 60))
+        self.assertEqual(maker.give_up_time(close, guard, now=close_ts - 6 * 3600),
+                         close_ts - 6 * 3600 + maker.MAX_WORK_SECONDS)
+        with patch.object(maker, "MAX_WORK_SECONDS", 3600):  # the guard comes first
+            self.assertEqual(maker.give_up_time(close, guard, now=close_ts - (guard + 35) * 60),
+                             close_ts - guard * 60)
+
+    def test_rate_limiter_spaces_calls_after_the_burst(self):
+        clock = FakeClock()
+        bucket = maker.RateLimiter(2, burst=2, clock=clock, sleep=clock.sleep)
+        waits = [bucket.acquire() for _ in range(6)]
+        self.assertEqual(waits[:2], [0.0, 0.0])
+        self.assertAlmostEqual(clock.now - 1000.0, 2.0)
+
+
+class MakerLoopTest(unittest.TestCase):
+    def setUp(self):
+        self.server, _, self.exchange = fake.patch_client(self, fake.FakeExchange(markets=5))
+        self.ticker = next(iter(self.exchange.markets))
+        self.exchange.set_book(self.ticker, yes=[[20, 100]], no=[[70, 100]])  # yes 20 / 30
+        self.work_order = maker.work_order  # unpatched, for tests that stub it in execute_trade
+
+    def work(self, clock, deadline, count=10, cap=28):
+        buckets = {"reads": maker.RateLimiter(4, clock=clock, sleep=clock.sleep),
+                   "writes": maker.RateLimiter(1, clock=clock, sleep=clock.sleep)}
+        return self.work_order(self.ticker, "yes", count, cap, deadline,
+                               clock=clock, sleep=clock.sleep, tick=1.0, **buckets)
+
+    def test_follows_the_bid_up_to_the_cap_then_cancels_at_the_deadline(self):
+        ex, t = self.exchange, self.ticker
+        clock = FakeClock(steps={
+            1003: lambda: ex.set_book(t, yes=[[20, 100], [24, 50]], no=[[70, 100]]),   # outbid
+            1007: lambda: ex.set_book(t, yes=[[20, 100], [29, 50]], no=[[70, 100]]),   # past our cap
+            1010: lambda: ex.external_trade(t, "yes", 28, 4),                          # seller hits us
+        })
+        order, stats = self.work(clock, deadline=1015)
+
+        prices = [o["yes_price"] for o in ex.orders.values()]
+        self.assertEqual(prices, [28])  # 21 -> 25 -> 28 (capped), one order amended in place
+        self.assertEqual(stats["requotes"], 2)
+        self.assertEqual((order_state(order), filled_count(order)), (CANCELED, 4))
+        self.assertLess(clock.now, 1015)
+        self.assertEqual(stats["overruns"], 0)
+
+    def test_stops_when_filled(self):
+        ex, t = self.exchange, self.ticker
+        clock = FakeClock(steps={1002: lambda: ex.external_trade(t, "yes", 21, 10)})
+        order, stats = self.work(clock, deadline=1100)
+        self.assertEqual((order_state(order), filled_count(order)), (EXECUTED, 10))
+        self.assertLess(clock.now, 1005)
+
+    def test_nothing_to_bid_under_the_cap(self):
+        order, _ = self.work(FakeClock(), deadline=1100, cap=0)
+        self.assertIn("no maker price", order["error"])
+        self.assertEqual(self.exchange.orders, {})
+
+    def test_execute_trade_reports_what_the_order_paid_not_the_cap(self):
+        ex, t = self.exchange, self.ticker
+        clock = FakeClock(steps={1002: lambda: ex.external_trade(t, "yes", 21, 10)})
+        rec = Recommendation("BUY YES", t, 99_000.0, 95_000.0, 4.2, 30, settlement_time="2099-01-01T00:00:00Z")
+        with tempfile.TemporaryDirectory() as tmp, \
+                patch.object(monitor, "MAKER_MODE", True), \
+                patch.object(monitor, "TRADE_LOG", Path(tmp) / "log.md"), \
+                patch.object(maker, "work_order", lambda ticker, side, count, cap, deadline:
+                             self.work(clock, deadline=1100, count=count, cap=cap)):
+            trade = monitor.execute_trade(rec)
+
+        self.assertIn("maker ≤29¢", trade["execution"])
+        self.assertEqual((trade["filled"], trade["cost"], trade["total_cost"]), ("10/333", "21¢", "$2.10"))
+
+
+if __name__ == "__main__":
+    unittest.main()
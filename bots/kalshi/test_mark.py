@@ -0,0 +1,85 @@
+import os
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+
+os.environ.setdefault("KALSHI_API_KEY_ID", "test-key")
+sys.path.insert(0, str(Path(__file__).parent))
+
+import kalshi_paper_tracker as tracker  # noqa: E402
+from kalshi_records import PaperTrade  # noqa: E402
+
+SETTLE_A, SETTLE_B = "2026-02-03T22:00:00Z", "2026-02-04T22:00:00Z"
+
+
+def trade(i, ticker, side, settle, contracts=100, cost=40.0):
+    return PaperTrade(id=str(i), ticker=ticker, side=side, contracts=contracts,
+                      hypothetical_cost_usd=cost, settlement_time=settle)
+
+
+class FakeMarkets:
+    def __init__(self, markets):
+        self.markets = markets
+        self.paths = []
+
+    def __call__(self, method, path, data=None):
+        self.paths.append(path)
+        tickers = path.split("tickers=")[1].split("&")[0].split(",")
+        return {"markets": [dict(self.markets[t], ticker=t) for t in tickers if t in self.markets]}
+
+
+class MarkToMarketTest(unittest.TestCase):
+    def setUp(self):
+        tmpdir = tempfile.TemporaryDirectory()
+        self.addCleanup(tmpdir.cleanup)
+        tmp = Path(tmpdir.name)
+        for target, value in (("PAPER_TRADES_JSON", tmp / "kalshi-paper-trades.json"),
+                              ("PAPER_STATS_JSON", tmp / "kalshi-paper-stats.json"),
+                              ("TRADE_LOG_MD", tmp / "log.md")):
+            patcher = patch.object(tracker, target, value)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        tracker._save_trades([
+            trade(1, "A", "yes", SETTLE_A),
+            trade(2, "A", "no", SETTLE_A, contracts=50, cost=30.0),
+            trade(3, "B", "no", SETTLE_B),
+            trade(4, "C", "yes", SETTLE_A),
+        ])
+        self.api = FakeMarkets({
+            "A": {"status": "open", "yes_bid": 55, "no_bid": 43},
+            "B": {"status": "open", "yes_bid": 70, "no_bid": 28},
+            "C": {"status": "settled", "result": "yes"},
+        })
+
+    def test_resolver_marks_open_trades_from_the_same_bulk_quotes(self):
+        with patch.object(tracker, "kalshi_request", self.api):
+            resolved, _, stats = tracker.resolve_paper_trades()
+        self.assertEqual(resolved, 1)
+        self.assertEqual(len(self.api.paths), 1)  # one bulk request for resolve + mark
+        mark = stats["mark"]
+        # A yes 100 @ 55¢ = 55, A no 50 @ 43¢ = 21.5, B no 100 @ 28¢ = 28 against 110 cost
+        self.assertEqual((mark["open_trades"], mark["open_cost_usd"], mark["open_value_usd"]), (3, 110.0, 104.5))
+        self.assertEqual(mark["unrealized_pnl"], -5.5)
+        self.assertEqual(mark["equity"], 60.0 - 5.5)
+        self.assertEqual([(e["settlement"], e["trades"], e["cost_usd"]) for e in mark["exposure"]],
+                         [(SETTLE_A, 2, 70.0), (SETTLE_B, 1, 40.0)])
+        self.assertEqual(tracker._load_stats()["mark"]["equity"], 54.5)
+
+    def test_drawdown_includes_open_risk(self):
+        with patch.object(tracker, "kalshi_request", self.api):
+            tracker.mark_to_market()
+            self.api.markets["A"] = {"status": "open", "yes_bid": 20, "no_bid": 78}
+            self.api.markets["C"] = {"status": "open", "yes_bid": 50, "no_bid": 48}
+            mark = tracker.mark_to_market()
+        points = tracker._load_marks()
+        self.assertEqual(len(points), 2)
+        self.assertEqual([p[1:] for p in points], [[0.0, 54.5, 150.0], [0.0, -13.0, 150.0]])
+        self.assertEqual(mark["max_drawdown_marked"], 67.5)  # no trade has resolved yet
+        self.assertEqual(mark["current_drawdown"], 67.5)
+
+
+if __name__ == "__main__":
+    unittest.main()
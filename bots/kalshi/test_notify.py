@@ -0,0 +1,109 @@
+import os
+import sys
+import tempfile
+import threading
+import time
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+
+os.environ.setdefault("KALSHI_API_KEY_ID", "test-key")
+sys.path.insert(0, str(Path(__file__).parent))
+
+import kalshi_notify as outbox  # noqa: E402
+
+
+class FlakySink:
+    """Fails the first `failures` sends, then records every message"""
+
+    def __init__(self, failures=0):
+        self.failures = failures
+        self.messages = []
+
+    def send(self, text, events):
+        if self.failures:
+            self.failures -= 1
+            raise OSError("telegram down")
+        self.messages.append((text, events))
+
+
+class BlockingSink:
+    def __init__(self):
+        self.release = threading.Event()
+
+    def send(self, text, events):
+        self.release.wait(5)
+
+
+class OutboxTest(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.db = Path(self.tmp.name) / "outbox.sqlite"
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_burst_is_coalesced_into_one_digest(self):
+        for i in range(3):
+            outbox.enqueue("resolved", f"✅ trade {i}", ["file"], path=self.db)
+        outbox.enqueue("milestone", "🎯 milestone", ["file"], path=self.db)
+        sink = FlakySink()
+
+        self.assertEqual(outbox.drain({"file": sink}, path=self.db), {"file": 4})
+        self.assertEqual(len(sink.messages), 1)
+        text, events = sink.messages[0]
+        self.assertTrue(text.startswith("📬 4 Kalshi events (3 resolved, 1 milestone)"))
+        self.assertIn("✅ trade 2", text)
+        self.assertEqual([e["kind"] for e in events], ["resolved"] * 3 + ["milestone"])
+        self.assertEqual(outbox.status(self.db)["file"], {"pending": 0, "sent": 4, "dead": 0})
+
+    def test_failed_send_is_retried_with_backoff_and_not_duplicated(self):
+        outbox.enqueue("trade", "✅ filled", ["telegram"], path=self.db, now=1000)
+        sink = FlakySink(failures=1)
+
+        self.assertEqual(outbox.drain({"telegram": sink}, path=self.db, now=1000), {})
+        # not due again until the backoff has passed
+        self.assertEqual(outbox.drain({"telegram": sink}, path=self.db, now=1000 + 10), {})
+        self.assertEqual(outbox.drain({"telegram": sink}, path=self.db,
+                                      now=1000 + outbox.RETRY_BASE_SECONDS), {"telegram": 1})
+        self.assertEqual(outbox.drain({"telegram": sink}, path=self.db, now=5000), {})
+        self.assertEqual([m[0] for m in sink.messages], ["✅ filled"])
+
+    def test_each_sink_is_delivered_independently(self):
+        outbox.enqueue("error", "❌ API error", ["telegram", "file"], path=self.db)
+        down, up = FlakySink(failures=10), FlakySink()
+
+        outbox.drain({"telegram": down, "file": up}, path=self.db)
+        self.assertEqual(len(up.messages), 1)
+        self.assertEqual(outbox.status(self.db)["telegram"]["pending"], 1)
+
+    def test_notify_returns_while_the_sink_is_blocked(self):
+        sink = BlockingSink()
+        sender = outbox.Sender({"file": sink}, path=self.db, coalesce=0, poll=0.05)
+        with patch.object(outbox, "configured_sinks", return_value={"file": sink}), \
+                patch.object(outbox, "OUTBOX_PATH", self.db), \
+                patch.object(outbox, "_sender", sender):
+            sender.start()
+            started = time.perf_counter()
+            for i in range(5):
+                outbox.notify("resolved", f"trade {i}")
+            self.assertLess(time.perf_counter() - started, 1.0)
+            sink.release.set()
+            sender.stop(timeout=5)
+        self.assertEqual(outbox.status(self.db)["file"]["pending"], 0)
+
+    def test_file_sink_from_environment(self):
+        path = Path(self.tmp.name) / "notify.log"
+        sinks = outbox.configured_sinks({"KALSHI_NOTIFY_FILE": str(path), "KALSHI_NOTIFY_WEBHOOK": "http://x"})
+        self.assertEqual(set(sinks), {"file", "webhook"})
+        self.assertEqual(set(outbox.configured_sinks({"KALSHI_NOTIFY_FILE": str(path),
+                                                      "KALSHI_NOTIFY_SINKS": "telegram"})), set())
+
+        outbox.enqueue("test", "🔔 hello", ["file"], path=self.db)
+        outbox.drain({"file": sinks["file"]}, path=self.db)
+        self.assertEqual(path.read_text(), "🔔 hello\n\n")
+
+
+if __name__ == "__main__":
+    unittest.main()
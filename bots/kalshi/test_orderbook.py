@@ -0,0 +1,82 @@
+import os
+import sys
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+
+os.environ.setdefault("KALSHI_API_KEY_ID", "test-key")
+sys.path.insert(0, str(Path(__file__).parent))
+
+import kalshi_btc_monitor as monitor  # noqa: E402
+from kalshi_records import Market  # noqa: E402
+
+
+BOOK = {
+    # YES bids ascend; buying NO lifts these at 100 - price
+    "yes": [[60, 500], [68, 200], [70, 100]],
+    "no": [[20, 50]],
+}
+
+
+class AskLadderTest(unittest.TestCase):
+    def test_buying_no_walks_yes_bids_cheapest_first(self):
+        prices, sizes = monitor.parse_ask_ladder(BOOK, "no")
+        self.assertEqual(list(prices), [30, 32, 40])
+        self.assertEqual(list(sizes), [100, 200, 500])
+
+    def test_fill_is_volume_weighted_and_respects_price_cap(self):
+        prices, sizes = monitor.parse_ask_ladder(BOOK, "no")
+        fill = monitor.fill_from_ladder(prices, sizes, budget_cents=10_000, max_price=35)
+        # 100 @ 30¢ = $30, then $70 buys 218 @ 32¢ but only 200 rest there
+        self.assertEqual(fill["contracts"], 300)
+        self.assertEqual(fill["total_cents"], 3000 + 6400)
+        self.assertEqual(fill["limit_price"], 32)
+        self.assertAlmostEqual(fill["avg_cost"], 9400 / 300)
+
+    def test_empty_side_does_not_fill(self):
+        prices, sizes = monitor.parse_ask_ladder({"no": None}, "yes")
+        self.assertIsNone(monitor.fill_from_ladder(prices, sizes, budget_cents=10_000))
+
+
+class SelectMarketTest(unittest.TestCase):
+    def test_skips_candidates_whose_book_is_too_thin(self):
+        markets = [
+            Market.from_api({"ticker": "KXBTCD-26FEB0317-T98000", "yes_bid": 70, "yes_ask": 72}),
+            Market.from_api({"ticker": "KXBTCD-26FEB0317-T99000", "yes_bid": 75, "yes_ask": 77}),
+        ]
+        books = {
+            "KXBTCD-26FEB0317-T98000": {"yes": [[70, 5]]},
+            "KXBTCD-26FEB0317-T99000": {"yes": [[72, 400], [75, 100]]},
+        }
+        with patch.object(monitor, "get_orderbook", side_effect=books.get):
+            rec = monitor.select_market(markets, 95_000, bullish=False)
+
+        self.assertEqual(rec.ticker, "KXBTCD-26FEB0317-T99000")
+        self.assertEqual(rec.strike, 99_000.0)
+        self.assertEqual(rec.fill["limit_price"], 28)
+        self.assertEqual(rec.cost_cents, round(rec.fill["avg_cost"]))
+        self.assertEqual(rec.display()["strike"], "$99,000.00")
+
+    def test_picks_the_cheapest_achievable_fill_and_breaks_ties_by_distance(self):
+        markets = [
+            Market.from_api({"ticker": "KXBTCD-26FEB0317-T98000", "yes_bid": 68, "yes_ask": 70}),
+            Market.from_api({"ticker": "KXBTCD-26FEB0317-T99000", "yes_bid": 72, "yes_ask": 74}),
+        ]
+        books = {
+            "KXBTCD-26FEB0317-T98000": {"yes": [[68, 5000]]},
+            "KXBTCD-26FEB0317-T99000": {"yes": [[72, 5000]]},
+        }
+        with patch.object(monitor, "get_orderbook", side_effect=books.get):
+            rec = monitor.select_market(markets, 95_000, bullish=False)
+        self.assertEqual(rec.ticker, "KXBTCD-26FEB0317-T99000")
+        self.assertAlmostEqual(rec.fill["avg_cost"], 28)
+
+        books["KXBTCD-26FEB0317-T99000"] = {"yes": [[68, 5000]]}
+        with patch.object(monitor, "get_orderbook", side_effect=books.get):
+            rec = monitor.select_market(markets, 95_000, bullish=False)
+        self.assertEqual(rec.ticker, "KXBTCD-26FEB0317-T98000")
+
+
+if __name__ == "__main__":
+    unittest.main()
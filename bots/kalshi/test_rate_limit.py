@@ -1,6 +1,7 @@
 import io
 import os
 import sys
+import tempfile
 import unittest
 from pathlib import Path
 from unittest.mock import patch
@@ -11,6 +12,8 @@ os.environ.setdefault("KALSHI_API_KEY_ID", "test-key")
 sys.path.insert(0, str(Path(__file__).parent))
 
 import kalshi  # noqa: E402
+import kalshi_breaker  # noqa: E402
+import kalshi_metrics  # noqa: E402
 
 
 class DummyResponse:
@@ -33,6 +36,13 @@ def make_http_error(code: int):
 
 
 class RateLimitRetryTest(unittest.TestCase):
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        patcher = patch.object(kalshi_breaker, "STATE_PATH", Path(tmp.name) / "breakers.json")
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
     @patch("kalshi.time.sleep", return_value=None)
     @patch("kalshi.sign_request", return_value="sig")
     @patch("kalshi.load_private_key", return_value=object())
@@ -49,6 +59,28 @@ class RateLimitRetryTest(unittest.TestCase):
         self.assertTrue(result.get("ok"))
         self.assertEqual(mock_urlopen.call_count, 3)
 
+    @patch("kalshi.time.sleep", return_value=None)
+    @patch("kalshi.sign_request", return_value="sig")
+    @patch("kalshi.load_private_key", return_value=object())
+    @patch("urllib.request.urlopen")
+    def test_retries_are_counted_when_metrics_enabled(self, mock_urlopen, _load_key, _sign, _sleep):
+        mock_urlopen.side_effect = [
+            make_http_error(429),
+            make_http_error(503),
+            DummyResponse(b'{"ok": true}'),
+        ]
+
+        with patch.object(kalshi_metrics, "ENABLED", True), \
+                patch.object(kalshi_metrics, "_endpoints", {}):
+            kalshi.make_request("GET", "/trade-api/v2/markets/KXBTCD-26FEB0317-T78499.99")
+            summary = kalshi_metrics.summary()
+
+        [endpoint] = summary["endpoints"]
+        self.assertEqual(endpoint["endpoint"], "/trade-api/v2/markets/{ticker}")
+        self.assertEqual(endpoint["attempts"], 3)
+        self.assertEqual(endpoint["retries"], {"429": 1, "5xx": 1, "network": 0})
+        self.assertEqual(endpoint["bytes_received"], len(b'{"ok": true}'))
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,86 @@
+import os
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+
+os.environ.setdefault("KALSHI_API_KEY_ID", "test-key")
+sys.path.insert(0, str(Path(__file__).parent))
+
+import kalshi_recorder as recorder  # noqa: E402
+
+T0 = 1_770_000_000_000  # ms, 2026-02-02 02:40 UTC
+
+
+def market(ticker, yes_bid, volume=1000):
+    return {"ticker": ticker, "yes_bid": yes_bid, "yes_ask": yes_bid + 2, "no_bid": 98 - yes_bid,
+            "no_ask": 100 - yes_bid, "volume": volume, "open_interest": 500}
+
+
+class RecorderTest(unittest.TestCase):
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.dir = Path(tmp.name)
+
+    def test_roundtrip_with_listing_changes_and_books(self):
+        writer = recorder.SnapshotWriter(self.dir, depth=3, chunk_snapshots=4)
+        for s in range(10):
+            markets = [market("A", 40 + s % 2), market("B", 60, volume=1000 + s)]
+            if s >= 5:
+                markets.append(market("C", 10))  # listed mid-chunk
+            writer.add(T0 + s * 1000, markets, {"A": {"yes": [[40, 5], [41, 7]], "no": [[58, 2]]}})
+        writer.close()
+
+        rows = list(recorder.read_snapshots(directory=self.dir))
+        self.assertEqual(len(rows), 10 * 2 + 5)
+        b = [r for r in rows if r["ticker"] == "B"]
+        self.assertEqual([r["volume"] for r in b], [1000 + s for s in range(10)])
+        a = [r for r in rows if r["ticker"] == "A"]
+        self.assertEqual([r["yes_bid"] for r in a[:3]], [40, 41, 40])
+        self.assertEqual(a[0]["book"], {"yes": [[41, 7], [40, 5]], "no": [[58, 2]]})
+        self.assertEqual(b[0]["book"], {"yes": [], "no": []})
+
+    def test_range_and_ticker_filter_and_daily_roll(self):
+        writer = recorder.SnapshotWriter(self.dir, chunk_snapshots=60)
+        day = 86_400_000
+        for s in range(5):
+            writer.add(T0 + s * day // 2, [market("A", 30 + s), market("B", 50)])
+        writer.close()
+        self.assertEqual(len(list(self.dir.glob("KXBTCD-*.kss"))), 3)
+
+        rows = list(recorder.read_snapshots((T0 + day // 2) / 1000, (T0 + 3 * day // 2) / 1000, ["A"],
+                                            directory=self.dir))
+        self.assertEqual([(r["ticker"], r["yes_bid"]) for r in rows], [("A", 31), ("A", 32), ("A", 33)])
+
+    def test_torn_final_frame_is_ignored(self):
+        writer = recorder.SnapshotWriter(self.dir, chunk_snapshots=2)
+        for s in range(4):
+            writer.add(T0 + s * 1000, [market("A", 30 + s)])
+        writer.close()
+        path = next(self.dir.glob("*.kss"))
+        path.write_bytes(path.read_bytes()[:-5])
+        self.assertEqual([r["yes_bid"] for r in recorder.read_snapshots(directory=self.dir)], [30, 31])
+
+    def test_restarted_writer_truncates_a_torn_tail_before_appending(self):
+        writer = recorder.SnapshotWriter(self.dir, chunk_snapshots=2)
+        for s in range(4):
+            writer.add(T0 + s * 1000, [market("A", 30 + s)])
+        writer.close()
+        path = next(self.dir.glob("*.kss"))
+        whole = path.stat().st_size
+        with open(path, "ab") as f:
+            f.write(bytes(range(30)))  # crash mid-append
+
+        writer = recorder.SnapshotWriter(self.dir, chunk_snapshots=2)
+        for s in range(4, 6):
+            writer.add(T0 + s * 1000, [market("A", 30 + s)])
+        writer.close()
+        self.assertEqual(path.stat().st_size, whole + writer.bytes_written)
+        self.assertEqual([r["yes_bid"] for r in recorder.read_snapshots(directory=self.dir)],
+                         [30, 31, 32, 33, 34, 35])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,52 @@
+import json
+import os
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+
+os.environ.setdefault("KALSHI_API_KEY_ID", "test-key")
+sys.path.insert(0, str(Path(__file__).parent))
+
+import kalshi_paper_tracker as tracker  # noqa: E402
+from kalshi_records import Market, PaperTrade, Recommendation  # noqa: E402
+
+
+class RecordsTest(unittest.TestCase):
+    def test_market_parses_strike_and_close_once(self):
+        m = Market.from_api({"ticker": "KXBTCD-26FEB0317-T78499.99", "close_time": "2026-02-03T22:00:00Z",
+                             "yes_bid": None, "yes_ask": 12})
+        self.assertEqual(m.strike, 78499.99)
+        self.assertEqual(m.close_ts, 1770156000.0)
+        self.assertEqual((m.yes_bid, m.yes_ask), (0, 12))
+
+    def test_legacy_ledger_rows_load_with_float_strikes(self):
+        trade = PaperTrade.from_dict({"id": "A", "ticker": "T", "side": "no", "strike": "$99,000.00"})
+        self.assertEqual(trade.strike, 99_000.0)
+        self.assertEqual(trade.to_dict()["status"], "open")
+
+    def test_paper_trade_roundtrips_through_the_ledger(self):
+        tmpdir = tempfile.TemporaryDirectory()
+        self.addCleanup(tmpdir.cleanup)
+        tmp = Path(tmpdir.name)
+        rec = Recommendation("BUY NO", "KXBTCD-26FEB0317-T99000", 99_000.0, 95_000.0, 4.2, 27,
+                             settlement_time="2026-02-03T22:00:00Z")
+        with patch.object(tracker, "PAPER_TRADES_JSON", tmp / "trades.json"), \
+                patch.object(tracker, "PAPER_STATS_JSON", tmp / "stats.json"), \
+                patch.object(tracker, "TRADE_LOG_MD", tmp / "log.md"), \
+                patch.object(tracker, "kalshi_request",
+                             return_value={"market": {"status": "settled", "result": "no"}}):
+            tracker.log_paper_trade(rec, 4, {}, {"price": 95_000.0, "change_24h": -1.5})
+            resolved, _, stats = tracker.resolve_paper_trades()
+
+            row = json.loads((tmp / "trades.json").read_text())[0]
+        self.assertEqual(resolved, 1)
+        self.assertEqual((row["strike"], row["entry_cost_cents"], row["contracts"]), (99_000.0, 27, 370))
+        self.assertEqual(row["realized_pnl"], round(370 - 99.9, 2))
+        self.assertEqual(stats["wins"], 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
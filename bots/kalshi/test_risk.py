@@ -0,0 +1,73 @@
+import os
+import sys
+import time
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+
+os.environ.setdefault("KALSHI_API_KEY_ID", "test-key")
+sys.path.insert(0, str(Path(__file__).parent))
+
+import kalshi_paper_tracker as tracker  # noqa: E402
+import kalshi_risk as risk  # noqa: E402
+from kalshi_records import PaperTrade  # noqa: E402
+
+
+def ledger(outcomes, cost=100.0):
+    """Resolved trades: +pnl for a win, -cost for a loss"""
+    return [PaperTrade(id=str(i), ticker="T", side="no", status="win" if pnl > 0 else "loss",
+                       realized_pnl=pnl if pnl > 0 else -cost, hypothetical_cost_usd=cost,
+                       resolved_at=f"2026-02-{1 + i % 28:02d}T00:00:{i % 60:02d}+00:00")
+            for i, pnl in enumerate(outcomes)]
+
+
+# 12 resolved, 7 wins at +$90, 5 losses at -$100: point expectancy > 0 and win rate > 40%
+SMALL = ledger([90, -1, 90, 90, -1, 90, 90, -1, 90, -1, 90, -1])
+
+
+class RiskTest(unittest.TestCase):
+    def check_backend(self):
+        ci = risk.confidence(SMALL, resamples=4_000, seed=1)
+        lo, hi = ci["expectancy"]
+        self.assertLess(lo, 90 * 7 / 12 - 100 * 5 / 12)
+        self.assertGreater(hi, 90 * 7 / 12 - 100 * 5 / 12)
+        self.assertLess(lo, 0)  # 12 trades can't rule out a losing strategy
+        self.assertLessEqual(ci["win_rate"][0], 7 / 12)
+        self.assertGreaterEqual(ci["win_rate"][1], 7 / 12)
+        self.assertGreaterEqual(ci["max_drawdown"][0], 0)
+        self.assertTrue(0 <= ci["risk_of_ruin"] <= 1)
+
+        winners, losers = ledger([60] * 10), ledger([-1] * 10)
+        self.assertEqual(risk.confidence(winners, resamples=500, seed=1)["risk_of_ruin"], 0.0)
+        self.assertEqual(risk.confidence(losers, resamples=500, seed=1)["risk_of_ruin"], 1.0)
+        self.assertIsNone(risk.confidence(ledger([60] * 4)))
+
+    def test_numpy_backend(self):
+        if risk.np is None:
+            self.skipTest("numpy not installed")
+        self.check_backend()
+
+    def test_pure_python_backend(self):
+        with patch.object(risk, "np", None):
+            self.check_backend()
+
+    def test_100k_resamples_well_under_a_second(self):
+        if risk.np is None:
+            self.skipTest("numpy not installed")
+        trades = ledger([60, -1, 60] * 7)
+        started = time.perf_counter()
+        ci = risk.confidence(trades, seed=1)
+        self.assertEqual(ci["resamples"], 100_000)
+        self.assertLess(time.perf_counter() - started, 1.0)
+
+    def test_verdict_uses_the_interval(self):
+        stats = tracker._compute_stats(SMALL)
+        self.assertEqual(tracker.verdict(stats), "go")  # point estimate alone
+        stats = tracker._compute_stats(SMALL, with_confidence=True)
+        self.assertEqual(tracker.verdict(stats), "wait")
+        self.assertIn("Risk of Ruin", tracker.milestone_telegram_message(stats))
+
+
+if __name__ == "__main__":
+    unittest.main()
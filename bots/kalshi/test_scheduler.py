@@ -0,0 +1,131 @@
+import datetime
+import os
+import sys
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+
+os.environ.setdefault("KALSHI_API_KEY_ID", "test-key")
+sys.path.insert(0, str(Path(__file__).parent))
+
+import kalshi_scheduler as scheduler  # noqa: E402
+from kalshi_records import PaperTrade  # noqa: E402
+
+NOW = 1_770_000_000.0
+
+
+class FakeClock:
+    def __init__(self, now=NOW):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+
+def iso(ts):
+    return datetime.datetime.fromtimestamp(ts, datetime.timezone.utc).isoformat()
+
+
+class SchedulerTest(unittest.TestCase):
+    def test_jobs_run_once_at_startup_then_on_their_plan_without_overlap(self):
+        clock = FakeClock()
+        running, calls = [], []
+
+        def job(name, seconds):
+            def fn():
+                self.assertEqual(running, [], "jobs overlapped")
+                running.append(name)
+                calls.append(name)
+                clock.now += seconds  # the job takes a while
+                running.pop()
+            return fn
+
+        jobs = [
+            scheduler.Job("fast", job("fast", 5), lambda now: now + 60),
+            scheduler.Job("slow", job("slow", 120), lambda now: now + 600),
+        ]
+        s = scheduler.Scheduler(jobs, clock=clock, jitter=0)
+
+        self.assertEqual(s.run_pending(), ["fast", "slow"])
+        # fast fell behind while slow ran: it runs once, not once per missed interval
+        self.assertEqual(s.run_pending(), ["fast"])
+        self.assertEqual(s.run_pending(), [])
+        clock.now += 60
+        self.assertEqual(s.run_pending(), ["fast"])
+        self.assertEqual(calls, ["fast", "slow", "fast", "fast"])
+
+    def test_failing_and_exiting_jobs_are_rescheduled(self):
+        clock = FakeClock()
+
+        def exits():
+            sys.exit(1)
+
+        def raises():
+            raise RuntimeError("boom")
+
+        jobs = [scheduler.Job("exits", exits, lambda now: now + 60),
+                scheduler.Job("raises", raises, lambda now: now + 60)]
+        s = scheduler.Scheduler(jobs, clock=clock, jitter=0)
+        self.assertEqual(s.run_pending(), ["exits", "raises"])
+        self.assertEqual([(j.runs, j.failures, j.next_run) for j in jobs],
+                         [(1, 1, NOW + 60), (1, 1, NOW + 60)])
+
+    def test_failing_plan_is_retried_without_stopping_other_jobs(self):
+        clock = FakeClock()
+
+        def bad_plan(now):
+            raise ValueError("Expecting value: line 1 column 1 (char 0)")  # half-written ledger
+
+        jobs = [scheduler.Job("resolver", lambda: None, bad_plan),
+                scheduler.Job("mark", lambda: None, lambda now: now + 60)]
+        s = scheduler.Scheduler(jobs, clock=clock, jitter=0)
+        with patch.object(scheduler, "notify") as notify:
+            self.assertEqual(s.run_pending(), ["resolver", "mark"])
+        self.assertEqual([(j.runs, j.failures, j.next_run) for j in jobs],
+                         [(1, 1, NOW + scheduler.PLAN_RETRY_SECONDS), (1, 0, NOW + 60)])
+        self.assertIn("planning failed", notify.call_args[0][1])
+
+    def test_jitter_stays_within_fraction(self):
+        delays = [scheduler.jittered(100, 0.1) for _ in range(200)]
+        self.assertTrue(all(90 <= d <= 110 for d in delays))
+        self.assertGreater(len(set(delays)), 1)
+
+    def test_monitor_cadence_tightens_near_close(self):
+        self.assertEqual(scheduler.monitor_interval(None, NOW), 30 * 60)
+        self.assertEqual(scheduler.monitor_interval(NOW + 12 * 3600, NOW), 30 * 60)
+        self.assertEqual(scheduler.monitor_interval(NOW + 6 * 3600, NOW), 20 * 60)
+        self.assertEqual(scheduler.monitor_interval(NOW + 3 * 3600, NOW), 10 * 60)
+        self.assertEqual(scheduler.monitor_interval(NOW + 1800, NOW), 5 * 60)
+
+    def test_resolver_runs_after_earliest_open_settlement(self):
+        def trade(settle, status="open"):
+            return PaperTrade(id="t", ticker="KXBTCD-X", side="yes",
+                              settlement_time=iso(settle), status=status)
+
+        delay = scheduler.RESOLVE_DELAY_SECONDS
+        self.assertEqual(scheduler.next_resolve_time([], NOW), NOW + scheduler.RESOLVE_IDLE_SECONDS)
+        self.assertEqual(
+            scheduler.next_resolve_time([trade(NOW + 7200), trade(NOW + 3600), trade(NOW + 60, "win")], NOW),
+            NOW + 3600 + delay)
+        # past due but not settled yet: retry
+        self.assertEqual(scheduler.next_resolve_time([trade(NOW - 3600)], NOW),
+                         NOW + scheduler.RESOLVE_RETRY_SECONDS)
+
+    def test_build_jobs_selects_by_name(self):
+        with patch.object(scheduler._State, "next_close_ts", NOW + 1800):
+            jobs = {j.name: j for j in scheduler.build_jobs(["monitor", "refresh"])}
+            self.assertEqual(set(jobs), {"monitor", "refresh"})
+            self.assertEqual(jobs["monitor"].plan(NOW), NOW + 5 * 60)
+
+    def test_maker_window_is_capped_below_the_shortest_job_interval(self):
+        import kalshi_maker as maker
+        self.assertEqual(scheduler.shortest_interval(), scheduler.REFRESH_SECONDS * 0.9)
+        self.assertLess(maker.MAX_WORK_SECONDS, scheduler.shortest_interval())  # the default fits
+        with patch.object(maker, "MAX_WORK_SECONDS", 600):
+            self.assertEqual(scheduler.cap_maker_window(), int(scheduler.shortest_interval()))
+            self.assertEqual(maker.MAX_WORK_SECONDS, int(scheduler.shortest_interval()))
+
+
+if __name__ == "__main__":
+    unittest.main()
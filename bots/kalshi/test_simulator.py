@@ -0,0 +1,104 @@
+import os
+import sys
+import unittest
+from pathlib import Path
+
+
+os.environ.setdefault("KALSHI_API_KEY_ID", "test-key")
+sys.path.insert(0, str(Path(__file__).parent))
+
+from kalshi_simulator import MatchingEngine, _inferred_trades  # noqa: E402
+
+T = "KXBTCD-26FEB0317-T99000"
+
+
+def book(yes, no=()):
+    return {"yes": [list(level) for level in yes], "no": [list(level) for level in no]}
+
+
+class MatchingEngineTest(unittest.TestCase):
+    def test_arrival_takes_crossing_liquidity_then_rests(self):
+        engine = MatchingEngine(latency_ms=0)
+        engine.on_book(0, T, book(yes=[(38, 100)], no=[(62, 30), (61, 50), (58, 500)]))
+        order = engine.submit(0, T, "yes", 39, 100)
+        # NO bids at 62 and 61 are YES asks at 38 and 39; 58 (ask 42) is above the limit
+        self.assertEqual(order.fills, [(0, 30, 38, True), (0, 50, 39, True)])
+        self.assertEqual((order.filled, order.status, order.ahead), (80, "resting", 0))
+        self.assertEqual(order.as_fill()["total_cents"], 30 * 38 + 50 * 39)
+
+    def test_latency_matches_against_the_book_when_the_order_lands(self):
+        engine = MatchingEngine(latency_ms=500)
+        engine.on_book(0.0, T, book(yes=[(40, 10)], no=[(62, 100)]))
+        order = engine.submit(0.0, T, "yes", 38, 50)
+        engine.on_book(0.2, T, book(yes=[(40, 10)], no=[(55, 100)]))  # the ask moved away in flight
+        self.assertEqual(order.status, "pending")
+        engine.on_book(0.6, T, book(yes=[(40, 10)], no=[(55, 100)]))
+        self.assertEqual((order.filled, order.status), (0, "resting"))
+
+    def test_queue_position_and_partial_fills(self):
+        engine = MatchingEngine(latency_ms=0)
+        engine.on_book(0, T, book(yes=[(40, 100), (39, 50)]))
+        first = engine.submit(0, T, "yes", 40, 30)
+        second = engine.submit(0, T, "yes", 40, 30)
+        self.assertEqual((first.ahead, second.ahead), (100, 100))
+
+        engine.on_trade(1, T, "yes", 40, 110)           # 100 ahead, then 10 to the first order
+        self.assertEqual((first.filled, second.filled), (10, 0))
+        engine.on_trade(2, T, "yes", 40, 25)            # first's remaining 20, then 5 to second
+        self.assertEqual((first.filled, first.status, second.filled), (30, "executed", 5))
+        engine.on_trade(3, T, "yes", 38, 100)           # traded through our level
+        self.assertEqual((second.filled, second.status), (30, "executed"))
+        self.assertEqual([f[2] for f in second.fills], [40, 40])  # maker fills at our price
+
+    def test_trade_through_fills_better_levels_first_without_reusing_contracts(self):
+        engine = MatchingEngine(latency_ms=0)
+        engine.on_book(0, T, book(yes=[(41, 5), (39, 50)]))
+        high = engine.submit(0, T, "yes", 41, 10)
+        low = engine.submit(0, T, "yes", 40, 10)
+
+        engine.on_trade(1, T, "yes", 39, 10)  # 5 ahead at 41, 5 to us there, nothing left for 40
+        self.assertEqual((high.filled, low.filled), (5, 0))
+        engine.on_trade(2, T, "yes", 39, 12)
+        self.assertEqual((high.filled, high.status, low.filled), (10, "executed", 7))
+
+    def test_snapshots_infer_trades_capped_by_volume(self):
+        engine = MatchingEngine(latency_ms=0)
+        engine.on_book(0, T, book(yes=[(40, 100), (39, 50)], no=[(55, 40)]), volume=1000)
+        order = engine.submit(0, T, "yes", 40, 50)
+
+        # 80 gone at 40, but volume says only 30 traded: cancels came from behind us
+        engine.on_book(1, T, book(yes=[(40, 20), (39, 50)], no=[(55, 40)]), volume=1030)
+        self.assertEqual((order.ahead, order.filled), (20, 0))
+        # the rest of 40 and 40 at 39 trade: the seller went through us on the way down
+        engine.on_book(2, T, book(yes=[(39, 10)], no=[(55, 40)]), volume=1090)
+        self.assertEqual((order.filled, order.status), (40, "resting"))
+
+    def test_new_crossing_bid_fills_resting_order_at_its_price(self):
+        engine = MatchingEngine(latency_ms=0)
+        engine.on_book(0, T, book(yes=[(38, 100)], no=[(55, 40)]))
+        order = engine.submit(0, T, "yes", 40, 50)
+        engine.on_book(1, T, book(yes=[(38, 100)], no=[(61, 20), (60, 100)]))
+        self.assertEqual((order.filled, order.status), (50, "executed"))
+        self.assertEqual(order.avg_cost, 40)
+
+    def test_cancel_lands_after_latency(self):
+        engine = MatchingEngine(latency_ms=1000)
+        engine.on_book(0, T, book(yes=[(40, 0)], no=[(55, 40)]))
+        order = engine.submit(0, T, "yes", 40, 50)
+        engine.on_book(1.5, T, book(yes=[(40, 5)], no=[(55, 40)]))
+        engine.cancel(2.0, order.id)
+        engine.on_book(2.5, T, book(yes=[(40, 5)], no=[(60, 10)]))  # crosses before the cancel lands
+        engine.on_book(3.5, T, book(yes=[(40, 5)], no=[(60, 30)]))
+        self.assertEqual((order.filled, order.status), (10, "canceled"))
+        self.assertEqual(engine.working, {})
+
+    def test_inferred_trades_split_by_depletion(self):
+        old = {"yes": {40: 100, 39: 50}, "no": {55: 100}}
+        new = {"yes": {39: 30}, "no": {55: 50}}
+        self.assertEqual(_inferred_trades(old, new), {"yes": [(40, 100), (39, 20)], "no": [(55, 50)]})
+        self.assertEqual(_inferred_trades(old, new, traded=34), {"yes": [(40, 24)], "no": [(55, 10)]})
+        self.assertEqual(_inferred_trades(old, old), {})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,49 @@
+import os
+import subprocess
+import sys
+import time
+import unittest
+from pathlib import Path
+
+
+HERE = Path(__file__).parent
+# Generous vs. the ~60ms these take locally; catches an eager heavy import, not noise
+BUDGET_SECONDS = float(os.environ.get("KALSHI_STARTUP_BUDGET_SEC", "0.3"))
+HEAVY_MODULES = ("cryptography", "urllib.request", "ssl", "http.client")
+
+
+def run(*args):
+    """Best-of-3 wall time for a CLI invocation with no Kalshi credentials"""
+    env = {k: v for k, v in os.environ.items() if not k.startswith("KALSHI_")}
+    best, result = float("inf"), None
+    for _ in range(3):
+        started = time.perf_counter()
+        result = subprocess.run([sys.executable, *args], cwd=HERE, env=env, capture_output=True, text=True)
+        best = min(best, time.perf_counter() - started)
+    return best, result
+
+
+class StartupTest(unittest.TestCase):
+    def test_paper_stats_runs_without_credentials_within_budget(self):
+        elapsed, result = run("kalshi_paper_tracker.py", "--stats")
+        self.assertEqual(result.returncode, 0, result.stderr)
+        self.assertLess(elapsed, BUDGET_SECONDS)
+
+    def test_cli_help_runs_without_credentials_within_budget(self):
+        elapsed, result = run("kalshi.py", "help")
+        self.assertEqual(result.returncode, 0, result.stderr)
+        self.assertIn("Kalshi CLI", result.stdout)
+        self.assertLess(elapsed, BUDGET_SECONDS)
+
+    def test_local_modules_import_no_http_or_crypto_stack(self):
+        code = (
+            "import sys, kalshi, kalshi_paper_tracker; "
+            f"print(','.join(m for m in {HEAVY_MODULES!r} if m in sys.modules))"
+        )
+        _, result = run("-c", code)
+        self.assertEqual(result.returncode, 0, result.stderr)
+        self.assertEqual(result.stdout.strip(), "")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,72 @@
+import json
+import os
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+
+os.environ.setdefault("KALSHI_API_KEY_ID", "test-key")
+sys.path.insert(0, str(Path(__file__).parent))
+
+import kalshi_btc_monitor as monitor  # noqa: E402
+import kalshi_paper_tracker as tracker  # noqa: E402
+import kalshi_strategies as strategies  # noqa: E402
+from kalshi_records import Market  # noqa: E402
+
+BTC = {"price": 95_000.0, "change_1h": -0.4, "change_24h": -1.8,
+       "high_24h": 97_500.0, "low_24h": 94_200.0, "volume_24h": 41e9}
+MARKETS = [
+    Market.from_api({"ticker": "KXBTCD-26FEB0317-T98000", "yes_bid": 70, "yes_ask": 72}),
+    Market.from_api({"ticker": "KXBTCD-26FEB0317-T99000", "yes_bid": 75, "yes_ask": 77}),
+]
+BOOKS = {
+    "KXBTCD-26FEB0317-T98000": {"yes": [[70, 5]]},
+    "KXBTCD-26FEB0317-T99000": {"yes": [[72, 400], [75, 100]]},
+}
+
+
+class StrategyRunnerTest(unittest.TestCase):
+    def setUp(self):
+        tmpdir = tempfile.TemporaryDirectory()
+        self.addCleanup(tmpdir.cleanup)
+        tmp = Path(tmpdir.name)
+        self.tmp = tmp
+        for module, target, value in (
+            (tracker, "PAPER_TRADES_JSON", tmp / "kalshi-paper-trades.json"),
+            (tracker, "PAPER_STATS_JSON", tmp / "kalshi-paper-stats.json"),
+            (tracker, "TRADE_LOG_MD", tmp / "log.md"),
+            (monitor, "TRADE_LOG", tmp / "log.md"),
+        ):
+            patcher = patch.object(module, target, value)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def test_unknown_setting_is_rejected(self):
+        path = self.tmp / "strategies.json"
+        path.write_text(json.dumps({"typo": {"min_signal_scor": 4}}))
+        with self.assertRaises(ValueError):
+            strategies.load_strategies(path)
+
+    def test_strategies_share_books_and_log_to_own_ledgers(self):
+        configs = {
+            "baseline": monitor.strategy_config(),
+            "strict": monitor.strategy_config(min_signal_score=6),
+            "cheap": monitor.strategy_config(max_entry_cost=27),
+        }
+        snapshot = {"btc": BTC, "fear_greed": {"value": 50, "label": "Neutral"}, "markets": MARKETS}
+        with patch.object(monitor, "get_orderbook", side_effect=BOOKS.get) as get_orderbook:
+            results = {r["strategy"]: r for r in strategies.run_cycle(configs, snapshot)}
+
+        self.assertEqual(get_orderbook.call_count, 2)
+        self.assertIsNotNone(results["baseline"]["trade_id"])
+        self.assertIsNone(results["strict"]["trade_id"])
+        self.assertIsNone(results["cheap"]["trade_id"])  # 28¢ and up is over the 27¢ cap
+        self.assertEqual(len(tracker._load_trades("baseline")), 1)
+        self.assertEqual(tracker._load_trades("strict"), [])
+        self.assertEqual(tracker._load_trades(), [])
+
+
+if __name__ == "__main__":
+    unittest.main()
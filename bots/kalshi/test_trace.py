@@ -0,0 +1,73 @@
+import os
+import sys
+import tempfile
+import tracemalloc
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+
+os.environ.setdefault("KALSHI_API_KEY_ID", "test-key")
+sys.path.insert(0, str(Path(__file__).parent))
+
+import kalshi_btc_monitor as monitor  # noqa: E402
+import kalshi_trace as trace  # noqa: E402
+
+
+class TraceTest(unittest.TestCase):
+    def setUp(self):
+        self.addCleanup(trace.stop)
+
+    def test_span_without_a_tracer_is_a_no_op(self):
+        with trace.span("btc_fetch"):
+            pass
+        self.assertIsNone(trace.stop())
+        self.assertEqual(trace.current_summary(), "")
+
+    def test_spans_record_wall_and_cpu_in_completion_order(self):
+        tracer = trace.start()
+        with trace.span("outer"):
+            with trace.span("inner"):
+                sum(range(10_000))
+        self.assertEqual([s["name"] for s in tracer.spans], ["inner", "outer"])
+        for s in tracer.spans:
+            self.assertGreaterEqual(s["wall_ms"], 0)
+            self.assertGreaterEqual(s["cpu_ms"], 0)
+        tracer.spans = [{"name": "btc_fetch", "wall_ms": 120.4, "cpu_ms": 3.2},
+                        {"name": "scan", "wall_ms": 8.0, "cpu_ms": 7.6}]
+        self.assertEqual(trace.current_summary(), "btc_fetch 120ms/3ms cpu · scan 8ms/8ms cpu")
+        self.assertIs(trace.stop(), tracer)
+
+    def test_profile_report_has_stage_table_pstats_and_allocations(self):
+        was_tracing = tracemalloc.is_tracing()
+        tracer = trace.start(profile=True)
+        with trace.span("parse"):
+            blobs = [bytes(1024) for _ in range(200)]
+        self.assertIn("alloc_kb", tracer.spans[0])
+        trace.stop()
+        self.assertEqual(tracemalloc.is_tracing(), was_tracing)
+
+        with tempfile.TemporaryDirectory() as tmp:
+            report = tracer.write_report(tmp).read_text()
+        self.assertIn("stage", report.splitlines()[2])
+        self.assertTrue(report.splitlines()[3].startswith("parse"))
+        self.assertIn("STAGE parse", report)
+        self.assertIn("Top allocation growth:", report)
+        self.assertIn("function calls", report)  # pstats output
+        del blobs
+
+    def test_log_trade_adds_timings_only_while_tracing(self):
+        with tempfile.TemporaryDirectory() as tmp, patch.object(monitor, "TRADE_LOG", Path(tmp) / "log.md"):
+            monitor.log_trade("analysis", {"ticker": "T1"})
+            trace.start()
+            with trace.span("scan"):
+                pass
+            monitor.log_trade("analysis", {"ticker": "T2"})
+            trace.stop()
+            monitor.log_trade("analysis", {"ticker": "T3"})
+            entries = monitor.TRADE_LOG.read_text().split("\n## ")[1:]
+        self.assertEqual(["**timings:** scan" in e for e in entries], [False, True, False])
+
+
+if __name__ == "__main__":
+    unittest.main()